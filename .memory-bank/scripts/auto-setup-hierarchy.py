@@ -4,16 +4,173 @@ Automated hierarchical Memory Bank setup
 Sets up Memory Bank in all detected git repositories
 """
 
+import filecmp
 import os
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl that shares a file's extents with another (btrfs, XFS, bcachefs)
+FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+MEMORY_BANK_DIRS = ["context", "active", "technical", "decisions",
+                    "qa", "custom_modes", "scripts"]
+
+# (source relative to the template dir, destination relative to .memory-bank,
+#  replace when different). Project files are only ever created, never
+#  replaced; the shipped modes, bootstrap and scripts are kept up to date.
+TEMPLATE_FILES = [
+    ("templates/projectBrief.md", "context/projectBrief.md", False),
+    ("templates/productContext.md", "context/productContext.md", False),
+    ("templates/systemPatterns.md", "context/systemPatterns.md", False),
+    ("templates/techContext.md", "context/techContext.md", False),
+    ("templates/activeContext.md", "active/activeContext.md", False),
+    ("templates/progress.md", "active/progress.md", False),
+    (".memory-bank/active/temp-files.md", "active/temp-files.md", False),
+    (".memory-bank/BOOTSTRAP.md", "BOOTSTRAP.md", True),
+    (".memory-bank/scripts/auto-update.py", "scripts/auto-update.py", True),
+    (".memory-bank/scripts/memory_bank_ignore.py", "scripts/memory_bank_ignore.py", True),
+    (".memory-bank/scripts/memory_bank_profile.py", "scripts/memory_bank_profile.py", True),
+    (".memory-bank/scripts/memory_bank_client.py", "scripts/memory_bank_client.py", True),
+    (".memory-bank/scripts/setup-hierarchy.sh", "scripts/setup-hierarchy.sh", True),
+    (".memory-bank/scripts/detect-hierarchy.py", "scripts/detect-hierarchy.py", True),
+    (".memory-bank/scripts/auto-setup-hierarchy.py", "scripts/auto-setup-hierarchy.py", True),
+]
+
+# Machine-local automation state added to the repository's .gitignore
+# (kept in sync with update_gitignore in setup-memory-bank.sh)
+GITIGNORE_HEADER = "# Memory Bank automation state (machine-local)"
+GITIGNORE_ENTRIES = [
+    ".memory-bank/**/scan-cache.json",
+    ".memory-bank/**/pitfall-index.json",
+    ".memory-bank/**/decision-cache.json",
+    ".memory-bank/**/hierarchy-cache.json",
+    ".memory-bank/**/auto-update.sock",
+]
+
+
+class TemplateMaterializer:
+    """Builds a repository's .memory-bank tree from the template directory
+    
+    The template files are listed and stat'ed once; each repository then
+    costs a makedirs per directory and one clone or copy per missing file.
+    Files are reflinked (FICLONE) where the filesystem supports it, which
+    shares extents copy-on-write, and copied otherwise. Hard links are never
+    used: memory bank files are edited in place, and an edit in one
+    repository must not show up in every other one.
+    """
+    
+    def __init__(self, template_dir: Optional[Path]):
+        self.template_dir = template_dir
+        self.files = self._plan()
+        # Devices where FICLONE failed; only plain copies are tried there
+        self._no_reflink = set()
+        
+    def _plan(self) -> List[Tuple[Path, str, bool, int, int]]:
+        """(source, destination, replace, size, mode) for each template present"""
+        if self.template_dir is None:
+            return []
+            
+        sources = list(TEMPLATE_FILES)
+        modes_dir = self.template_dir / ".memory-bank" / "custom_modes"
+        if modes_dir.is_dir():
+            for mode_file in sorted(modes_dir.glob("*.md")):
+                sources.append((f".memory-bank/custom_modes/{mode_file.name}",
+                                f"custom_modes/{mode_file.name}", True))
+                
+        files = []
+        for source, destination, replace in sources:
+            src = self.template_dir / source
+            try:
+                st = src.stat()
+            except OSError:
+                continue
+            files.append((src, destination, replace, st.st_size, st.st_mode & 0o777))
+        return files
+        
+    def materialize(self, repo: Path) -> Dict[str, int]:
+        """Create repo/.memory-bank from the templates
+        
+        Files already identical to their template are left untouched, as
+        are existing project files that differ. Returns counts of files
+        cloned, copied, unchanged and kept.
+        """
+        base = repo / ".memory-bank"
+        for dir_name in MEMORY_BANK_DIRS:
+            os.makedirs(base / dir_name, exist_ok=True)
+        device = os.stat(base).st_dev
+        
+        counts = {"cloned": 0, "copied": 0, "unchanged": 0, "kept": 0}
+        for src, destination, replace, size, mode in self.files:
+            dst = base / destination
+            try:
+                st = os.stat(dst)
+            except FileNotFoundError:
+                pass
+            else:
+                if st.st_size == size and filecmp.cmp(src, dst, shallow=False):
+                    counts["unchanged"] += 1
+                    continue
+                if not replace:
+                    counts["kept"] += 1
+                    continue
+                    
+            if device not in self._no_reflink and self._reflink(src, dst):
+                counts["cloned"] += 1
+            else:
+                self._no_reflink.add(device)
+                shutil.copyfile(src, dst)
+                counts["copied"] += 1
+            os.chmod(dst, mode)
+        self.update_gitignore(repo)
+        return counts
+    
+    @staticmethod
+    def update_gitignore(repo: Path) -> int:
+        """Append the GITIGNORE_ENTRIES missing from repo/.gitignore, returning how many"""
+        gitignore = repo / ".gitignore"
+        try:
+            content = gitignore.read_text()
+        except FileNotFoundError:
+            content = ""
+        lines = set(content.splitlines())
+        missing = [entry for entry in GITIGNORE_ENTRIES if entry not in lines]
+        if not missing:
+            return 0
+        
+        block = ([] if GITIGNORE_HEADER in lines else [GITIGNORE_HEADER]) + missing
+        prefix = "\n" if content and not content.endswith("\n") else ""
+        with open(gitignore, 'a') as f:
+            f.write(prefix + "\n".join(block) + "\n")
+        return len(missing)
+        
+    @staticmethod
+    def _reflink(src: Path, dst: Path) -> bool:
+        """Clone src into dst; False if the filesystem cannot share extents"""
+        if fcntl is None:
+            return False
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return True
+            except OSError:
+                # EOPNOTSUPP, EXDEV, EINVAL...: dst is left empty for the copy
+                return False
+
 
 class HierarchicalSetup:
     def __init__(self, root_path: str = "."):
         self.root = Path(root_path).resolve()
         self.setup_script = self._find_setup_script()
+        self.materializer = TemplateMaterializer(self._find_template_dir())
         self.repos = []
         
     def _find_setup_script(self) -> Path:
@@ -48,6 +205,19 @@ class HierarchicalSetup:
             
         return None
         
+    def _find_template_dir(self) -> Optional[Path]:
+        """Find the Memory Bank checkout holding templates/ and .memory-bank/"""
+        locations = [
+            Path.home() / ".claude-memory-bank",
+            Path(__file__).resolve().parent.parent.parent,
+        ]
+        
+        for loc in locations:
+            if (loc / "templates").is_dir() or (loc / ".memory-bank" / "BOOTSTRAP.md").exists():
+                return loc
+                
+        return None
+        
     def find_git_repos(self) -> List[Path]:
         """Find all git repositories"""
         repos = []
@@ -113,55 +283,72 @@ class HierarchicalSetup:
         with open(hierarchy_path, 'w') as f:
             json.dump(hierarchy, f, indent=2)
             
-    def setup_repo(self, repo: Path) -> bool:
-        """Setup Memory Bank in a repository"""
-        print(f"\n{'='*60}")
-        print(f"Setting up: {repo}")
-        print('='*60)
+    def setup_repo(self, repo: Path, output: Optional[List[str]] = None) -> bool:
+        """Setup Memory Bank in a repository
+        
+        Commands run with cwd=repo, so repos can be set up from several
+        threads at once. If output is given, log lines and the setup
+        script's output are collected there instead of being printed, and
+        the script gets no stdin.
+        """
+        log = print if output is None else output.append
+        log(f"\n{'='*60}")
+        log(f"Setting up: {repo}")
+        log('='*60)
         
         # Check if already exists
         if self.check_existing_setup(repo):
-            print(f"✓ Memory Bank already exists, skipping...")
+            log(f"✓ Memory Bank already exists, skipping...")
             return True
             
-        # Save current directory
-        cwd = os.getcwd()
-        
         try:
-            # Change to repo directory
-            os.chdir(repo)
-            
             # Run setup script
             if self.setup_script:
-                result = subprocess.run([str(self.setup_script), "--single"])
+                result = self._run([str(self.setup_script), "--single"], repo, output)
                 success = result.returncode == 0
             else:
-                # Manual setup if script not found
-                print("Setting up manually...")
-                subprocess.run(["mkdir", "-p", "memory-bank/context"])
-                subprocess.run(["mkdir", "-p", "memory-bank/active"])
-                subprocess.run(["mkdir", "-p", "memory-bank/technical"])
-                subprocess.run(["mkdir", "-p", "memory-bank/decisions"])
-                subprocess.run(["mkdir", "-p", "memory-bank/qa"])
-                subprocess.run(["mkdir", "-p", "memory-bank/custom_modes"])
-                subprocess.run(["mkdir", "-p", "memory-bank/scripts"])
+                # Build the tree in-process if script not found
+                log("Setting up from templates...")
+                counts = self.materializer.materialize(repo)
+                log(f"✓ Created .memory-bank ({counts['cloned']} cloned, "
+                    f"{counts['copied']} copied, {counts['unchanged']} unchanged)")
                 success = True
                 
             if success and repo != self.root:
                 # Create hierarchy.json for non-root repos
                 self.create_hierarchy_json(repo, self.root)
-                print("✓ Created hierarchy.json")
+                log("✓ Created hierarchy.json")
                 
             return success
             
         except Exception as e:
-            print(f"✗ Error: {e}")
+            log(f"✗ Error: {e}")
             return False
-        finally:
-            os.chdir(cwd)
-            
-    def run(self):
-        """Run the hierarchical setup"""
+    
+    def _run(self, command: List[str], repo: Path,
+             output: Optional[List[str]]) -> subprocess.CompletedProcess:
+        """Run command in repo, appending its output to output when capturing"""
+        if output is None:
+            return subprocess.run(command, cwd=repo)
+        
+        result = subprocess.run(command, cwd=repo, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if result.stdout:
+            output.append(result.stdout.rstrip('\n'))
+        return result
+    
+    def _setup_repo_captured(self, repo: Path) -> Tuple[bool, List[str]]:
+        """setup_repo for a worker thread: returns (success, captured output)"""
+        output = []
+        return self.setup_repo(repo, output), output
+    
+    def run(self, assume_yes: bool = False, jobs: int = 1):
+        """Run the hierarchical setup
+        
+        assume_yes sets up every repository without prompting. With jobs > 1
+        repositories are set up concurrently; each one's output is captured
+        and printed as a block, in repository order.
+        """
         print("Memory Bank Hierarchical Setup")
         print("==============================\n")
         
@@ -178,30 +365,43 @@ class HierarchicalSetup:
             rel_path = repo.relative_to(self.root) if repo != self.root else "."
             print(f"  - {rel_path}")
             
-        # Ask for confirmation
-        print("\nSetup Options:")
-        print("1) Setup Memory Bank in ALL repositories automatically")
-        print("2) Setup only in root repository")
-        print("3) Cancel")
-        
-        choice = input("Choose an option [1]: ").strip() or "1"
-        
-        if choice == "2":
-            self.setup_repo(self.root)
-            return
-        elif choice == "3":
-            print("Setup cancelled.")
-            return
+        if not assume_yes:
+            # Ask for confirmation
+            print("\nSetup Options:")
+            print("1) Setup Memory Bank in ALL repositories automatically")
+            print("2) Setup only in root repository")
+            print("3) Cancel")
+            
+            choice = input("Choose an option [1]: ").strip() or "1"
+            
+            if choice == "2":
+                self.setup_repo(self.root)
+                return
+            elif choice == "3":
+                print("Setup cancelled.")
+                return
             
         # Setup all repos
         success_count = 0
         failed_repos = []
         
-        for repo in self.repos:
-            if self.setup_repo(repo):
-                success_count += 1
-            else:
-                failed_repos.append(repo)
+        if jobs > 1:
+            print(f"\nSetting up {len(self.repos)} repositories with {jobs} jobs...")
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                # map yields in submission order, so blocks print in repo order
+                results = executor.map(self._setup_repo_captured, self.repos)
+                for repo, (success, output) in zip(self.repos, results):
+                    print("\n".join(output))
+                    if success:
+                        success_count += 1
+                    else:
+                        failed_repos.append(repo)
+        else:
+            for repo in self.repos:
+                if self.setup_repo(repo):
+                    success_count += 1
+                else:
+                    failed_repos.append(repo)
                 
         # Summary
         print(f"\n{'='*60}")
@@ -221,13 +421,35 @@ class HierarchicalSetup:
         print("3. Use detect-hierarchy.py to visualize structure")
 
 def main():
-    setup = HierarchicalSetup()
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Set up Memory Bank in every git repository below a root directory"
+    )
+    parser.add_argument(
+        "--root", default=".",
+        help="Root directory to scan (default: current directory)"
+    )
+    parser.add_argument(
+        "--yes", "-y", action="store_true",
+        help="Set up all repositories without prompting"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, metavar="N",
+        help="Set up N repositories at once (0 = one per CPU, default: 1)"
+    )
+    
+    args = parser.parse_args()
+    
+    setup = HierarchicalSetup(args.root)
     
     if not setup.setup_script:
         print("Warning: setup-memory-bank.sh not found in PATH")
-        print("Will create basic structure manually")
+        print("Will build .memory-bank from templates directly")
+        if not setup.materializer.template_dir:
+            print("Warning: templates not found, only the directories will be created")
         
-    setup.run()
+    setup.run(assume_yes=args.yes, jobs=args.jobs or os.cpu_count() or 1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -15,23 +15,132 @@ Memory Bank System v2.0 - Context-driven workflow
 """
 
 import os
+import copy
+import io
 import json
 import re
 import subprocess
+import sys
 import argparse
+import hashlib
+import pickle
+import mmap
+import multiprocessing
+import select
+import socketserver
+import struct
+import threading
+import time
+import ctypes
+import ctypes.util
+import traceback
+from collections import Counter
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from itertools import islice
+from operator import attrgetter
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed, wait)
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
 import ast
 
+from memory_bank_client import ServerTimeout, request, socket_path
+from memory_bank_ignore import IgnoreMatcher
+from memory_bank_profile import Profiler
+
 class MemoryBankAutomation:
-    def __init__(self, project_root=".", project_name=None):
+    # Source file extensions inspected by the pattern scanner
+    SCAN_EXTENSIONS = ('.py', '.js', '.ts', '.jsx', '.tsx')
+    # Always skipped by the pattern scanner, on top of .memory-bank-ignore
+    DEFAULT_SCAN_IGNORE = ['node_modules/', 'dist/', 'build/', '.git/']
+    # Keyword detectors applied to every scanned file:
+    # category -> (keywords, ignore_case). They are fused into a single
+    # keyword-trie regex, so adding one does not add another pass over each file.
+    PATTERN_DETECTORS = {
+        "error_patterns": (('try', 'catch', 'throw', 'Error', 'Exception'), False),
+        "api_patterns": (('fetch', 'axios', 'request', 'api', 'endpoint'), True),
+    }
+    # Bump when the scan cache layout changes; detector changes are picked up
+    # automatically through the detector signature stored next to it
+    SCAN_CACHE_VERSION = 3
+    # Files per process-pool task, so per-task overhead is amortized
+    SCAN_BATCH_MIN = 16
+    SCAN_BATCH_MAX = 512
+    # Smaller rescans run serially: starting the worker pool takes longer
+    # (0.2-0.5 s) than scanning this many files or bytes in one process
+    SCAN_PARALLEL_MIN_FILES = 1000
+    SCAN_PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+    # Leading bytes sniffed for NUL bytes to detect binary files
+    BINARY_SAMPLE_SIZE = 8192
+    # Files larger than this are skipped (MB, 0 disables the limit)
+    DEFAULT_MAX_FILE_SIZE_MB = 10
+    # progress.md markup recognised by the pitfall parser
+    TIMESTAMP_RE = re.compile(r'## \[(.+?)\]')
+    ISSUE_RE = re.compile(r'\*\*Issue\*\*:\s*(.*)')
+    PITFALL_FIELD_RE = re.compile(r'\s*-\s*\*\*(Context|Solution|Pattern)\*\*:\s*(.*)')
+    PITFALL_FIELDS = ("context", "solution", "pattern")
+    # Bump when the parser changes so checkpointed pitfalls are discarded
+    PITFALL_INDEX_VERSION = 1
+    # History depth mined when a branch has no usable watermark yet
+    DEFAULT_DECISION_SINCE = "30 days ago"
+    # Bump when decision extraction changes so cached decisions are re-mined
+    DECISION_CACHE_VERSION = 3
+    # (lines changed, files changed) at which a commit counts as high/medium impact
+    IMPACT_CHANGE_THRESHOLDS = {"high": (1000, 20), "medium": (200, 5)}
+    # Keywords that mark a commit as a decision, its type (first match in
+    # this order wins) and its keyword impact; inflected forms such as
+    # "refactored" or "migration" also match, but "address" is not "add".
+    # Extended per repository by .memory-bank/decision-keywords.json
+    DECISION_KEYWORDS = ('refactor', 'architecture', 'design', 'pattern', 'implement',
+                         'migrate', 'optimize', 'restructure', 'introduce', 'decision', 'redesign')
+    DECISION_TYPES = {
+        "refactoring": ('refactor', 'restructure', 'reorganize'),
+        "architecture": ('architecture', 'design', 'redesign', 'pattern'),
+        "feature": ('add', 'implement', 'introduce', 'create'),
+        "optimization": ('optimize', 'improve', 'performance', 'speed'),
+        "migration": ('migrate', 'upgrade', 'update'),
+        "cleanup": ('remove', 'cleanup', 'delete')
+    }
+    IMPACT_KEYWORDS = {
+        "high": ('major', 'breaking', 'architecture', 'redesign', 'overhaul'),
+        "medium": ('refactor', 'enhance', 'improve', 'update')
+    }
+    # Date shards per worker when backfilling decision history with --jobs
+    DECISION_SHARDS_PER_JOB = 2
+    # Directories of a multi-project .memory-bank that are not projects
+    NON_PROJECT_DIRS = frozenset(["shared", "custom_modes", "scripts"])
+    # Projects processed at once by --all-projects
+    ALL_PROJECTS_THREADS = 8
+
+    def __init__(self, project_root=".", project_name=None, use_cache=True, jobs=1,
+                 max_file_size_mb=DEFAULT_MAX_FILE_SIZE_MB, use_git_index=True, all_projects=False,
+                 profiler=None):
         self.project_root = Path(project_root)
         self.memory_bank = self.project_root / ".memory-bank"
         self.project_name = project_name
+        self.all_projects = all_projects
+        self.use_cache = use_cache
+        self.jobs = jobs or os.cpu_count() or 1
+        self.max_file_size = int(max_file_size_mb * 1024 * 1024)
+        self.use_git_index = use_git_index
+        self.scan_skipped = []
+        # Results of the last scan, reused by later scans in the same process
+        self._scan_entries = None
+        # Phase timings and counters for --profile; a disabled one records nothing
+        self.profiler = profiler or Profiler(enabled=False)
+        # Reads and writes of memory bank files; swapped for a buffered
+        # MemoryBankSession for the duration of session()
+        self.files = MemoryBankFiles()
+        self.scan_cache_file = self.memory_bank / "scan-cache.json"
         self.is_multi_project = False
         self.project_path = self.memory_bank
         self.shared_path = None
+        self.scan_ignore = IgnoreMatcher.from_file(self.project_root / ".memory-bank-ignore",
+                                                   self.DEFAULT_SCAN_IGNORE)
         self.detect_structure()
+        self.decision_cache_file = self.project_path / "decision-cache.json"
+        self._decision_classifier = None
         self.ensure_memory_bank_exists()
     
     def detect_structure(self):
@@ -45,20 +154,97 @@ class MemoryBankAutomation:
             self.is_multi_project = True
             self.shared_path = shared_path
             
-            # If multi-project, we need a project name
+            # If multi-project, we need a project name (unless running them all)
             if self.project_name:
                 self.project_path = self.memory_bank / self.project_name
                 if not self.project_path.exists():
                     raise ValueError(f"Project '{self.project_name}' not found in multi-project repository")
-            else:
+            elif not self.all_projects:
                 # List available projects
-                projects = [d.name for d in self.memory_bank.iterdir() 
-                           if d.is_dir() and d.name != "shared"]
+                projects = self.list_projects()
                 if projects:
                     print(f"Multi-project repository detected. Available projects: {', '.join(projects)}")
                     print("Please specify a project with --project-name")
                     raise ValueError("Project name required for multi-project repository")
     
+    def list_projects(self):
+        """Names of the projects in a multi-project memory bank, sorted"""
+        return self.find_projects(self.memory_bank)
+    
+    @classmethod
+    def find_projects(cls, memory_bank):
+        """list_projects for the .memory-bank directory memory_bank, without setting it up"""
+        return sorted(d.name for d in Path(memory_bank).iterdir()
+                      if d.is_dir() and d.name not in cls.NON_PROJECT_DIRS
+                      and not d.name.startswith(('.', '_')))
+    
+    def for_project(self, project_name):
+        """A copy of this automation working on project_name
+        
+        The copy shares the scan ignore rules and the compiled decision
+        classifier, so building one per project costs no extra parsing.
+        """
+        project = copy.copy(self)
+        project.project_name = project_name
+        project.project_path = self.memory_bank / project_name
+        if not project.project_path.exists():
+            raise ValueError(f"Project '{project_name}' not found in multi-project repository")
+        project.decision_cache_file = project.project_path / "decision-cache.json"
+        project.ensure_memory_bank_exists()
+        return project
+    
+    def run_all_projects(self, since=None):
+        """Run every automation task for each project of a multi-project repository
+        
+        The codebase is scanned and git is mined once for all projects;
+        the per-project work (pattern and anti-pattern writes, design log,
+        health check, validation) then runs on a thread pool. Returns the
+        shared scan results and one result dict per project, in project
+        order.
+        """
+        # Build the shared classifier before the copies are made
+        self.decision_classifier()
+        projects = [self.for_project(name) for name in self.list_projects()]
+        patterns = self._scan_code_patterns()
+        if self._is_pattern_reusable(patterns):
+            print("💡 Some patterns might be suitable for shared/patterns.md")
+        
+        # Projects normally share a watermark, so this runs git log once
+        mined = {}
+        decisions = [project.extract_git_decisions(since, mined) for project in projects]
+        
+        def run_project(project, project_decisions):
+            with self.profiler.phase(f"project: {project.project_name}"):
+                project.scan_and_update_patterns(patterns=patterns)
+                return {
+                    "project": project.project_name,
+                    "pitfalls": project.extract_pitfall_solutions(),
+                    "decisions": project_decisions,
+                    "health": project.monitor_context_health(),
+                    "validation": project.validate_structure()
+                }
+        
+        workers = max(1, min(len(projects), self.ALL_PROJECTS_THREADS))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_project, projects, decisions))
+        return {"patterns": patterns, "projects": results}
+    
+    @contextmanager
+    def session(self):
+        """Serve memory bank reads from one snapshot and write changes back once
+        
+        Inside the block every task sees the others' buffered writes; the
+        files are written when it ends, even if a task fails.
+        """
+        previous = self.files
+        self.files = MemoryBankSession()
+        try:
+            yield self.files
+        finally:
+            session, self.files = self.files, previous
+            with self.profiler.phase("write"):
+                session.flush()
+    
     def ensure_memory_bank_exists(self):
         """Ensure memory bank directory structure exists"""
         # For single project, ensure basic structure
@@ -73,83 +259,228 @@ class MemoryBankAutomation:
                 for dir_name in required_dirs:
                     (self.project_path / dir_name).mkdir(exist_ok=True)
     
-    def scan_and_update_patterns(self):
-        """Scan codebase and update systemPatterns.md with discoveries"""
-        patterns = self._scan_code_patterns()
+    def scan_and_update_patterns(self, changed_files=None, refresh=False, patterns=None):
+        """Scan codebase and update systemPatterns.md with discoveries
+        
+        changed_files limits the scan to those paths (see _scan_code_patterns);
+        refresh replaces an existing Auto-Discovered Patterns section instead
+        of leaving it untouched. patterns skips the scan and writes results
+        already computed, e.g. shared by all projects of a repository; the
+        caller then owns the shared/ suggestion too.
+        """
+        scanned = patterns is None
+        if scanned:
+            patterns = self._scan_code_patterns(changed_files)
         
         # Read existing systemPatterns.md from correct location
         patterns_file = self.project_path / "context" / "systemPatterns.md"
-        if patterns_file.exists():
-            with open(patterns_file, 'r') as f:
-                existing_content = f.read()
-        else:
-            existing_content = ""
+        existing_content = self.files.read_text(patterns_file) or ""
         
         # Update with new patterns
         new_patterns_section = self._format_patterns_for_context(patterns)
         
         if new_patterns_section and "## Auto-Discovered Patterns" not in existing_content:
             # Append new section
-            with open(patterns_file, 'a') as f:
-                f.write("\n\n## Auto-Discovered Patterns\n")
-                f.write(f"*Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n")
-                f.write(new_patterns_section)
+            self.files.append_text(patterns_file,
+                                   "\n\n## Auto-Discovered Patterns\n"
+                                   f"*Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n"
+                                   + new_patterns_section)
+        elif new_patterns_section and refresh:
+            section = "## Auto-Discovered Patterns\n"
+            section += f"*Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n"
+            section += new_patterns_section
+            self._replace_section(patterns_file, existing_content, "## Auto-Discovered Patterns", section)
         
         # If multi-project and pattern seems reusable, suggest for shared
-        if self.is_multi_project and self._is_pattern_reusable(patterns):
+        if scanned and self.is_multi_project and self._is_pattern_reusable(patterns):
             print("💡 Some patterns might be suitable for shared/patterns.md")
         
         return patterns
     
+    def _replace_section(self, file_path, content, heading, section):
+        """Replace a '## ' section, up to the next '## ' heading, and rewrite the file"""
+        start = content.find(heading)
+        end = content.find("\n## ", start + len(heading))
+        end = len(content) if end == -1 else end + 1
+        
+        updated = content[:start] + section + content[end:]
+        if updated != content:
+            self.files.write_text(file_path, updated)
+    
     def _is_pattern_reusable(self, patterns):
         """Check if patterns might be reusable across projects"""
         # Simple heuristic: if we found similar patterns in multiple files
         total_patterns = sum(len(p) for p in patterns.values())
         return total_patterns > 10
     
-    def extract_pitfall_solutions(self):
-        """Extract pitfall → solution patterns from progress.md"""
+    def extract_pitfall_solutions(self, refresh=False):
+        """Extract pitfall → solution patterns from progress.md
+        
+        Parsed pitfalls are checkpointed in pitfall-index.json together with
+        the byte offset parsing can resume from and a hash of the bytes
+        before it. As long as that prefix is unchanged, only the appended
+        tail is parsed; any rewrite of the prefix triggers a full parse.
+        refresh replaces an existing Discovered Anti-patterns section.
+        """
         progress_file = self.project_path / "active" / "progress.md"
         if not progress_file.exists():
             return []
         
-        with open(progress_file, 'r') as f:
-            content = f.read()
-        
-        # Pattern to find issues and solutions
-        issue_pattern = r'\*\*Issue\*\*:\s*(.+?)(?:\n\s*-\s*\*\*Context\*\*:\s*(.+?))?(?:\n\s*-\s*\*\*Solution\*\*:\s*(.+?))?(?:\n\s*-\s*\*\*Pattern\*\*:\s*(.+?))?'
-        
-        pitfalls = []
-        for match in re.finditer(issue_pattern, content, re.MULTILINE | re.DOTALL):
-            issue = match.group(1).strip() if match.group(1) else ""
-            context = match.group(2).strip() if match.group(2) else ""
-            solution = match.group(3).strip() if match.group(3) else ""
-            pattern = match.group(4).strip() if match.group(4) else ""
-            
-            if issue and solution:
-                pitfalls.append({
-                    "issue": issue,
-                    "context": context,
-                    "solution": solution,
-                    "pattern": pattern,
-                    "timestamp": self._extract_timestamp_before(content, match.start())
+        index = self._load_pitfall_index()
+        with open(progress_file, 'rb') as f:
+            prefix_hash = None
+            if index:
+                prefix_hash = self._hash_prefix(f, index["offset"])
+                if prefix_hash is None or prefix_hash.hexdigest() != index["prefix_hash"]:
+                    prefix_hash = None
+            resumed = prefix_hash is not None
+            
+            if resumed:
+                stored, timestamp, start = index["pitfalls"], index["timestamp"], index["offset"]
+            else:
+                stored, timestamp, start = [], "unknown", 0
+                prefix_hash = hashlib.blake2b(digest_size=16)
+            
+            f.seek(start)
+            state = {"offset": start}
+            parsed = list(self._parse_pitfalls(f, timestamp, state))
+            pitfalls = stored + parsed
+            self.profiler.count("bytes read", state["offset"] - start)
+            
+            if self.use_cache and (not resumed or state["offset"] != start):
+                # Extend the verified prefix hash up to the new checkpoint
+                f.seek(start)
+                prefix_hash.update(f.read(state["offset"] - start))
+                self._save_pitfall_index({
+                    "version": self.PITFALL_INDEX_VERSION,
+                    "offset": state["offset"],
+                    "prefix_hash": prefix_hash.hexdigest(),
+                    "timestamp": state["timestamp"],
+                    "pitfalls": stored + [p for p in parsed if p is not state["open_record"]]
                 })
         
         # Update systemPatterns.md with anti-patterns
-        self._update_antipatterns(pitfalls)
+        self._update_antipatterns(pitfalls, refresh)
         
         return pitfalls
     
-    def _extract_timestamp_before(self, content, position):
-        """Extract the nearest timestamp before a position"""
-        # Look for timestamp pattern before the position
-        timestamp_pattern = r'## \[(.+?)\]'
-        timestamps = list(re.finditer(timestamp_pattern, content[:position]))
-        if timestamps:
-            return timestamps[-1].group(1)
-        return "unknown"
+    def _hash_prefix(self, f, offset):
+        """Hash the first offset bytes of f, or return None if the file is shorter"""
+        prefix_hash = hashlib.blake2b(digest_size=16)
+        f.seek(0)
+        remaining = offset
+        while remaining:
+            chunk = f.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                return None
+            prefix_hash.update(chunk)
+            remaining -= len(chunk)
+        return prefix_hash
+    
+    def _load_pitfall_index(self):
+        """Load the progress.md checkpoint, or None if missing or from another version"""
+        index_file = self.project_path / "pitfall-index.json"
+        if not self.use_cache or not index_file.exists():
+            return None
+        
+        try:
+            with open(index_file, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if index.get("version") != self.PITFALL_INDEX_VERSION:
+            return None
+        return index
+    
+    def _save_pitfall_index(self, index):
+        """Atomically write the progress.md checkpoint"""
+        index_file = self.project_path / "pitfall-index.json"
+        tmp_file = index_file.with_suffix(".tmp")
+        try:
+            with self.profiler.phase("write"), open(tmp_file, 'w') as f:
+                json.dump(index, f, indent=2)
+            os.replace(tmp_file, index_file)
+        except OSError as e:
+            print(f"Warning: could not write pitfall index: {e}")
+    
+    @classmethod
+    def _parse_pitfalls(cls, lines, timestamp="unknown", state=None):
+        """Parse progress.md lines in a single forward pass, yielding pitfall records
+        
+        lines are raw bytes lines, e.g. a file opened in binary mode. An
+        "**Issue**:" line starts a record, and the "- **Context**:",
+        "- **Solution**:" and "- **Pattern**:" lines that follow it (in that
+        order, each optional, blank lines allowed) fill it in. Each record
+        carries the last "## [timestamp]" heading seen before its issue.
+        Only records with both an issue and a solution are yielded.
+        
+        If state is given, state["offset"] is the byte offset the lines
+        start at. On completion it holds the offset and timestamp parsing can
+        later resume from: the start of a record still open at the end (which
+        an append could extend) or of a final line without a newline, else
+        the end of the input. Records yielded from before that offset are
+        final; state["open_record"] is the one record that may be re-parsed
+        on resume, or None.
+        """
+        record = None
+        record_start = None
+        field_index = -1
+        offset = state["offset"] if state is not None else 0
+        checkpoint = None
+        
+        for raw_line in lines:
+            line_start = offset
+            offset += len(raw_line)
+            if not raw_line.endswith(b"\n"):
+                # A final line without a newline may still be growing, so the
+                # checkpoint must not move past it or the record it could extend
+                checkpoint = (record_start if record is not None else (line_start, timestamp), record)
+            line = raw_line.decode('utf-8', 'replace').rstrip("\r\n")
+            
+            if record is not None:
+                if not line.strip():
+                    continue
+                
+                field = cls.PITFALL_FIELD_RE.match(line)
+                if field:
+                    index = cls.PITFALL_FIELDS.index(field.group(1).lower())
+                    if index > field_index:
+                        record[cls.PITFALL_FIELDS[index]] = field.group(2).strip()
+                        field_index = index
+                        continue
+                
+                if record["issue"] and record["solution"]:
+                    yield record
+                record = None
+            
+            issue = cls.ISSUE_RE.search(line)
+            if issue:
+                record_start = (line_start, timestamp)
+                for match in cls.TIMESTAMP_RE.finditer(line, 0, issue.start()):
+                    timestamp = match.group(1)
+                record = {
+                    "issue": issue.group(1).strip(),
+                    "context": "",
+                    "solution": "",
+                    "pattern": "",
+                    "timestamp": timestamp
+                }
+                field_index = -1
+            
+            for match in cls.TIMESTAMP_RE.finditer(line):
+                timestamp = match.group(1)
+        
+        if state is not None:
+            if checkpoint is None:
+                # A record still open at the end could be extended by an append
+                checkpoint = (record_start if record is not None else (offset, timestamp), record)
+            (state["offset"], state["timestamp"]), state["open_record"] = checkpoint
+        
+        if record is not None and record["issue"] and record["solution"]:
+            yield record
     
-    def _update_antipatterns(self, pitfalls):
+    def _update_antipatterns(self, pitfalls, refresh=False):
         """Update systemPatterns.md with discovered anti-patterns"""
         if not pitfalls:
             return
@@ -157,25 +488,26 @@ class MemoryBankAutomation:
         patterns_file = self.project_path / "context" / "systemPatterns.md"
         
         # Format anti-patterns section
-        antipatterns_content = "\n## Discovered Anti-patterns\n\n"
+        parts = ["\n## Discovered Anti-patterns\n\n"]
         for pitfall in pitfalls:
-            antipatterns_content += f"### {pitfall['issue']}\n"
+            parts.append(f"### {pitfall['issue']}\n")
             if pitfall['context']:
-                antipatterns_content += f"**Context**: {pitfall['context']}\n\n"
-            antipatterns_content += f"**Problem**: {pitfall['issue']}\n\n"
-            antipatterns_content += f"**Solution**: {pitfall['solution']}\n\n"
+                parts.append(f"**Context**: {pitfall['context']}\n\n")
+            parts.append(f"**Problem**: {pitfall['issue']}\n\n")
+            parts.append(f"**Solution**: {pitfall['solution']}\n\n")
             if pitfall['pattern']:
-                antipatterns_content += f"**Pattern**: {pitfall['pattern']}\n\n"
-            antipatterns_content += f"*Discovered: {pitfall['timestamp']}*\n\n"
+                parts.append(f"**Pattern**: {pitfall['pattern']}\n\n")
+            parts.append(f"*Discovered: {pitfall['timestamp']}*\n\n")
+        antipatterns_content = "".join(parts)
         
         # Check if anti-patterns section exists
-        if patterns_file.exists():
-            with open(patterns_file, 'r') as f:
-                content = f.read()
-            
+        content = self.files.read_text(patterns_file)
+        if content is not None:
             if "## Discovered Anti-patterns" not in content:
-                with open(patterns_file, 'a') as f:
-                    f.write(antipatterns_content)
+                self.files.append_text(patterns_file, antipatterns_content)
+            elif refresh:
+                self._replace_section(patterns_file, content, "## Discovered Anti-patterns",
+                                      antipatterns_content.lstrip("\n"))
     
     def monitor_context_health(self):
         """Monitor health of context files and suggest updates"""
@@ -198,8 +530,9 @@ class MemoryBankAutomation:
         # Check shared patterns if multi-project
         if self.is_multi_project and self.shared_path:
             shared_patterns = self.shared_path / "patterns.md"
-            if shared_patterns.exists():
-                age_days = (datetime.now().timestamp() - shared_patterns.stat().st_mtime) / (24 * 3600)
+            shared_stat = self.files.stat(shared_patterns)
+            if shared_stat is not None:
+                age_days = (datetime.now().timestamp() - shared_stat.st_mtime) / (24 * 3600)
                 health_report["shared_patterns_age_days"] = round(age_days, 1)
                 if age_days > 30:
                     health_report["recommendations"].append(
@@ -207,15 +540,14 @@ class MemoryBankAutomation:
                     )
         
         for filename, config in context_files.items():
-            file_path = self.project_path / "context" / filename
-            file_health = {"exists": file_path.exists()}
+            file_stat = self.files.stat(self.project_path / "context" / filename)
+            file_health = {"exists": file_stat is not None}
             
-            if file_path.exists():
+            if file_stat is not None:
                 # Check age
-                mod_time = file_path.stat().st_mtime
-                age_days = (datetime.now().timestamp() - mod_time) / (24 * 3600)
+                age_days = (datetime.now().timestamp() - file_stat.st_mtime) / (24 * 3600)
                 file_health["age_days"] = round(age_days, 1)
-                file_health["size_bytes"] = file_path.stat().st_size
+                file_health["size_bytes"] = file_stat.st_size
                 
                 # Check if update needed
                 if age_days > config["max_age_days"]:
@@ -244,9 +576,9 @@ class MemoryBankAutomation:
         # Check active work health
         active_files = ["activeContext.md", "tasks.md", "progress.md"]
         for filename in active_files:
-            file_path = self.project_path / "active" / filename
-            if file_path.exists():
-                age_hours = (datetime.now().timestamp() - file_path.stat().st_mtime) / 3600
+            file_stat = self.files.stat(self.project_path / "active" / filename)
+            if file_stat is not None:
+                age_hours = (datetime.now().timestamp() - file_stat.st_mtime) / 3600
                 if age_hours > 48:
                     health_report["recommendations"].append(
                         f"Review {filename} - inactive for {age_hours:.0f} hours"
@@ -256,8 +588,7 @@ class MemoryBankAutomation:
         
         # Save health report in project directory
         health_file = self.project_path / "health-report.json"
-        with open(health_file, 'w') as f:
-            json.dump(health_report, f, indent=2)
+        self.files.write_text(health_file, json.dumps(health_report, indent=2))
         
         return health_report
     
@@ -285,7 +616,7 @@ class MemoryBankAutomation:
             # Check top-level directories
             for dir_name, description in required_dirs.items():
                 dir_path = self.memory_bank / dir_name
-                if not dir_path.exists():
+                if not self.files.exists(dir_path):
                     validation_report["errors"].append(f"Missing required directory: {dir_name} ({description})")
                     validation_report["valid"] = False
                 else:
@@ -303,7 +634,7 @@ class MemoryBankAutomation:
                 
                 for dir_name, required_files in project_dirs.items():
                     dir_path = self.project_path / dir_name
-                    if not dir_path.exists():
+                    if not self.files.exists(dir_path):
                         validation_report["warnings"].append(f"Missing {dir_name}/ in project '{self.project_name}'")
                     else:
                         validation_report["structure"][f"{self.project_name}/{dir_name}"] = "✓"
@@ -311,7 +642,7 @@ class MemoryBankAutomation:
                         # Check required files
                         for file_name in required_files:
                             file_path = dir_path / file_name
-                            if not file_path.exists():
+                            if not self.files.exists(file_path):
                                 validation_report["warnings"].append(
                                     f"Missing {file_name} in {self.project_name}/{dir_name}/"
                                 )
@@ -330,7 +661,7 @@ class MemoryBankAutomation:
             
             for dir_name, required_files in required_dirs.items():
                 dir_path = self.memory_bank / dir_name
-                if not dir_path.exists():
+                if not self.files.exists(dir_path):
                     validation_report["errors"].append(f"Missing required directory: {dir_name}/")
                     validation_report["valid"] = False
                 else:
@@ -339,19 +670,19 @@ class MemoryBankAutomation:
                     # Check required files
                     for file_name in required_files:
                         file_path = dir_path / file_name
-                        if not file_path.exists():
+                        if not self.files.exists(file_path):
                             validation_report["warnings"].append(f"Missing {file_name} in {dir_name}/")
         
         # Check root files (BOOTSTRAP.md is now internal at .memory-bank/)
         root_files = ["../starter-prompt.md"]
         for file_name in root_files:
             file_path = self.memory_bank / file_name
-            if not file_path.exists():
+            if not self.files.exists(file_path):
                 validation_report["warnings"].append(f"Missing {file_name}")
         
         # Check for BOOTSTRAP.md in .memory-bank
         bootstrap_path = self.memory_bank / "BOOTSTRAP.md"
-        if not bootstrap_path.exists():
+        if not self.files.exists(bootstrap_path):
             validation_report["errors"].append("Missing BOOTSTRAP.md in .memory-bank/")
         
         # Generate summary
@@ -367,130 +698,739 @@ class MemoryBankAutomation:
         
         return validation_report
     
-    def extract_git_decisions(self):
-        """Extract architectural decisions from git history"""
+    def extract_git_decisions(self, since=None, mined=None):
+        """Extract architectural decisions from git history
+        
+        Decisions are kept in decision-cache.json per branch, together with
+        the last commit mined on it. Later runs only mine watermark..HEAD,
+        so each commit is classified once. When the branch was reset or
+        rebased, cached decisions it no longer contains are dropped and the
+        history is mined again. since sets the history depth when there is
+        no usable watermark (default: 30 days); passing it explicitly mines
+        that whole window again and merges the result.
+        mined, shared by the projects of one repository, memoizes HEAD and
+        the decisions of each mined range, so git runs once per range.
+        """
         decisions = []
+        mined = {} if mined is None else mined
         
         try:
-            # Get detailed git log
-            result = subprocess.run(
-                ['git', 'log', '--pretty=format:%H|%ai|%s|%b', '--since="30 days ago"'],
-                capture_output=True, text=True, cwd=self.project_root
-            )
-            
-            if result.returncode != 0:
+            head = self._memoized(mined, "head", lambda: self._git_output(['rev-parse', 'HEAD']))
+            if not head:
                 return decisions
+            branch = self._memoized(mined, "branch", lambda: (
+                self._git_output(['rev-parse', '--abbrev-ref', 'HEAD']) or "HEAD"))
             
-            decision_keywords = [
-                'refactor', 'architecture', 'design', 'pattern', 'implement',
-                'migrate', 'optimize', 'restructure', 'introduce', 'decision'
-            ]
+            cache = self._load_decision_cache()
+            cached = cache["branches"].get(branch, {})
+            watermark = cached.get("watermark")
+            previous = cached.get("decisions", [])
+            if watermark and not self._memoized(
+                    mined, ("ancestor", watermark), lambda: self._is_ancestor(watermark, head)):
+                # Reset or rebased branch: forget the cached commits it no longer contains
+                rewritten = self._memoized(mined, ("rewritten", watermark),
+                                           lambda: self._rewritten_commits(watermark, head))
+                previous = [] if rewritten is None else [d for d in previous if d["hash"] not in rewritten]
+                watermark = None
             
-            for line in result.stdout.strip().split('\n'):
-                if not line:
-                    continue
-                
-                parts = line.split('|', 3)
-                if len(parts) < 3:
-                    continue
-                
-                commit_hash, date, subject = parts[:3]
-                body = parts[3] if len(parts) > 3 else ""
-                full_message = subject + " " + body
-                
-                # Check for decision indicators
-                if any(keyword in full_message.lower() for keyword in decision_keywords):
-                    # Extract decision details
-                    decision = {
-                        "hash": commit_hash[:8],
-                        "date": date.split()[0],
-                        "subject": subject,
-                        "type": self._classify_decision(full_message.lower()),
-                        "impact": self._assess_impact(full_message)
-                    }
-                    
-                    # Look for "why" in commit body
-                    why_match = re.search(r'(?:why|because|reason)[:.]?\s*(.+?)(?:\n|$)', body, re.IGNORECASE)
-                    if why_match:
-                        decision["rationale"] = why_match.group(1).strip()
-                    
-                    decisions.append(decision)
+            if since is None and watermark:
+                if watermark != head:
+                    decisions = self._memoized(mined, ("range", watermark), lambda: self._parse_decisions(
+                        self._iter_git_commits([f'{watermark}..{head}'])))
+            else:
+                since = since or self.DEFAULT_DECISION_SINCE
+                decisions = self._memoized(mined, ("since", since),
+                                           lambda: self._mine_history(since, head))
+            
+            # Newly mined decisions first, then the cached ones not seen again
+            seen = {d["hash"] for d in decisions}
+            merged = decisions + [d for d in previous if d["hash"] not in seen]
+            merged.sort(key=lambda d: d["date"], reverse=True)
+            
+            if self.use_cache:
+                cache["keywords"] = self._decision_keyword_signature()
+                cache["branches"][branch] = {"watermark": head, "decisions": merged}
+                self._save_decision_cache(cache)
             
             # Update design-log.md
-            self._update_design_log(decisions)
+            self._update_design_log(merged)
+            decisions = merged
             
+        except subprocess.CalledProcessError:
+            return []
         except Exception as e:
             print(f"Error extracting git decisions: {e}")
         
         return decisions
     
-    def _classify_decision(self, message):
-        """Classify decision type from message"""
-        classifications = {
-            "refactoring": ['refactor', 'restructure', 'reorganize'],
-            "architecture": ['architecture', 'design', 'pattern'],
-            "feature": ['add', 'implement', 'introduce', 'create'],
-            "optimization": ['optimize', 'improve', 'performance', 'speed'],
-            "migration": ['migrate', 'upgrade', 'update'],
-            "cleanup": ['remove', 'cleanup', 'delete']
-        }
+    @staticmethod
+    def _memoized(memo, key, compute):
+        """memo[key], computed on first use"""
+        if key not in memo:
+            memo[key] = compute()
+        return memo[key]
+    
+    def _mine_history(self, since, head):
+        """Mine decisions from commits reachable from head back to since
+        
+        With more than one job the range is cut into date shards, each
+        mined by its own git log process. Shards are listed newest first
+        and merged in that order, so decisions stay in git log order;
+        commits on a shared boundary second are deduplicated by hash.
+        """
+        shards = self._decision_shards(since, head) if self.jobs > 1 else []
+        if len(shards) < 2:
+            return self._parse_decisions(self._iter_git_commits([f'--since={since}', head]))
+        
+        def mine_shard(shard):
+            newest, oldest = shard
+            counted = {"commits": 0}
+            
+            def count(commits):
+                for commit in commits:
+                    counted["commits"] += 1
+                    yield commit
+            
+            revisions = [f'--max-age={oldest}', head]
+            if shard is not shards[0]:
+                # The newest shard is left open-ended so skewed commit dates still land somewhere
+                revisions.insert(1, f'--min-age={newest}')
+            return self._parse_decisions(count(self._iter_git_commits(revisions))), counted["commits"]
+        
+        print(f"   Mining {len(shards)} date shards with {self.jobs} jobs...")
+        results = [None] * len(shards)
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {executor.submit(mine_shard, shard): i for i, shard in enumerate(shards)}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                results[i] = future.result()
+                newest, oldest = shards[i]
+                span = (f"{datetime.fromtimestamp(oldest).strftime('%Y-%m-%d')} → "
+                        f"{datetime.fromtimestamp(newest).strftime('%Y-%m-%d')}")
+                print(f"   [{done}/{len(shards)}] {span}: {results[i][1]} commits, "
+                      f"{len(results[i][0])} decisions")
+        
+        decisions = []
+        seen = set()
+        for shard_decisions, _ in results:
+            for decision in shard_decisions:
+                if decision["hash"] not in seen:
+                    seen.add(decision["hash"])
+                    decisions.append(decision)
+        return decisions
+    
+    def _decision_shards(self, since, head):
+        """Split since..head committer time into (newest, oldest) timestamp ranges, newest first"""
+        # git resolves since (absolute or relative, e.g. '2 years ago') to --max-age=<timestamp>
+        resolved = self._git_output(['rev-parse', f'--since={since}'])
+        head_time = self._git_output(['log', '-1', '--format=%ct', head])
+        if not resolved or not resolved.startswith('--max-age=') or not head_time:
+            return []
+        
+        start, end = int(resolved.split('=', 1)[1]), int(head_time)
+        count = min(self.jobs * self.DECISION_SHARDS_PER_JOB, (end - start) // 86400)
+        if count < 2:
+            return []
+        
+        # Both bounds are inclusive, so neighbouring shards share one second
+        step = (end - start) / count
+        bounds = [start + round(step * i) for i in range(count)] + [end]
+        return [(bounds[i + 1], bounds[i]) for i in reversed(range(count))]
+    
+    def _parse_decisions(self, commits):
+        """Classify commits from _iter_git_commits, keeping those that read as decisions"""
+        decisions = []
+        classifier = self.decision_classifier()
+        
+        for commit in commits:
+            subject, body = commit["subject"], commit["body"]
+            full_message = subject + " " + body
+            
+            # Check for decision indicators
+            is_decision, decision_type, keyword_impact = classifier.classify(full_message)
+            if is_decision:
+                # Extract decision details
+                decision = {
+                    "hash": commit["hash"][:8],
+                    "date": commit["date"].split()[0],
+                    "subject": subject,
+                    "type": decision_type,
+                    "impact": self._rank_impact(keyword_impact, commit),
+                    "files_changed": commit["files_changed"],
+                    "lines_added": commit["lines_added"],
+                    "lines_deleted": commit["lines_deleted"]
+                }
+                
+                # Look for "why" in commit body
+                why_match = re.search(r'(?:why|because|reason)[:.]?\s*(.+?)(?:\n|$)', body, re.IGNORECASE)
+                if why_match:
+                    decision["rationale"] = why_match.group(1).strip()
+                
+                decisions.append(decision)
+        
+        return decisions
+    
+    def decision_classifier(self):
+        """Compile the built-in and decision-keywords.json keyword tables once per run"""
+        if self._decision_classifier is None:
+            decision_keywords = list(self.DECISION_KEYWORDS)
+            types = {name: list(keywords) for name, keywords in self.DECISION_TYPES.items()}
+            impact = {level: list(keywords) for level, keywords in self.IMPACT_KEYWORDS.items()}
+            
+            config = self._load_decision_keywords()
+            decision_keywords += config.get("decision", [])
+            for name, keywords in config.get("types", {}).items():
+                types.setdefault(name, []).extend(keywords)
+            for level, keywords in config.get("impact", {}).items():
+                impact[level].extend(keywords)
+            
+            self._decision_classifier = DecisionClassifier(decision_keywords, types, impact)
+        return self._decision_classifier
+    
+    def _decision_keyword_signature(self):
+        """Fingerprint of the merged keyword tables, used to invalidate cached decisions"""
+        return self.decision_classifier().signature
+    
+    def _load_decision_keywords(self):
+        """Load extra keywords from .memory-bank/decision-keywords.json
+        
+        The file may hold "decision" (a list), "types" (type -> list, new
+        types rank after the built-in ones) and "impact" ("high"/"medium"
+        -> list). An invalid file is reported and ignored.
+        """
+        config_file = self.memory_bank / "decision-keywords.json"
+        if not config_file.exists():
+            return {}
         
-        for decision_type, keywords in classifications.items():
-            if any(keyword in message for keyword in keywords):
-                return decision_type
+        try:
+            with open(config_file, 'r') as f:
+                config = json.load(f)
+            
+            if not isinstance(config, dict):
+                raise ValueError("expected a JSON object")
+            keyword_lists = [("decision", config.get("decision", []))]
+            for section in ("types", "impact"):
+                if not isinstance(config.get(section, {}), dict):
+                    raise ValueError(f'"{section}" must be an object')
+                keyword_lists += [(f"{section}.{name}", keywords)
+                                  for name, keywords in config.get(section, {}).items()]
+            for name, keywords in keyword_lists:
+                if not isinstance(keywords, list) or not all(isinstance(k, str) for k in keywords):
+                    raise ValueError(f'"{name}" must be a list of words')
+            for level in config.get("impact", {}):
+                if level not in self.IMPACT_KEYWORDS:
+                    raise ValueError(f'unknown impact level "{level}"')
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring {config_file.name}: {e}")
+            return {}
+        
+        return config
+    
+    def _iter_git_commits(self, revisions):
+        """Stream commits with their numstat totals from git log, one at a time
+        
+        git log -z separates every field with a NUL, which cannot occur in
+        commit messages or paths, so multi-line bodies and subjects with any
+        punctuation survive intact. Each commit is four header fields (hash,
+        date, subject, body), then one field per numstat entry (renames add
+        the old and new path as two extra fields), then an empty field.
+        Raises CalledProcessError if git fails.
+        """
+        proc = subprocess.Popen(
+            ['git', 'log', '-z', '--numstat', '--pretty=format:%H%x00%ai%x00%s%x00%b%x00'] + revisions,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=self.project_root
+        )
+        self.profiler.count("subprocesses")
+        stream = proc.stdout
+        if self.profiler.enabled:
+            # Time spent waiting on git, not on classifying what it sent
+            stream = _ProfiledReader(stream, self.profiler, "git log")
+        try:
+            fields = _iter_nul_fields(stream)
+            while True:
+                header = list(islice(fields, 4))
+                if len(header) < 4:
+                    break
+                commit_hash, date, subject, body = (
+                    field.decode('utf-8', errors='replace') for field in header)
+                
+                files_changed = lines_added = lines_deleted = 0
+                for field in fields:
+                    if not field:
+                        break
+                    added, deleted, path = field.lstrip(b'\n').split(b'\t', 2)
+                    if not path:
+                        # Rename or copy: old and new path follow as separate fields
+                        next(fields, None)
+                        next(fields, None)
+                    files_changed += 1
+                    # Binary files report '-' for both counts
+                    if added != b'-':
+                        lines_added += int(added)
+                        lines_deleted += int(deleted)
+                
+                yield {
+                    "hash": commit_hash,
+                    "date": date,
+                    "subject": subject,
+                    "body": body,
+                    "files_changed": files_changed,
+                    "lines_added": lines_added,
+                    "lines_deleted": lines_deleted
+                }
+        finally:
+            # Stop git early if the consumer did not read everything
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            returncode = proc.wait()
+        
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, 'git log')
+    
+    def _git_output(self, args):
+        """Run a git command in the project root, returning stripped stdout or None on failure"""
+        try:
+            with self.profiler.phase("git"):
+                self.profiler.count("subprocesses")
+                result = subprocess.run(['git'] + args, capture_output=True, text=True,
+                                        cwd=self.project_root)
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip()
+    
+    def _is_ancestor(self, commit, head):
+        """Check that commit is still reachable from head (not rewritten or unknown)"""
+        try:
+            with self.profiler.phase("git"):
+                self.profiler.count("subprocesses")
+                result = subprocess.run(['git', 'merge-base', '--is-ancestor', commit, head],
+                                        capture_output=True, cwd=self.project_root)
+        except OSError:
+            return False
+        return result.returncode == 0
+    
+    def _rewritten_commits(self, watermark, head):
+        """Short hashes of commits reachable from watermark but no longer from head
+        
+        Returns None when watermark no longer exists, so none of the
+        decisions cached up to it can be trusted to be on the branch.
+        """
+        listed = self._git_output(['rev-list', watermark, '--not', head])
+        if listed is None:
+            return None
+        return {commit_hash[:8] for commit_hash in listed.splitlines()}
+    
+    def _load_decision_cache(self):
+        """Load the watermark and mined decisions of each branch
+        
+        Returns an empty cache when the file is missing, unreadable or was
+        written by another version or with other keyword tables.
+        """
+        empty = {"version": self.DECISION_CACHE_VERSION, "branches": {}}
+        if not self.use_cache or not self.decision_cache_file.exists():
+            return empty
         
-        return "other"
+        try:
+            with open(self.decision_cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        
+        if (cache.get("version") != self.DECISION_CACHE_VERSION
+                or cache.get("keywords") != self._decision_keyword_signature()):
+            return empty
+        return cache
+    
+    def _save_decision_cache(self, cache):
+        """Atomically write the decision cache"""
+        tmp_file = self.decision_cache_file.with_suffix(".tmp")
+        try:
+            with self.profiler.phase("write"), open(tmp_file, 'w') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_file, self.decision_cache_file)
+        except OSError as e:
+            print(f"Warning: could not write decision cache: {e}")
+    
+    def _classify_decision(self, message):
+        """Classify decision type from message"""
+        return self.decision_classifier().classify(message)[1]
     
-    def _assess_impact(self, message):
-        """Assess impact level of decision"""
-        high_impact = ['major', 'breaking', 'architecture', 'redesign', 'overhaul']
-        medium_impact = ['refactor', 'enhance', 'improve', 'update']
+    def _assess_impact(self, message, stats=None):
+        """Assess impact level of decision from its message and, if given, its diff size
         
-        message_lower = message.lower()
-        if any(word in message_lower for word in high_impact):
+        stats carries files_changed, lines_added and lines_deleted; the
+        larger of the keyword and size assessments wins.
+        """
+        return self._rank_impact(self.decision_classifier().classify(message)[2], stats)
+    
+    def _rank_impact(self, keyword_impact, stats=None):
+        """Combine the keyword impact level (or None) with the diff size in stats"""
+        if keyword_impact == "high":
             return "high"
-        elif any(word in message_lower for word in medium_impact):
-            return "medium"
-        return "low"
+        
+        if stats:
+            lines_changed = stats["lines_added"] + stats["lines_deleted"]
+            for level in ("high", "medium"):
+                min_lines, min_files = self.IMPACT_CHANGE_THRESHOLDS[level]
+                if lines_changed >= min_lines or stats["files_changed"] >= min_files:
+                    return level
+        
+        return keyword_impact or "low"
     
     def _update_design_log(self, decisions):
-        """Update log.md with extracted decisions"""
+        """Render decisions into the Auto-Extracted section of log.md"""
         if not decisions:
             return
         
         design_log = self.project_path / "decisions" / "log.md"
         
         # Read existing content
-        existing_content = ""
-        if design_log.exists():
-            with open(design_log, 'r') as f:
-                existing_content = f.read()
+        existing_content = self.files.read_text(design_log) or ""
+        
+        parts = ["## Auto-Extracted from Git History\n",
+                 f"*Updated: {datetime.now().strftime('%Y-%m-%d')}*\n\n"]
+        
+        # Group by type
+        by_type = {}
+        for decision in decisions:
+            if decision['type'] not in by_type:
+                by_type[decision['type']] = []
+            by_type[decision['type']].append(decision)
+        
+        for decision_type, type_decisions in by_type.items():
+            parts.append(f"### {decision_type.title()}\n\n")
+            for d in type_decisions:
+                parts.append(f"**{d['subject']}** ({d['hash']})\n")
+                parts.append(f"- Date: {d['date']}\n")
+                parts.append(f"- Impact: {d['impact']}\n")
+                if 'files_changed' in d:
+                    parts.append(f"- Changes: {d['files_changed']} files, "
+                                 f"+{d['lines_added']}/-{d['lines_deleted']}\n")
+                if 'rationale' in d:
+                    parts.append(f"- Rationale: {d['rationale']}\n")
+                parts.append("\n")
+        section = "".join(parts)
         
-        # Add auto-extracted section if not present
         if "## Auto-Extracted from Git History" not in existing_content:
-            with open(design_log, 'a') as f:
-                f.write("\n\n## Auto-Extracted from Git History\n")
-                f.write(f"*Updated: {datetime.now().strftime('%Y-%m-%d')}*\n\n")
+            self.files.append_text(design_log, "\n\n" + section)
+        else:
+            self._replace_section(design_log, existing_content,
+                                  "## Auto-Extracted from Git History", section)
+    
+    def _iter_source_files(self):
+        """Yield (path, rel_path) for every scannable source file
+        
+        Inside a git repository the file list comes from the git index, which
+        already respects .gitignore; otherwise the tree is walked.
+        """
+        git_files = self._list_git_files() if self.use_git_index else None
+        if git_files is None:
+            yield from self._walk_source_files()
+        else:
+            yield from self._filter_git_files(git_files)
+    
+    def _list_git_files(self):
+        """List tracked and untracked, non-ignored files via git ls-files
+        
+        Returns None when the project root is not inside a git work tree.
+        """
+        try:
+            with self.profiler.phase("git"):
+                self.profiler.count("subprocesses")
+                result = subprocess.run(
+                    ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard'],
+                    capture_output=True, cwd=self.project_root
+                )
+        except OSError:
+            return None
+        
+        if result.returncode != 0:
+            return None
+        return [os.fsdecode(path) for path in result.stdout.split(b'\0') if path]
+    
+    def _filter_git_files(self, git_files):
+        """Apply extension and .memory-bank-ignore filters to git-listed files"""
+        # Unmerged entries are listed once per stage
+        for rel_path in sorted(set(git_files)):
+            if (os.path.splitext(rel_path)[1] in self.SCAN_EXTENSIONS
+                    and not self.scan_ignore.is_ignored(rel_path)):
+                yield str(self.project_root / rel_path), rel_path
+    
+    def _filter_changed_files(self, rel_paths):
+        """Yield (path, rel_path) for changed paths the full scan would have picked up"""
+        candidates = sorted(
+            rel_path for rel_path in set(rel_paths)
+            if os.path.splitext(rel_path)[1] in self.SCAN_EXTENSIONS
+            and not self.scan_ignore.is_ignored(rel_path)
+        )
+        
+        if candidates and self.use_git_index:
+            # Match the git index enumeration by dropping .gitignore'd paths
+            try:
+                with self.profiler.phase("git"):
+                    self.profiler.count("subprocesses")
+                    result = subprocess.run(
+                        ['git', 'check-ignore', '-z', '--stdin'],
+                        input=b'\0'.join(os.fsencode(p) for p in candidates),
+                        capture_output=True, cwd=self.project_root
+                    )
+                if result.returncode in (0, 1):
+                    git_ignored = {os.fsdecode(p) for p in result.stdout.split(b'\0') if p}
+                    candidates = [p for p in candidates if p not in git_ignored]
+            except OSError:
+                pass
+        
+        for rel_path in candidates:
+            yield str(self.project_root / rel_path), rel_path
+    
+    def _walk_source_files(self):
+        """Walk the project once, yielding (path, rel_path) for scannable files
+        
+        Ignored directories are pruned before descending, so large vendored
+        trees are never entered.
+        """
+        stack = [(str(self.project_root), "")]
+        
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                rel_path = rel_dir + entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self.scan_ignore.match(rel_path, True):
+                            subdirs.append((entry.path, rel_path + "/"))
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
                 
-                # Group by type
-                by_type = {}
-                for decision in decisions:
-                    if decision['type'] not in by_type:
-                        by_type[decision['type']] = []
-                    by_type[decision['type']].append(decision)
+                if (os.path.splitext(entry.name)[1] in self.SCAN_EXTENSIONS
+                        and not self.scan_ignore.match(rel_path)):
+                    yield entry.path, rel_path
+            
+            # Keep a depth-first, name-ordered traversal
+            stack.extend(reversed(subdirs))
+    
+    def _detector_signature(self):
+        """Fingerprint of the detectors, used to invalidate cached scan results"""
+        regex, categories = self._detector_regex()
+        detectors = regex.pattern + b"\n" + ",".join(categories[1:]).encode('utf-8')
+        return hashlib.blake2b(detectors, digest_size=8).hexdigest()
+    
+    def _load_scan_cache(self):
+        """Load per-file scan results, discarding caches from other versions"""
+        if not self.use_cache or not self.scan_cache_file.exists():
+            return {}
+        
+        try:
+            with open(self.scan_cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        if (cache.get("version") != self.SCAN_CACHE_VERSION
+                or cache.get("detectors") != self._detector_signature()):
+            return {}
+        return cache.get("files", {})
+    
+    def _save_scan_cache(self, files):
+        """Atomically write per-file scan results"""
+        cache = {
+            "version": self.SCAN_CACHE_VERSION,
+            "detectors": self._detector_signature(),
+            # rel_path -> [mtime_ns, size, content_hash, skip_reason,
+            #              *counts in PATTERN_DETECTORS order]
+            "files": files
+        }
+        
+        tmp_file = self.scan_cache_file.with_suffix(".tmp")
+        try:
+            with self.profiler.phase("write"), open(tmp_file, 'w') as f:
+                json.dump(cache, f, separators=(',', ':'))
+            os.replace(tmp_file, self.scan_cache_file)
+        except OSError as e:
+            print(f"Warning: could not write scan cache: {e}")
+    
+    @classmethod
+    def _detector_regex(cls):
+        """Compile PATTERN_DETECTORS into one bytes keyword-trie regex
+        
+        Returns (regex, categories) where categories[match.lastindex] is the
+        detector a match belongs to. Keywords share prefixes in the trie and a
+        leading lookahead on their first bytes lets the engine skip most
+        positions, so per-file cost stays roughly flat as detectors are added.
+        Where keywords overlap, the longest one wins. Keywords are matched as
+        UTF-8 bytes; ignore_case folds ASCII letters.
+        """
+        if cls.__dict__.get("_compiled_detectors") is None:
+            trie = {}
+            first_bytes = set()
+            for category, (keywords, ignore_case) in cls.PATTERN_DETECTORS.items():
+                for keyword in keywords:
+                    node = trie
+                    for byte in keyword.encode('utf-8'):
+                        char = bytes([byte])
+                        folded = ignore_case and char.isalpha()
+                        if node is trie:
+                            first_bytes.update((char.lower(), char.upper()) if folded else (char,))
+                        node = node.setdefault((char.lower(), True) if folded else (char, False), {})
+                    # A keyword listed under two detectors counts for the first
+                    node.setdefault(None, category)
+            
+            categories = [None]
+            
+            def emit(node):
+                alternatives = []
+                for key, child in node.items():
+                    if key is not None:
+                        char, folded = key
+                        atom = b"[" + char + char.upper() + b"]" if folded else re.escape(char)
+                        alternatives.append(atom + emit(child))
+                if None in node:
+                    # Empty capture group marks the end of a keyword
+                    categories.append(node[None])
+                    alternatives.append(b"()")
+                if len(alternatives) == 1:
+                    return alternatives[0]
+                return b"(?:" + b"|".join(alternatives) + b")"
+            
+            prefix = b"".join(re.escape(c) for c in sorted(first_bytes))
+            regex = re.compile(b"(?=[" + prefix + b"])" + emit(trie))
+            cls._compiled_detectors = (regex, categories)
+        return cls._compiled_detectors
+    
+    @classmethod
+    def _match_counts(cls, content):
+        """Count detector matches per category in a single pass over a bytes-like object"""
+        regex, categories = cls._detector_regex()
+        counts = dict.fromkeys(cls.PATTERN_DETECTORS, 0)
+        for index, hits in Counter(map(attrgetter('lastindex'), regex.finditer(content))).items():
+            counts[categories[index]] += hits
+        return list(counts.values())
+    
+    @classmethod
+    def _scan_file(cls, file_path, known=None, timings=None):
+        """Count detector matches in one file, returning (content_hash, skip_reason, counts)
+        
+        The file is memory-mapped and matched as bytes, so it is never decoded
+        and peak memory does not grow with file size. Files with a NUL byte in
+        their leading sample are reported as binary and not matched.
+        known is the cached (content_hash, counts) of the file, if any; when
+        the content still hashes to it the counts are returned unmatched.
+        timings, if given, is a [read wall, read CPU, match wall, match CPU,
+        files matched] list the time spent reading and hashing and matching
+        is added to.
+        """
+        counts = [0] * len(cls.PATTERN_DETECTORS)
+        if timings is not None:
+            start, start_cpu = time.perf_counter(), time.thread_time()
+        with open(file_path, 'rb') as f:
+            sample = f.read(cls.BINARY_SAMPLE_SIZE)
+            if not sample:
+                return hashlib.blake2b(b"", digest_size=16).hexdigest(), None, counts
+            if b"\0" in sample:
+                return None, "binary", counts
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+                if timings is not None:
+                    read, read_cpu = time.perf_counter(), time.thread_time()
+                    timings[0] += read - start
+                    timings[1] += read_cpu - start_cpu
+                if known is not None and content_hash == known[0]:
+                    # Touched but unchanged: the cached counts still hold
+                    return content_hash, None, list(known[1])
                 
-                for decision_type, type_decisions in by_type.items():
-                    f.write(f"### {decision_type.title()}\n\n")
-                    for d in type_decisions:
-                        f.write(f"**{d['subject']}** ({d['hash']})\n")
-                        f.write(f"- Date: {d['date']}\n")
-                        f.write(f"- Impact: {d['impact']}\n")
-                        if 'rationale' in d:
-                            f.write(f"- Rationale: {d['rationale']}\n")
-                        f.write("\n")
-    
-    def _scan_code_patterns(self):
-        """Scan codebase for patterns"""
+                counts = cls._match_counts(data)
+                if timings is not None:
+                    timings[2] += time.perf_counter() - read
+                    timings[3] += time.thread_time() - read_cpu
+                    timings[4] += 1
+                return content_hash, None, counts
+    
+    @staticmethod
+    def _known_content(cached, st):
+        """(content_hash, counts) of a scan cache entry that may still describe a file with stat st"""
+        if cached and cached[1] == st.st_size and cached[2] and not cached[3]:
+            return cached[2], cached[4:]
+        return None
+    
+    @staticmethod
+    def _pool_context():
+        """multiprocessing context for the scan pool: forkserver where available, else spawn"""
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context("forkserver")
+        return multiprocessing.get_context("spawn")
+    
+    def _scan_files(self, file_paths, total_size=0):
+        """Scan (file_path, known) pairs (see _scan_file), returning results in input order
+        
+        With jobs > 1 the files are split into batches and spread across a
+        process pool; executor.map keeps results in submission order.
+        Rescans below SCAN_PARALLEL_MIN_FILES files and
+        SCAN_PARALLEL_MIN_BYTES bytes (total_size) stay serial, as the
+        pool would not pay for its own startup.
+        Workers are started by a fork server (or spawned), never forked
+        from this process: under --all the scan runs next to threads that
+        hold locks and run git, and a forked child could inherit a lock
+        in the held state and deadlock. When profiling, batches also
+        return their read and match times.
+        """
+        if not file_paths:
+            return []
+        chunk_size = len(file_paths) // (self.jobs * 4)
+        chunk_size = max(self.SCAN_BATCH_MIN, min(self.SCAN_BATCH_MAX, chunk_size))
+        batches = [file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
+        scan_batch = _scan_file_batch_timed if self.profiler.enabled else _scan_file_batch
+        
+        small = (len(file_paths) < self.SCAN_PARALLEL_MIN_FILES
+                 and total_size < self.SCAN_PARALLEL_MIN_BYTES)
+        if self.jobs <= 1 or len(batches) < 2 or small:
+            outputs = [scan_batch(file_paths)]
+        else:
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.jobs, len(batches)),
+                                         mp_context=self._pool_context()) as executor:
+                    outputs = list(executor.map(scan_batch, batches))
+            except (OSError, BrokenProcessPool, pickle.PicklingError) as e:
+                print(f"Warning: parallel scan unavailable ({e}), scanning serially")
+                outputs = [scan_batch(file_paths)]
+        
+        if not self.profiler.enabled:
+            return [result for batch_results in outputs for result in batch_results]
+        
+        results = []
+        timings = [0.0] * 5
+        for batch_results, batch_timings in outputs:
+            results.extend(batch_results)
+            timings = [total + t for total, t in zip(timings, batch_timings)]
+        self.profiler.add("read", timings[0], timings[1], calls=len(file_paths))
+        self.profiler.add("match", timings[2], timings[3], calls=int(timings[4]))
+        return results
+    
+    def _scan_code_patterns(self, changed_files=None):
+        """Scan codebase for patterns
+        
+        Results are cached per file under .memory-bank/scan-cache.json and
+        reused while (mtime_ns, size) is unchanged, or while the content hash
+        still matches after a touch. Files no longer present are evicted.
+        Files that are not scanned are listed in self.scan_skipped with a reason.
+        
+        With changed_files (paths relative to the project root) and a previous
+        scan in this process, only those paths are re-examined and the tree
+        is not enumerated again.
+        """
         patterns = {
             "utilities": [],
             "components": [],
@@ -498,37 +1438,193 @@ class MemoryBankAutomation:
             "api_patterns": []
         }
         
-        # Scan for different file types
-        for ext in ['.py', '.js', '.ts', '.jsx', '.tsx']:
-            for file_path in self.project_root.rglob(f"*{ext}"):
-                if any(skip in str(file_path) for skip in ['node_modules', 'dist', 'build', '.git']):
-                    continue
-                
+        if changed_files is None or self._scan_entries is None:
+            if self.use_cache and self._scan_entries is not None:
+                # Long-lived processes (--watch, --serve) keep the last results in memory
+                cache = self._scan_entries
+            else:
+                cache = self._load_scan_cache()
+            files = {}
+            candidates = self._iter_source_files()
+        else:
+            cache = self._scan_entries
+            files = {rel_path: entry for rel_path, entry in cache.items() if rel_path not in changed_files}
+            candidates = self._filter_changed_files(changed_files)
+        
+        pending = []
+        self.scan_skipped = []
+        
+        visited = 0
+        with self.profiler.phase("enumerate"):
+            # Single pass over the tree for all scanned extensions
+            for visited, (file_path, rel_path) in enumerate(candidates, 1):
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Look for error handling patterns
-                    error_patterns = re.findall(r'(?:try|catch|throw|Error|Exception)', content)
-                    if error_patterns:
-                        patterns["error_patterns"].append({
-                            "file": str(file_path.relative_to(self.project_root)),
-                            "count": len(error_patterns)
-                        })
-                    
-                    # Look for API patterns
-                    api_patterns = re.findall(r'(?:fetch|axios|request|api|endpoint)', content, re.IGNORECASE)
-                    if api_patterns:
-                        patterns["api_patterns"].append({
-                            "file": str(file_path.relative_to(self.project_root)),
-                            "count": len(api_patterns)
-                        })
-                
-                except Exception:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
+                    # Still in the git index but deleted from the work tree
                     continue
+                except OSError as e:
+                    self.scan_skipped.append({"file": rel_path, "reason": f"unreadable ({e.strerror})"})
+                    continue
+            
+                if self.max_file_size and st.st_size > self.max_file_size:
+                    files[rel_path] = [st.st_mtime_ns, st.st_size, None, "too-large"] + [0] * len(self.PATTERN_DETECTORS)
+                    continue
+            
+                cached = cache.get(rel_path)
+                if (cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size
+                        and cached[3] != "too-large"):
+                    files[rel_path] = cached
+                else:
+                    # Placeholder keeps walk order for the rescanned entry
+                    files[rel_path] = None
+                    pending.append((file_path, rel_path, st))
         
+        # Rescan new and changed files; touched ones with cached counts are only hashed
+        pending_size = sum(st.st_size for _, _, st in pending)
+        results = self._scan_files([(file_path, self._known_content(cache.get(rel_path), st))
+                                    for file_path, rel_path, st in pending], pending_size)
+        for (_, rel_path, st), (content_hash, skip_reason, counts) in zip(pending, results):
+            if skip_reason and skip_reason.startswith("unreadable"):
+                # Not cached, so the file is retried on the next run
+                del files[rel_path]
+                self.scan_skipped.append({"file": rel_path, "reason": skip_reason})
+                continue
+            
+            files[rel_path] = [st.st_mtime_ns, st.st_size, content_hash, skip_reason] + counts
+        
+        for rel_path, entry in files.items():
+            if entry[3]:
+                self.scan_skipped.append({"file": rel_path, "reason": entry[3]})
+                continue
+            
+            for category, count in zip(self.PATTERN_DETECTORS, entry[4:]):
+                if count:
+                    patterns.setdefault(category, []).append({
+                        "file": rel_path,
+                        "count": count
+                    })
+        
+        self.profiler.count("files visited", visited)
+        self.profiler.count("files rescanned", len(pending))
+        self.profiler.count("bytes read", pending_size)
+        for skipped in self.scan_skipped:
+            self.profiler.count(f"files skipped: {skipped['reason'].split(' ')[0]}")
+        
+        # Rewrite only when something was rescanned or evicted
+        if self.use_cache and (pending or files.keys() != cache.keys()):
+            self._save_scan_cache(files)
+        
+        self._scan_entries = files
         return patterns
     
+    def _watched_memory_bank_files(self):
+        """Memory Bank inputs of the pitfall extractor and health monitor, relative to the project root"""
+        project_dir = self.project_path.relative_to(self.project_root).as_posix()
+        progress = f"{project_dir}/active/progress.md"
+        health = {f"{project_dir}/context/{name}" for name in
+                  ["projectBrief.md", "productContext.md", "systemPatterns.md", "techContext.md"]}
+        health.update(f"{project_dir}/active/{name}" for name in
+                      ["activeContext.md", "tasks.md", "progress.md"])
+        if self.is_multi_project and self.shared_path:
+            health.add(f"{self.shared_path.relative_to(self.project_root).as_posix()}/patterns.md")
+        return progress, health
+    
+    def _watch_snapshot(self):
+        """(mtime_ns, size) of every watched file, for the polling watcher"""
+        progress, health = self._watched_memory_bank_files()
+        paths = [rel_path for _, rel_path in self._iter_source_files()]
+        paths.extend(health | {progress})
+        return self._file_state(paths)
+    
+    def _file_state(self, rel_paths):
+        """(mtime_ns, size) of each existing path, relative to the project root"""
+        state = {}
+        for rel_path in rel_paths:
+            try:
+                st = os.stat(self.project_root / rel_path)
+            except OSError:
+                continue
+            state[rel_path] = (st.st_mtime_ns, st.st_size)
+        return state
+    
+    def _written_state(self, session):
+        """_file_state of the files a finished session wrote"""
+        return self._file_state(Path(path).relative_to(self.project_root).as_posix()
+                                for path in session.written)
+    
+    def watch(self, debounce=0.5, poll_interval=2.0):
+        """Keep systemPatterns.md and the health report current until interrupted
+        
+        Source changes rescan only the changed files; the pitfall extractor
+        and health monitor re-run only when their input files change. Bursts
+        of events are collected until debounce seconds pass without a new one.
+        Events for files the previous cycle wrote (systemPatterns.md,
+        health-report.json) are dropped while the file is as it was left.
+        """
+        progress, health = self._watched_memory_bank_files()
+        
+        with self.session() as session:
+            self.scan_and_update_patterns(refresh=True)
+            self.extract_pitfall_solutions(refresh=True)
+            self.monitor_context_health()
+        own_writes = self._written_state(session)
+        
+        try:
+            watcher = InotifyWatcher(
+                self.project_root,
+                lambda name, rel_path: self.scan_ignore.match(rel_path, True)
+            )
+        except (OSError, AttributeError) as e:
+            print(f"   inotify unavailable ({e}), polling every {poll_interval}s")
+            watcher = PollingWatcher(self._watch_snapshot, poll_interval)
+        
+        print(f"👀 Watching {self.project_root.resolve()} ({watcher.mode}), press Ctrl+C to stop")
+        try:
+            while True:
+                changed = watcher.wait(None)
+                while True:
+                    more = watcher.wait(debounce)
+                    if not more:
+                        break
+                    changed |= more
+                
+                # Events for the last cycle's own writes, unless the file changed again since
+                current = self._file_state(changed & own_writes.keys())
+                changed -= {rel_path for rel_path, state in current.items() if state == own_writes[rel_path]}
+                if not changed:
+                    continue
+                
+                if None in changed:
+                    # Events were dropped: fall back to a full refresh
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Event queue overflowed, rescanning")
+                    self._scan_entries = None
+                    changed = {progress} | health
+                    sources = None
+                else:
+                    sources = {p for p in changed if os.path.splitext(p)[1] in self.SCAN_EXTENSIONS}
+                    if not sources:
+                        sources = False
+                
+                stamp = datetime.now().strftime('%H:%M:%S')
+                with self.session() as session:
+                    if sources is not False:
+                        patterns = self.scan_and_update_patterns(changed_files=sources, refresh=True)
+                        total = sum(len(v) for v in patterns.values())
+                        print(f"[{stamp}] 📊 Rescanned {len(sources) if sources else 'all'} file(s), "
+                              f"{total} patterns")
+                    if progress in changed:
+                        pitfalls = self.extract_pitfall_solutions(refresh=True)
+                        print(f"[{stamp}] 🔍 Extracted {len(pitfalls)} pitfall solutions")
+                    if changed & health:
+                        report = self.monitor_context_health()
+                        print(f"[{stamp}] 🏥 Overall health: {report['overall_health']}%")
+                own_writes = self._written_state(session)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+        finally:
+            watcher.close()
+    
     def promote_to_shared(self, pattern_type, pattern_content):
         """Promote a pattern to shared/patterns.md in multi-project repos"""
         if not self.is_multi_project:
@@ -573,7 +1669,691 @@ class MemoryBankAutomation:
         
         return content
 
-def main():
+class MemoryBankFiles:
+    """Direct reads and writes of memory bank files
+    
+    The default file access of MemoryBankAutomation; MemoryBankSession
+    keeps the same interface but serves a snapshot and buffers writes.
+    """
+    
+    def stat(self, path):
+        """os.stat_result for path, or None if it does not exist"""
+        try:
+            return os.stat(path)
+        except FileNotFoundError:
+            return None
+    
+    def exists(self, path):
+        return self.stat(path) is not None
+    
+    def read_text(self, path):
+        """Contents of path, or None if it does not exist"""
+        try:
+            with open(path, 'r') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    
+    def write_text(self, path, content):
+        with open(path, 'w') as f:
+            f.write(content)
+    
+    def append_text(self, path, content):
+        with open(path, 'a') as f:
+            f.write(content)
+    
+    def flush(self):
+        pass
+
+class MemoryBankSession(MemoryBankFiles):
+    """Run-scoped snapshot of memory bank files, keyed by path
+    
+    Each path is stat'ed and read at most once; later calls are served
+    from memory. Writes and appends update the snapshot (including a
+    stat reporting the new size and a current mtime) and are written to
+    disk by flush, so a file changed by several tasks is written once.
+    """
+    
+    def __init__(self):
+        self._stats = {}
+        self._contents = {}
+        # Changed paths, in the order they were first changed
+        self._dirty = {}
+        # Paths flush has written to disk
+        self.written = []
+    
+    def stat(self, path):
+        if path not in self._stats:
+            self._stats[path] = super().stat(path)
+        return self._stats[path]
+    
+    def read_text(self, path):
+        if path not in self._contents:
+            self._contents[path] = super().read_text(path) if self.stat(path) else None
+        return self._contents[path]
+    
+    def write_text(self, path, content):
+        self._contents[path] = content
+        self._dirty.setdefault(path, True)
+        now = time.time()
+        self._stats[path] = os.stat_result(
+            (0o100644, 0, 0, 1, 0, 0, len(content.encode()), now, now, now))
+    
+    def append_text(self, path, content):
+        self.write_text(path, (self.read_text(path) or "") + content)
+    
+    def flush(self):
+        """Write every changed file to disk"""
+        for path in self._dirty:
+            super().write_text(path, self._contents[path])
+        self.written.extend(self._dirty)
+        self._dirty.clear()
+
+class TaskScheduler:
+    """Runs tasks on threads, ordered only where their declared I/O conflicts
+    
+    Each task names the resources (memory bank files, git history, ...)
+    it reads and writes. A task waits for every earlier task that writes
+    something it reads or writes, or reads something it writes, so the
+    outcome is the same as running the tasks in the order they were added
+    while independent ones, such as the git log and the source scan,
+    overlap.
+    """
+    
+    def __init__(self):
+        # (name, func, reads, writes)
+        self.tasks = []
+    
+    def add(self, name, func, reads=(), writes=()):
+        self.tasks.append((name, func, frozenset(reads), frozenset(writes)))
+    
+    def dependencies(self):
+        """Indexes of the earlier tasks each task has to wait for"""
+        deps = []
+        for i, (_, _, reads, writes) in enumerate(self.tasks):
+            deps.append({j for j, (_, _, earlier_reads, earlier_writes) in enumerate(self.tasks[:i])
+                         if earlier_writes & (reads | writes) or earlier_reads & writes})
+        return deps
+    
+    def run(self):
+        """Yield (name, result) for every task, in the order they were added
+        
+        A task's exception is raised when its turn comes; tasks depending
+        on it are not started.
+        """
+        deps = self.dependencies()
+        done = {}
+        running = {}
+        next_index = 0
+        with ThreadPoolExecutor(max_workers=max(1, len(self.tasks))) as executor:
+            while next_index < len(self.tasks):
+                for i, (_, func, _, _) in enumerate(self.tasks):
+                    if (i not in done and i not in running.values()
+                            and all(d in done and done[d].exception() is None for d in deps[i])):
+                        running[executor.submit(func)] = i
+                
+                while next_index in done:
+                    yield self.tasks[next_index][0], done[next_index].result()
+                    next_index += 1
+                
+                if running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        done[running.pop(future)] = future
+
+class TaskOutput:
+    """sys.stdout stand-in that keeps the output of overlapping tasks apart
+    
+    A thread between capture() and release() writes to its own buffer;
+    every other thread writes through to the wrapped stream. run_tasks
+    prints each task's buffer under its heading, in task order.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def capture(self):
+        """Buffer this thread's output until release(), which returns it"""
+        self._local.buffer = io.StringIO()
+    
+    def release(self):
+        buffer, self._local.buffer = self._local.buffer, None
+        return buffer.getvalue()
+    
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self.stream).write(text)
+    
+    def flush(self):
+        if getattr(self._local, "buffer", None) is None:
+            self.stream.flush()
+    
+    def __getattr__(self, name):
+        # encoding, isatty(), fileno() ... of the real stream
+        return getattr(self.stream, name)
+
+class DecisionClassifier:
+    """Token index that classifies a commit message in one tokenization pass
+    
+    Every keyword is expanded into its common inflections ("migrate" also
+    matches "migrated", "migrating" and "migration") and each form maps to
+    whether it marks a decision, the rank of its decision type and the rank
+    of its impact level. Messages are split into words, so a keyword never
+    matches inside an unrelated word.
+    """
+    
+    WORD_RE = re.compile(r"[a-z]+")
+    
+    def __init__(self, decision_keywords, types, impact):
+        tables = json.dumps([decision_keywords, types, impact]).encode('utf-8')
+        self.signature = hashlib.blake2b(tables, digest_size=8).hexdigest()
+        self.type_names = list(types) + ["other"]
+        self.impact_levels = list(impact) + [None]
+        self.no_type, self.no_impact = len(types), len(impact)
+        # form -> [is_decision, type rank, impact rank]; lower ranks win
+        self.index = {}
+        
+        for keyword in decision_keywords:
+            for form in self._inflections(keyword):
+                self._entry(form)[0] = True
+        for rank, keywords in enumerate(types.values()):
+            for keyword in keywords:
+                for form in self._inflections(keyword):
+                    entry = self._entry(form)
+                    entry[1] = min(entry[1], rank)
+        for rank, keywords in enumerate(impact.values()):
+            for keyword in keywords:
+                for form in self._inflections(keyword):
+                    entry = self._entry(form)
+                    entry[2] = min(entry[2], rank)
+    
+    def _entry(self, form):
+        return self.index.setdefault(form, [False, self.no_type, self.no_impact])
+    
+    @staticmethod
+    def _inflections(word):
+        """The word plus its plural, tense, agent and noun forms"""
+        word = word.lower()
+        forms = {word, word + "s", word + "es", word + "ed", word + "ing", word + "er",
+                 word + "ers", word + "al", word + "ment", word + "ments",
+                 word + "ation", word + "ations", word + "ion", word + "ions"}
+        if word.endswith("e"):
+            stem = word[:-1]
+            forms |= {word + "d", word + "r", word + "rs", stem + "ing", stem + "al",
+                      stem + "ation", stem + "ations", stem + "ion", stem + "ions"}
+            if word.endswith("ce"):
+                forms |= {stem + "tion", stem + "tions"}
+        elif word.endswith("y"):
+            forms |= {word[:-1] + "ies", word[:-1] + "ied"}
+        return forms
+    
+    def classify(self, message):
+        """Return (is_decision, decision type, keyword impact level or None) for message"""
+        is_decision = False
+        type_rank, impact_rank = self.no_type, self.no_impact
+        index = self.index
+        for word in self.WORD_RE.findall(message.lower()):
+            entry = index.get(word)
+            if entry is not None:
+                is_decision = is_decision or entry[0]
+                type_rank = min(type_rank, entry[1])
+                impact_rank = min(impact_rank, entry[2])
+        return is_decision, self.type_names[type_rank], self.impact_levels[impact_rank]
+
+
+class InotifyWatcher:
+    """Recursive file watcher over a small ctypes binding to Linux inotify"""
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM |
+                  IN_MOVED_TO | IN_CREATE | IN_DELETE)
+    EVENT_HEADER = struct.Struct("iIII")
+    
+    mode = "inotify"
+    
+    def __init__(self, root, is_ignored_dir):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        
+        self.root = Path(root)
+        self.is_ignored_dir = is_ignored_dir
+        self.watches = {}
+        try:
+            self._watch_tree("")
+        except OSError:
+            self.close()
+            raise
+    
+    def _watch_tree(self, rel_dir):
+        """Add watches for rel_dir and its non-ignored subdirectories, returning the files found"""
+        files = []
+        stack = [rel_dir]
+        while stack:
+            current = stack.pop()
+            path = self.root / current if current else self.root
+            wd = self._add_watch(self.fd, os.fsencode(str(path)), self.WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if errno == 28:  # ENOSPC: out of inotify watches
+                    raise OSError(errno, "inotify watch limit reached")
+                continue
+            self.watches[wd] = current
+            
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        rel_path = f"{current}/{entry.name}" if current else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.is_ignored_dir(entry.name, rel_path):
+                                stack.append(rel_path)
+                        else:
+                            files.append(rel_path)
+            except OSError:
+                continue
+        return files
+    
+    def wait(self, timeout):
+        """Block up to timeout seconds (None = forever); return changed relative paths
+        
+        A None entry in the result means events were lost and the caller
+        should treat everything as changed.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        
+        data = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            
+            if mask & self.IN_Q_OVERFLOW:
+                changed.add(None)
+                continue
+            if mask & self.IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            if wd not in self.watches:
+                continue
+            
+            rel_dir = self.watches[wd]
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and not self.is_ignored_dir(name, rel_path):
+                    # Files may land in a new directory before its watch exists
+                    changed.update(self._watch_tree(rel_path))
+                continue
+            changed.add(rel_path)
+        
+        return changed
+    
+    def close(self):
+        """Release the inotify file descriptor"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class PollingWatcher:
+    """Fallback watcher comparing (mtime_ns, size) snapshots at a fixed interval"""
+    mode = "polling"
+    
+    def __init__(self, snapshot, interval):
+        self.snapshot = snapshot
+        self.interval = interval
+        self.state = snapshot()
+    
+    def wait(self, timeout):
+        """Block up to timeout seconds (None = forever); return changed relative paths"""
+        while True:
+            time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+            state = self.snapshot()
+            changed = {p for p in state.keys() | self.state.keys() if state.get(p) != self.state.get(p)}
+            self.state = state
+            if changed or timeout is not None:
+                return changed
+    
+    def close(self):
+        """Nothing to release"""
+
+class AutomationServer(socketserver.UnixStreamServer):
+    """Runs auto-update.py commands sent by memory_bank_client.py
+    
+    Listens on .memory-bank/auto-update.sock and handles one command at a
+    time, in process, so interpreter startup, argument parsing, memory
+    bank setup, compiled detectors and the last scan results are paid for
+    once instead of per command. MemoryBankAutomation instances are kept
+    per option set and rebuilt when .memory-bank-ignore, the decision
+    keywords or the single/multi-project layout change. Commands for
+    another project root, --watch and server management are answered
+    with a fallback so the client runs them itself.
+    """
+    
+    def __init__(self, project_root, idle_timeout=0):
+        self.project_root = Path(project_root).resolve()
+        path = socket_path(str(self.project_root))
+        if os.path.exists(path):
+            try:
+                # A live server that is busy raises ServerTimeout, a RuntimeError
+                request(path, {"ping": True}, timeout=2)
+                raise RuntimeError(f"a server is already listening on {path}")
+            except (OSError, ValueError):
+                # Left behind by a server that did not shut down cleanly
+                os.unlink(path)
+        # Checked by handle_request between commands
+        self.timeout = idle_timeout or None
+        self.running = True
+        self.automations = {}
+        super().__init__(path, AutomationRequestHandler)
+    
+    def server_bind(self):
+        # Owner-only socket: commands write to the memory bank
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+    
+    def serve(self):
+        """Handle commands until stopped or idle for idle_timeout seconds"""
+        try:
+            while self.running:
+                self.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server_close()
+            try:
+                os.unlink(self.server_address)
+            except OSError:
+                pass
+    
+    def handle_timeout(self):
+        self.running = False
+    
+    def _fingerprint(self):
+        """State that MemoryBankAutomation reads once, at construction"""
+        def mtime(path):
+            try:
+                return os.stat(path).st_mtime_ns
+            except OSError:
+                return None
+        memory_bank = self.project_root / ".memory-bank"
+        return (mtime(self.project_root / ".memory-bank-ignore"),
+                mtime(memory_bank / "decision-keywords.json"),
+                (memory_bank / "shared").is_dir())
+    
+    def automation(self, args, profiler):
+        """A warm MemoryBankAutomation for args, reporting to profiler"""
+        key = (args.project_name, args.no_cache, args.jobs, args.max_file_size,
+               args.no_git_index, args.all_projects)
+        fingerprint = self._fingerprint()
+        cached = self.automations.get(key)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, create_automation(args, profiler))
+            self.automations[key] = cached
+        automation = cached[1]
+        automation.profiler = profiler
+        return automation
+    
+    def execute(self, message):
+        """Run one request, returning the reply"""
+        if message.get("stop"):
+            self.running = False
+            return {"stdout": "", "stderr": "", "exit": 0}
+        if "argv" not in message:
+            return {"stdout": "", "stderr": "", "exit": 0}
+        
+        stdout, stderr = io.StringIO(), io.StringIO()
+        status = 0
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            parser = build_parser()
+            try:
+                args = parser.parse_args(message["argv"])
+                cwd = Path(message.get("cwd", "."))
+                args.project_root = str(cwd / args.project_root)
+                if (Path(args.project_root).resolve() != self.project_root
+                        or args.watch or args.serve or args.stop_server):
+                    return {"fallback": True}
+                # Output files are named relative to the client
+                for option in ("profile_output", "trace"):
+                    if getattr(args, option):
+                        setattr(args, option, str(cwd / getattr(args, option)))
+                run_command(args, parser, self.automation)
+            except SystemExit as e:
+                status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                if isinstance(e.code, str):
+                    print(e.code, file=sys.stderr)
+            except Exception:
+                traceback.print_exc()
+                status = 1
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit": status}
+
+
+class AutomationRequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, one JSON reply line out"""
+    
+    def handle(self):
+        try:
+            message = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        reply = self.server.execute(message)
+        self.wfile.write(json.dumps(reply).encode('utf-8') + b"\n")
+
+class _ProfiledReader:
+    """Binary stream wrapper adding the time spent in read() to a profiler phase"""
+    
+    def __init__(self, stream, profiler, phase):
+        self.stream = stream
+        self.profiler = profiler
+        self.phase = phase
+    
+    def read(self, size=-1):
+        start, start_cpu = time.perf_counter(), time.thread_time()
+        data = self.stream.read(size)
+        self.profiler.add(self.phase, time.perf_counter() - start, time.thread_time() - start_cpu)
+        return data
+
+def _iter_nul_fields(stream, chunk_size=64 * 1024):
+    """Yield the NUL-separated fields of a binary stream, reading it in chunks"""
+    pending = b""
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        fields = (pending + chunk).split(b"\0")
+        pending = fields.pop()
+        yield from fields
+    if pending:
+        yield pending
+
+
+def _scan_file_batch(file_paths):
+    """Scan a batch of (file_path, known) pairs; runs in worker processes when --jobs > 1"""
+    results = []
+    for file_path, known in file_paths:
+        try:
+            results.append(MemoryBankAutomation._scan_file(file_path, known))
+        except (OSError, ValueError) as e:
+            reason = getattr(e, 'strerror', None) or str(e)
+            results.append((None, f"unreadable ({reason})", []))
+    return results
+
+def _scan_file_batch_timed(file_paths):
+    """_scan_file_batch for --profile, also returning the batch's read and match times"""
+    results = []
+    timings = [0.0] * 5
+    for file_path, known in file_paths:
+        try:
+            results.append(MemoryBankAutomation._scan_file(file_path, known, timings))
+        except (OSError, ValueError) as e:
+            reason = getattr(e, 'strerror', None) or str(e)
+            results.append((None, f"unreadable ({reason})", []))
+    return results, timings
+
+def print_scan_summary(automation, patterns):
+    """Print the pattern count and any files the scanner skipped"""
+    total = sum(len(v) for v in patterns.values())
+    print(f"   Found {total} patterns across codebase")
+    if automation.scan_skipped:
+        reasons = Counter(s["reason"].split(" ")[0] for s in automation.scan_skipped)
+        summary = ", ".join(f"{reason}: {count}" for reason, count in sorted(reasons.items()))
+        print(f"   Skipped {len(automation.scan_skipped)} files ({summary})")
+        for skipped in automation.scan_skipped[:5]:
+            print(f"   - {skipped['file']}: {skipped['reason']}")
+
+def print_all_projects_report(automation, report):
+    """Print one aggregated report for MemoryBankAutomation.run_all_projects"""
+    projects = report["projects"]
+    print("📊 Code patterns (scanned once for all projects)")
+    print_scan_summary(automation, report["patterns"])
+    print()
+    
+    width = max([len("Project")] + [len(r["project"]) for r in projects])
+    print(f"   {'Project':<{width}}  Health  Pitfalls  Decisions  Structure")
+    for result in projects:
+        validation = result["validation"]
+        print(f"   {result['project']:<{width}}  {result['health']['overall_health']:>5}%  "
+              f"{len(result['pitfalls']):>8}  {len(result['decisions']):>9}  {validation['summary']}")
+    
+    recommendations = [(r["project"], rec) for r in projects for rec in r["health"]["recommendations"]]
+    problems = [(r["project"], problem) for r in projects
+                for problem in r["validation"]["errors"] + r["validation"]["warnings"]]
+    if recommendations:
+        print("\n   Recommendations:")
+        for project, rec in recommendations:
+            print(f"   - [{project}] {rec}")
+    if problems:
+        print("\n   Structure issues:")
+        for project, problem in problems:
+            print(f"   - [{project}] {problem}")
+    
+    if projects:
+        average = sum(r["health"]["overall_health"] for r in projects) / len(projects)
+        print(f"\n✅ {len(projects)} projects updated, average health {average:.0f}%")
+    else:
+        print("No projects found")
+
+def run_tasks(automation, args):
+    """Run the automation tasks selected by args, printing their results in order
+    
+    Independent tasks run at the same time (see TaskScheduler); the ones
+    touching the same files keep their listed order. What a task prints
+    while running is held back and shown under its heading (see TaskOutput).
+    """
+    patterns_file = "context/systemPatterns.md"
+    design_log = "decisions/log.md"
+    
+    def report_patterns(patterns):
+        print_scan_summary(automation, patterns)
+    
+    def report_pitfalls(pitfalls):
+        print(f"   Extracted {len(pitfalls)} pitfall solutions")
+    
+    def report_decisions(decisions):
+        print(f"   Found {len(decisions)} architectural decisions")
+    
+    def report_health(health):
+        print(f"   Overall health: {health['overall_health']}%")
+        if health['recommendations']:
+            print("   Recommendations:")
+            for rec in health['recommendations']:
+                print(f"   - {rec}")
+    
+    def report_validation(validation):
+        print(f"   {validation['summary']}")
+        
+        if validation['errors']:
+            print("   ❌ Errors:")
+            for error in validation['errors']:
+                print(f"      - {error}")
+        
+        if validation['warnings']:
+            print("   ⚠️  Warnings:")
+            for warning in validation['warnings']:
+                print(f"      - {warning}")
+    
+    def extract_git_decisions():
+        return automation.extract_git_decisions(since=args.since)
+    
+    output = TaskOutput(sys.stdout)
+    # Output of each task, including one that failed
+    printed = {}
+    
+    def profiled(heading, name, task):
+        def run():
+            output.capture()
+            try:
+                with automation.profiler.phase(name):
+                    return task()
+            finally:
+                printed[heading] = output.release()
+        return run
+    
+    # (selected, heading, task, report, reads, writes)
+    tasks = [
+        (args.scan_patterns, "📊 Scanning for code patterns...",
+         automation.scan_and_update_patterns, report_patterns,
+         ["source files", patterns_file], [patterns_file, "scan-cache.json"]),
+        (args.extract_pitfalls, "🔍 Extracting pitfall → solution patterns...",
+         automation.extract_pitfall_solutions, report_pitfalls,
+         ["active/progress.md", patterns_file], [patterns_file, "pitfall-index.json"]),
+        (args.extract_decisions, "📝 Extracting decisions from git history...",
+         extract_git_decisions, report_decisions,
+         ["git history", design_log], [design_log, "decision-cache.json"]),
+        # File ages and sizes, including the files written above
+        (args.health_check, "🏥 Checking context files health...",
+         automation.monitor_context_health, report_health,
+         ["context/", "active/", patterns_file], ["health-report.json"]),
+        # File existence, including files the tasks above may create
+        (args.validate_structure, "🏗️  Validating Memory Bank structure...",
+         automation.validate_structure, report_validation,
+         ["structure", patterns_file, design_log], []),
+    ]
+    
+    scheduler = TaskScheduler()
+    reports = {}
+    for selected, heading, task, report, reads, writes in tasks:
+        if args.all or selected:
+            scheduler.add(heading, profiled(heading, f"task: {task.__name__}", task), reads, writes)
+            reports[heading] = report
+    
+    results = scheduler.run()
+    sys.stdout = output
+    try:
+        for heading in reports:
+            try:
+                _, result = next(results)
+            except Exception:
+                # Show what the failed task printed before its error
+                output.stream.write(heading + "\n" + printed.pop(heading, ""))
+                raise
+            output.stream.write(heading + "\n" + printed.pop(heading))
+            reports[heading](result)
+    finally:
+        sys.stdout = output.stream
+
+def build_parser():
+    """The auto-update.py command line, shared by main and the server"""
     parser = argparse.ArgumentParser(
         description="🤖 Claude Memory Bank Automation - Context-Driven Workflow System v2.0",
         epilog="""
@@ -587,6 +2367,7 @@ Examples:
     %(prog)s --list-projects
     %(prog)s --health-check --project-name api-service
     %(prog)s --all --project-name web-app
+    %(prog)s --all-projects
     
 For detailed task descriptions:
     %(prog)s --list-tasks
@@ -601,13 +2382,18 @@ For detailed task descriptions:
     tasks.add_argument("--extract-pitfalls", action="store_true", 
                        help="Extract issue→solution patterns from progress.md")
     tasks.add_argument("--extract-decisions", action="store_true", 
-                       help="Mine git history for architectural decisions (last 30 days)")
+                       help="Mine git history for architectural decisions (new commits since the last run)")
     tasks.add_argument("--health-check", action="store_true", 
                        help="Check context files health and generate recommendations")
     tasks.add_argument("--validate-structure", action="store_true",
                        help="Validate Memory Bank directory structure and report issues")
     tasks.add_argument("--all", action="store_true", 
-                       help="Run all automation tasks in sequence")
+                       help="Run all automation tasks, independent ones concurrently")
+    tasks.add_argument("--all-projects", action="store_true",
+                       help="Run all tasks for every project of a multi-project repository, "
+                            "scanning code and mining git once")
+    tasks.add_argument("--watch", action="store_true",
+                       help="Keep systemPatterns.md and the health report updated as files change")
     
     # Configuration group
     config = parser.add_argument_group('⚙️  Configuration')
@@ -615,6 +2401,31 @@ For detailed task descriptions:
                         help="Project root directory (default: current directory)")
     config.add_argument("--project-name", metavar="NAME",
                         help="Project name (required for multi-project repositories)")
+    config.add_argument("--no-cache", action="store_true",
+                        help="Rescan every file, reparse progress.md and mine git history again, "
+                             "ignoring scan-cache.json, pitfall-index.json and decision-cache.json")
+    config.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="Scan files with N worker processes and mine --since history in N date "
+                             "shards at once (0 = one per CPU, default: 1)")
+    config.add_argument("--max-file-size", type=float, metavar="MB",
+                        default=MemoryBankAutomation.DEFAULT_MAX_FILE_SIZE_MB,
+                        help="Skip source files larger than MB megabytes (0 = no limit, default: %(default)s)")
+    config.add_argument("--no-git-index", action="store_true",
+                        help="Walk the directory tree instead of listing files with git ls-files")
+    config.add_argument("--since", metavar="DATE",
+                        help="Mine decisions back to DATE, e.g. 2019-01-01 or '90 days ago' "
+                             "(default: last run, or 30 days ago on the first run)")
+    config.add_argument("--debounce", type=float, default=0.5, metavar="SECONDS",
+                        help="Quiet period before --watch processes a burst of changes (default: 0.5)")
+    config.add_argument("--poll-interval", type=float, default=2.0, metavar="SECONDS",
+                        help="Polling interval for --watch when inotify is unavailable (default: 2.0)")
+    config.add_argument("--profile", action="store_true",
+                        help="Print per-phase wall and CPU time and I/O counters to stderr")
+    config.add_argument("--profile-output", metavar="FILE",
+                        help="Write the --profile summary as JSON to FILE (implies --profile)")
+    config.add_argument("--trace", metavar="FILE",
+                        help="Write a Chrome trace (chrome://tracing, Perfetto) of the phases "
+                             "to FILE (implies --profile)")
     
     # Information group
     info = parser.add_argument_group('ℹ️  Information')
@@ -623,7 +2434,33 @@ For detailed task descriptions:
     info.add_argument("--list-tasks", action="store_true",
                       help="Show detailed descriptions of all automation tasks")
     
-    args = parser.parse_args()
+    # Server group
+    server = parser.add_argument_group('🔌 Server')
+    server.add_argument("--serve", action="store_true",
+                        help="Serve commands from memory_bank_client.py on .memory-bank/auto-update.sock, "
+                             "keeping caches warm between them")
+    server.add_argument("--stop-server", action="store_true",
+                        help="Stop the server of --project-root")
+    server.add_argument("--idle-timeout", type=float, default=1800, metavar="SECONDS",
+                        help="Stop --serve after SECONDS without a command (0 = never, default: %(default)s)")
+    return parser
+
+def create_automation(args, profiler):
+    """A MemoryBankAutomation configured by the parsed command line"""
+    return MemoryBankAutomation(args.project_root, args.project_name,
+                                use_cache=not args.no_cache, jobs=args.jobs,
+                                max_file_size_mb=args.max_file_size,
+                                use_git_index=not args.no_git_index,
+                                all_projects=args.all_projects, profiler=profiler)
+
+def run_command(args, parser, make_automation=create_automation):
+    """Run one parsed auto-update.py command line in this process
+    
+    make_automation(args, profiler) supplies the MemoryBankAutomation; the
+    server passes one that reuses warm instances.
+    """
+    if args.watch and args.all_projects:
+        parser.error("--watch cannot be combined with --all-projects; watch one --project-name at a time")
     
     # Handle list-tasks
     if args.list_tasks:
@@ -660,7 +2497,7 @@ For detailed task descriptions:
                 "name": "Decision Miner",
                 "description": "Mines git history for architectural decisions",
                 "details": [
-                    "• Analyzes commit messages from last 30 days",
+                    "• Analyzes commits made since the last run (first run: 30 days, or --since)",
                     "• Identifies refactoring and design changes",
                     "• Extracts rationale from commit bodies",
                     "• Categorizes by impact (high/medium/low)",
@@ -694,14 +2531,26 @@ For detailed task descriptions:
             {
                 "flag": "--all",
                 "name": "Full Automation Suite",
-                "description": "Runs all automation tasks in sequence",
+                "description": "Runs all automation tasks, overlapping independent ones",
                 "details": [
                     "• Executes all tasks above",
+                    "• Runs git mining alongside the code scan; tasks sharing files keep their order",
                     "• Provides comprehensive repository analysis",
                     "• Updates all relevant documentation",
                     "• Best for periodic maintenance",
                     "• Generates complete health assessment"
                 ]
+            },
+            {
+                "flag": "--all-projects",
+                "name": "Multi-Project Suite",
+                "description": "Runs all tasks for every project of a multi-project repository",
+                "details": [
+                    "• Scans the codebase and mines git history once",
+                    "• Updates each project's patterns, anti-patterns and design log",
+                    "• Runs health checks and validation per project",
+                    "• Prints one aggregated report"
+                ]
             }
         ]
         
@@ -730,8 +2579,7 @@ For detailed task descriptions:
         if memory_bank.exists():
             shared_path = memory_bank / "shared"
             if shared_path.exists():
-                projects = [d.name for d in memory_bank.iterdir() 
-                           if d.is_dir() and d.name != "shared"]
+                projects = MemoryBankAutomation.find_projects(memory_bank)
                 print(f"Available projects: {', '.join(projects)}")
             else:
                 print("This is a single-project repository")
@@ -739,57 +2587,67 @@ For detailed task descriptions:
             print("Memory Bank not found")
         return
     
-    automation = MemoryBankAutomation(args.project_root, args.project_name)
+    profiler = Profiler(enabled=bool(args.profile or args.profile_output or args.trace))
+    with profiler.phase("init"):
+        automation = make_automation(args, profiler)
     
     # Print repository type
-    if automation.is_multi_project:
+    if args.all_projects and automation.is_multi_project and not automation.project_name:
+        print(f"🏢 Multi-project repository - Working on all projects: "
+              f"{', '.join(automation.list_projects())}")
+        print()
+        with automation.session():
+            report = automation.run_all_projects(since=args.since)
+        print_all_projects_report(automation, report)
+        profiler.report(args.profile_output, args.trace, stream=sys.stderr)
+        return
+    elif automation.is_multi_project:
         print(f"🏢 Multi-project repository - Working on: {automation.project_name}")
     else:
         print("🏠 Single-project repository")
     print()
     
-    if args.all or args.scan_patterns:
-        print("📊 Scanning for code patterns...")
-        patterns = automation.scan_and_update_patterns()
-        total = sum(len(v) for v in patterns.values())
-        print(f"   Found {total} patterns across codebase")
+    # Without several projects to share work between, --all-projects is --all
+    args.all = args.all or args.all_projects
     
-    if args.all or args.extract_pitfalls:
-        print("🔍 Extracting pitfall → solution patterns...")
-        pitfalls = automation.extract_pitfall_solutions()
-        print(f"   Extracted {len(pitfalls)} pitfall solutions")
+    # Tasks share one snapshot of the memory bank files, written back once at the end
+    with automation.session():
+        run_tasks(automation, args)
+    profiler.report(args.profile_output, args.trace, stream=sys.stderr)
     
-    if args.all or args.extract_decisions:
-        print("📝 Extracting decisions from git history...")
-        decisions = automation.extract_git_decisions()
-        print(f"   Found {len(decisions)} architectural decisions")
-    
-    if args.all or args.health_check:
-        print("🏥 Checking context files health...")
-        health = automation.monitor_context_health()
-        print(f"   Overall health: {health['overall_health']}%")
-        if health['recommendations']:
-            print("   Recommendations:")
-            for rec in health['recommendations']:
-                print(f"   - {rec}")
-    
-    if args.all or args.validate_structure:
-        print("🏗️  Validating Memory Bank structure...")
-        validation = automation.validate_structure()
-        print(f"   {validation['summary']}")
-        
-        if validation['errors']:
-            print("   ❌ Errors:")
-            for error in validation['errors']:
-                print(f"      - {error}")
-        
-        if validation['warnings']:
-            print("   ⚠️  Warnings:")
-            for warning in validation['warnings']:
-                print(f"      - {warning}")
+    if args.watch:
+        print("👀 Starting watch mode...")
+        automation.watch(debounce=args.debounce, poll_interval=args.poll_interval)
     
     if not any(vars(args).values()):
         parser.print_help()
 
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    
+    if args.serve:
+        try:
+            server = AutomationServer(args.project_root, idle_timeout=args.idle_timeout)
+        except (OSError, RuntimeError) as e:
+            print(f"Cannot start server: {e}")
+            sys.exit(1)
+        print(f"🔌 Serving on {server.server_address} (stop with --stop-server)")
+        server.serve()
+        return
+    
+    if args.stop_server:
+        try:
+            request(socket_path(args.project_root), {"stop": True}, timeout=10)
+            print("Server stopped")
+        except ServerTimeout as e:
+            print(f"Server did not stop: {e}")
+            sys.exit(1)
+        except (OSError, ValueError):
+            print("No server running")
+        return
+    
+    run_command(args, parser)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
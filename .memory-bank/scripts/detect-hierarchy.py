@@ -4,89 +4,189 @@ Detect hierarchical project structure based on .git directories
 Part of Memory Bank v2.1 - Hierarchical Project Support
 """
 
+import hashlib
 import json
 import os
+import sys
+import time
+from collections import deque
 from pathlib import Path
-import subprocess
 from typing import Dict, List, Optional
 
+from memory_bank_ignore import IgnoreMatcher
+from memory_bank_profile import Profiler
+
 class HierarchyDetector:
-    def __init__(self, root_path: str = "."):
+    # Build output and dependency folders that are not descended into inside a
+    # repo, unless they are repos themselves or re-included with ! in .memory-bank-ignore
+    REPO_BUILD_DIRS = frozenset([
+        'node_modules', 'vendor', 'bower_components', 'dist', 'build', 'target', 'out',
+        '.venv', 'venv', '__pycache__', '.tox', '.gradle', '.next', 'Pods'
+    ])
+    
+    CACHE_VERSION = 1
+    # Directories modified this recently may change again within the same
+    # mtime tick, so their listing is cached without an mtime (always rescanned)
+    RACY_WINDOW_NS = 2_000_000_000
+    
+    def __init__(self, root_path: str = ".", use_cache: bool = True,
+                 profiler: Optional[Profiler] = None):
         self.root = Path(root_path).resolve()
         self.max_depth = 3  # Maximum scanning depth
+        self.use_cache = use_cache
+        self.cache_file = self.root / ".memory-bank" / "hierarchy-cache.json"
+        self.ignore_hash = ""
         self.ignored_patterns = self._load_ignore_patterns()
+        self.ignore_matcher = IgnoreMatcher(self.ignored_patterns)
+        # Directories listed with scandir vs. reused from the cache by the last walk
+        self.scan_stats = {"scanned": 0, "cached": 0}
+        # Phase timings and counters for --profile; a disabled one records nothing
+        self.profiler = profiler or Profiler(enabled=False)
     
     def _load_ignore_patterns(self) -> List[str]:
-        """Load patterns from .memory-bank-ignore file"""
+        """Load lines from .memory-bank-ignore file, remembering its hash
+        
+        Lines are passed on as they are; IgnoreMatcher drops comments and
+        blank lines and strips trailing spaces unless escaped (foo\\ ).
+        """
         patterns = []
         ignore_file = self.root / ".memory-bank-ignore"
         
-        if ignore_file.exists():
-            with open(ignore_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        patterns.append(line)
+        try:
+            content = ignore_file.read_bytes()
+        except OSError:
+            content = None
+        if content is not None:
+            self.ignore_hash = hashlib.sha1(content).hexdigest()
+            patterns.extend(content.decode('utf-8', errors='replace').splitlines())
         
-        # Always ignore these
-        patterns.extend(['.git/', 'node_modules/', '__pycache__/'])
-        return patterns
+        # Always ignore these (first, so the ignore file can re-include them with !)
+        # .memory-bank holds the walk cache itself, and never contains repos
+        return ['.git/', 'node_modules/', '__pycache__/', '.memory-bank/'] + patterns
     
-    def _is_ignored(self, path: Path) -> bool:
-        """Check if path matches any ignore pattern"""
-        rel_path = str(path.relative_to(self.root))
+    def _load_cache(self) -> Dict[str, list]:
+        """Cached directory listings, or {} if missing, stale or disabled
         
-        for pattern in self.ignored_patterns:
-            if pattern.endswith('/'):
-                # Directory pattern
-                if rel_path.startswith(pattern[:-1]):
-                    return True
-            elif '*' in pattern:
-                # Simple glob pattern
-                import fnmatch
-                if fnmatch.fnmatch(rel_path, pattern):
-                    return True
-            elif pattern in rel_path:
-                return True
-        
-        return False
+        Listings are keyed by path relative to root and hold
+        [mtime_ns or None, has .git, subdirectory names].
+        """
+        if not self.use_cache:
+            return {}
+        try:
+            with self.profiler.phase("read cache"), open(self.cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (not isinstance(cache, dict) or cache.get("version") != self.CACHE_VERSION
+                or cache.get("ignore_hash") != self.ignore_hash
+                or not isinstance(cache.get("dirs"), dict)):
+            return {}
+        return cache["dirs"]
+    
+    def _save_cache(self, dirs: Dict[str, list]):
+        """Atomically write the directory listings, if the root has a memory bank"""
+        if not self.use_cache or not self.cache_file.parent.is_dir():
+            return
+        cache = {
+            "version": self.CACHE_VERSION,
+            "ignore_hash": self.ignore_hash,
+            "dirs": dirs
+        }
+        tmp_file = self.cache_file.with_suffix(".tmp")
+        try:
+            with self.profiler.phase("write"), open(tmp_file, 'w') as f:
+                json.dump(cache, f, separators=(',', ':'))
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"Warning: could not write hierarchy cache: {e}")
+    
+    def _list_dir(self, directory: Path, rel_path: str, cached: Dict[str, list],
+                  listings: Dict[str, list], racy_after: int) -> Optional[list]:
+        """[mtime_ns, has .git, subdirectory names] for directory
         
+        A directory's mtime changes whenever an entry is added, removed or
+        renamed in it, so an unchanged mtime means the cached listing is
+        still valid and costs one stat instead of a scandir.
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            entry = cached.get(rel_path)
+            if entry is not None and entry[0] == mtime:
+                self.scan_stats["cached"] += 1
+            else:
+                with os.scandir(directory) as entries:
+                    names = [e.name for e in entries if e.is_dir(follow_symlinks=False)]
+                has_git = ".git" in names
+                if has_git:
+                    names.remove(".git")
+                entry = [mtime if mtime < racy_after else None, has_git, names]
+                self.scan_stats["scanned"] += 1
+        except OSError as e:
+            # Unreadable subdirectories are skipped, like find does
+            if directory == self.root:
+                print(f"Error finding git repos: {e}")
+            return None
+        listings[rel_path] = entry
+        return entry
+    
     def find_git_repos(self) -> List[Path]:
-        """Find all .git directories under root, respecting depth and ignore patterns"""
+        """Find all .git directories under root, respecting depth and ignore patterns
+        
+        Breadth-first walk: each directory is listed once, repos deeper
+        than max_depth are never visited, and ignored directories (plus
+        build and dependency folders inside a repo that are not repos
+        themselves) are pruned before descending. Listings of directories whose mtime has not changed
+        come from hierarchy-cache.json, so only changed subtrees are
+        rescanned; the cache is dropped when .memory-bank-ignore changes.
+        """
+        cached = self._load_cache()
+        listings = {}
+        racy_after = time.time_ns() - self.RACY_WINDOW_NS
+        self.scan_stats = {"scanned": 0, "cached": 0}
+        
         git_dirs = []
+        queue = deque([(self.root, ".", 0, False)])
         
-        # Use find command with maxdepth
-        try:
-            # Calculate maxdepth for find command
-            find_depth = self.max_depth * 2  # Account for directory structure
-            
-            result = subprocess.run(
-                ["find", str(self.root), "-maxdepth", str(find_depth),
-                 "-name", ".git", "-type", "d", 
-                 "-not", "-path", "*/node_modules/*",
-                 "-not", "-path", "*/.git/*"],
-                capture_output=True, text=True
-            )
-            
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    git_dir = Path(line)
-                    repo_path = git_dir.parent
-                    
-                    # Check depth from root
-                    depth = len(repo_path.relative_to(self.root).parts)
-                    if depth > self.max_depth:
+        with self.profiler.phase("enumerate"):
+            while queue:
+                directory, rel_path, depth, in_repo = queue.popleft()
+                listing = self._list_dir(directory, rel_path, cached, listings, racy_after)
+                if listing is None:
+                    continue
+                _, has_git, subdirs = listing
+                
+                if has_git:
+                    git_dirs.append(directory)
+                    in_repo = True
+                
+                if depth >= self.max_depth:
+                    continue
+                
+                for name in subdirs:
+                    child = name if rel_path == "." else f"{rel_path}/{name}"
+                    if (in_repo and name in self.REPO_BUILD_DIRS
+                            and self._is_pruned_build_dir(directory / name, child)):
                         continue
-                    
-                    # Check ignore patterns
-                    if not self._is_ignored(repo_path):
-                        git_dirs.append(repo_path)
-                    
-        except Exception as e:
-            print(f"Error finding git repos: {e}")
-            
+                    if not self.ignore_matcher.is_ignored(child, True):
+                        queue.append((directory / name, child, depth + 1, in_repo))
+        
+        self.profiler.count("directories scanned", self.scan_stats["scanned"])
+        self.profiler.count("directories from cache", self.scan_stats["cached"])
+        self.profiler.count("repos found", len(git_dirs))
+        if listings != cached:
+            self._save_cache(listings)
         return sorted(git_dirs)
     
+    def _is_pruned_build_dir(self, path: Path, rel_path: str) -> bool:
+        """Check that a build or dependency folder inside a repo is to be skipped
+        
+        The folder is kept when it is a repo itself (one stat) or when
+        .memory-bank-ignore re-includes it, e.g. with !vendor/.
+        """
+        if self.ignore_matcher.is_reincluded(rel_path, True):
+            return False
+        return not (path / ".git").is_dir()
+    
     def has_memory_bank(self, project_path: Path) -> bool:
         """Check if project has a memory bank"""
         return (project_path / "memory-bank").exists() or \
@@ -110,39 +210,49 @@ class HierarchyDetector:
             return "single-project"
     
     def build_hierarchy(self) -> Dict:
-        """Build complete hierarchy map"""
-        git_repos = self.find_git_repos()
+        """Build complete hierarchy map
+        
+        Repos are visited in path order, where every repo comes right before
+        its descendants, while a stack holds the chain of enclosing repos.
+        The top of the stack after popping non-ancestors is the nearest
+        ancestor, so parents and direct children come from one pass.
+        """
+        git_repos = sorted(self.find_git_repos(), key=lambda repo: repo.relative_to(self.root).parts)
         
         hierarchy = {
             "root": str(self.root),
-            "repos": []
+            "repos": [],
+            "tree": []
         }
         
-        for repo in git_repos:
-            repo_info = {
-                "path": str(repo.relative_to(self.root)),
-                "absolute_path": str(repo),
-                "has_memory_bank": self.has_memory_bank(repo),
-                "memory_bank_type": self.get_memory_bank_type(repo),
-                "depth": len(repo.relative_to(self.root).parts),
-                "children": []
-            }
-            
-            # Find children
-            for other_repo in git_repos:
-                if other_repo != repo and other_repo.is_relative_to(repo):
-                    # Check if it's a direct child (no intermediate git repos)
-                    is_direct_child = True
-                    for part in other_repo.relative_to(repo).parts[:-1]:
-                        intermediate = repo / part
-                        if intermediate in git_repos:
-                            is_direct_child = False
-                            break
-                    
-                    if is_direct_child:
-                        repo_info["children"].append(str(other_repo.relative_to(self.root)))
-            
-            hierarchy["repos"].append(repo_info)
+        # (parts, repo_info, tree node) of the enclosing repos
+        stack = []
+        with self.profiler.phase("resolve"):
+            for repo in git_repos:
+                rel_path = repo.relative_to(self.root)
+                parts = rel_path.parts
+                while stack and parts[:len(stack[-1][0])] != stack[-1][0]:
+                    stack.pop()
+                
+                repo_info = {
+                    "path": str(rel_path),
+                    "absolute_path": str(repo),
+                    "has_memory_bank": self.has_memory_bank(repo),
+                    "memory_bank_type": self.get_memory_bank_type(repo),
+                    "depth": len(parts),
+                    "parent": stack[-1][1]["path"] if stack else None,
+                    "children": []
+                }
+                node = {"path": repo_info["path"], "children": []}
+                
+                if stack:
+                    stack[-1][1]["children"].append(repo_info["path"])
+                    stack[-1][2]["children"].append(node)
+                else:
+                    hierarchy["tree"].append(node)
+                
+                hierarchy["repos"].append(repo_info)
+                stack.append((parts, repo_info, node))
         
         return hierarchy
     
@@ -194,7 +304,7 @@ class HierarchyDetector:
         
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
+        with self.profiler.phase("write"), open(output_path, 'w') as f:
             json.dump(hierarchy, f, indent=2)
         
         print(f"Hierarchy map saved to: {output_path}")
@@ -217,10 +327,27 @@ def main():
         "--json", action="store_true",
         help="Output raw JSON"
     )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Rescan every directory instead of reusing .memory-bank/hierarchy-cache.json"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Print per-phase wall and CPU time and directory counters to stderr"
+    )
+    parser.add_argument(
+        "--profile-output", metavar="FILE",
+        help="Write the --profile summary as JSON to FILE (implies --profile)"
+    )
+    parser.add_argument(
+        "--trace", metavar="FILE",
+        help="Write a Chrome trace of the phases to FILE (implies --profile)"
+    )
     
     args = parser.parse_args()
     
-    detector = HierarchyDetector(args.root)
+    profiler = Profiler(enabled=bool(args.profile or args.profile_output or args.trace))
+    detector = HierarchyDetector(args.root, use_cache=not args.no_cache, profiler=profiler)
     hierarchy = detector.build_hierarchy()
     
     if args.json:
@@ -231,10 +358,12 @@ def main():
         print(f"{'=' * 50}")
         print(f"Root: {hierarchy['root']}")
         print(f"Git repositories found: {len(hierarchy['repos'])}")
+        print(f"Directories scanned: {detector.scan_stats['scanned']} "
+              f"({detector.scan_stats['cached']} unchanged since the last run)")
         print()
         
-        # Display tree structure
-        for repo in sorted(hierarchy['repos'], key=lambda r: r['depth']):
+        # Display tree structure (repos are listed parents first, each followed by its subtree)
+        for repo in hierarchy['repos']:
             indent = "  " * repo['depth']
             name = repo['path'] or "[root]"
             mb_status = "✓" if repo['has_memory_bank'] else "✗"
@@ -259,6 +388,9 @@ def main():
     
     if args.save:
         detector.save_hierarchy_map(hierarchy)
+    
+    # stderr, so --json output stays parseable
+    profiler.report(args.profile_output, args.trace, stream=sys.stderr)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Thin client for the auto-update.py server
+Shared by auto-update.py (socket location, protocol) and hooks
+
+    python .memory-bank/scripts/memory_bank_client.py --health-check
+
+takes the same arguments as auto-update.py. When a server started with
+`auto-update.py --serve` is listening on .memory-bank/auto-update.sock,
+the command runs there, against warm caches, and its output is copied
+back; otherwise, or for commands the server does not run, auto-update.py
+runs in this process as usual.
+
+Only the standard library modules needed to talk to the socket are
+imported, so forwarding a command costs little more than starting Python.
+
+Protocol: one JSON line each way per connection. Requests are
+{"argv": [...], "cwd": "..."} or {"stop": true}; replies are
+{"stdout": "...", "stderr": "...", "exit": N} or {"fallback": true}.
+
+A server that does not accept the connection within CONNECT_TIMEOUT is
+treated as absent and the command runs in this process. One that
+accepts it but sends no reply within REPLY_TIMEOUT may still be running
+the command, so that is reported as an error instead of running it twice.
+"""
+
+import json
+import os
+import runpy
+import socket
+import sys
+
+SOCKET_NAME = "auto-update.sock"
+# Long-running commands that are never forwarded
+IN_PROCESS_OPTIONS = ("--watch", "--serve")
+# Seconds to wait for the server to accept a connection, and for its reply
+CONNECT_TIMEOUT = 1
+REPLY_TIMEOUT = 300
+
+
+class ServerTimeout(RuntimeError):
+    """The server accepted a request but did not reply in time"""
+
+
+def socket_path(project_root):
+    """Path of the server socket for project_root"""
+    return os.path.join(project_root, ".memory-bank", SOCKET_NAME)
+
+
+def request(path, message, timeout=REPLY_TIMEOUT):
+    """Send message to the server listening on path and return its reply
+
+    Raises OSError when no server is listening there or it does not
+    accept the connection within CONNECT_TIMEOUT seconds, and
+    ServerTimeout when it sends no reply within timeout seconds.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(path)
+        sock.settimeout(timeout)
+        try:
+            sock.sendall(json.dumps(message).encode('utf-8') + b"\n")
+            with sock.makefile('rb') as reply:
+                line = reply.readline()
+        except socket.timeout:
+            raise ServerTimeout(f"no reply from the server on {path} within {timeout} seconds") from None
+    if not line:
+        raise ConnectionError("server closed the connection")
+    return json.loads(line)
+
+
+def _project_root(argv):
+    """The --project-root given in argv, or the current directory"""
+    for i, arg in enumerate(argv):
+        if arg.startswith("--project-root="):
+            return arg.split("=", 1)[1]
+        if arg == "--project-root" and i + 1 < len(argv):
+            return argv[i + 1]
+    return "."
+
+
+def forward(argv, cwd=None):
+    """Run auto-update.py argv on the server, printing its output
+
+    Returns the exit status, or None when the command has to run in
+    this process: no server is listening, the server belongs to another
+    project root, or the command is one the server does not run. A
+    server that stops replying is reported and gives exit status 1.
+    """
+    if any(arg.split("=", 1)[0] in IN_PROCESS_OPTIONS for arg in argv):
+        return None
+    cwd = cwd or os.getcwd()
+    try:
+        reply = request(socket_path(os.path.join(cwd, _project_root(argv))),
+                        {"argv": argv, "cwd": cwd}, timeout=REPLY_TIMEOUT)
+    except ServerTimeout as e:
+        sys.stderr.write(f"memory_bank_client: {e}\n")
+        return 1
+    except (OSError, ValueError):
+        return None
+    if reply.get("fallback"):
+        return None
+    sys.stdout.write(reply["stdout"])
+    sys.stderr.write(reply["stderr"])
+    return reply["exit"]
+
+
+def main():
+    argv = sys.argv[1:]
+    status = forward(argv)
+    if status is not None:
+        sys.stdout.flush()
+        sys.exit(status)
+
+    # No server: run auto-update.py here, as if it had been invoked directly
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "auto-update.py")
+    sys.argv = [script] + argv
+    runpy.run_path(script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Compiled matcher for .memory-bank-ignore with gitignore semantics
+Shared by auto-update.py and detect-hierarchy.py
+
+Supported rules, as in .gitignore:
+- blank lines and lines starting with # are skipped (\\# and \\! escape)
+- a leading ! re-includes paths excluded by an earlier pattern
+- a trailing / matches directories only
+- a / at the start or in the middle anchors the pattern to the root;
+  otherwise it matches a file or directory name at any depth
+- * and ? do not match /, [...] is a character class, and ** matches
+  across directories in leading **/, trailing /** and inner /**/ form
+- the last matching pattern wins, and nothing inside an excluded
+  directory can be re-included
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class IgnoreMatcher:
+    """All patterns compiled into a few alternation regexes, matched with fullmatch
+
+    Patterns are added to each alternation in reverse order, so the first
+    alternative that matches is the last pattern in the file, and its
+    group name tells whether it is a negation. Patterns without a slash
+    are matched against the final path component, the rest against the
+    whole path; directory-only patterns only take part for directories.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = [p for p in (self._clean(line) for line in patterns) if p]
+        # group name -> (pattern index, negated)
+        self._groups: Dict[str, Tuple[int, bool]] = {}
+        rules = []
+        for index, pattern in enumerate(self.patterns):
+            regex, dir_only, negated, name_only = self._translate(pattern)
+            self._groups[f"p{index}"] = (index, negated)
+            rules.append((index, regex, dir_only, name_only))
+
+        self._file_name = self._compile(rules, dirs=False, name_only=True)
+        self._file_path = self._compile(rules, dirs=False, name_only=False)
+        self._dir_name = self._compile(rules, dirs=True, name_only=True)
+        self._dir_path = self._compile(rules, dirs=True, name_only=False)
+        # Memoized verdicts for directories, including their parents
+        self._dir_cache: Dict[str, bool] = {}
+
+    @classmethod
+    def from_file(cls, ignore_file: Path, defaults: Iterable[str] = ()) -> "IgnoreMatcher":
+        """Matcher for defaults followed by the patterns in ignore_file, if it exists"""
+        lines = list(defaults)
+        if ignore_file.exists():
+            with open(ignore_file, 'r') as f:
+                lines.extend(f.read().splitlines())
+        return cls(lines)
+
+    @staticmethod
+    def _clean(line: str) -> Optional[str]:
+        """Strip comments and unescaped trailing spaces, or return None for no pattern"""
+        if not line.strip() or line.startswith('#'):
+            return None
+        line = line.rstrip('\n')
+        while line.endswith(' ') and not line.endswith('\\ '):
+            line = line[:-1]
+        return line or None
+
+    @staticmethod
+    def _translate(pattern: str) -> Tuple[str, bool, bool, bool]:
+        """Translate one pattern to (regex, dir_only, negated, name_only)"""
+        negated = pattern.startswith('!')
+        if negated:
+            pattern = pattern[1:]
+        elif pattern.startswith('\\!') or pattern.startswith('\\#'):
+            pattern = pattern[1:]
+
+        dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        name_only = '/' not in pattern
+        pattern = pattern.lstrip('/')
+
+        regex = []
+        i, n = 0, len(pattern)
+        while i < n:
+            at_segment_start = i == 0 or pattern[i - 1] == '/'
+            if pattern.startswith('**', i) and at_segment_start and (i + 2 == n or pattern[i + 2] == '/'):
+                if i + 2 == n:
+                    # Trailing /** (or a bare **): everything below
+                    regex.append('.*')
+                    i += 2
+                else:
+                    # Leading **/ or inner /**/: zero or more directories
+                    regex.append('(?:.*/)?')
+                    i += 3
+                continue
+
+            c = pattern[i]
+            if c == '*':
+                regex.append('[^/]*')
+                while i + 1 < n and pattern[i + 1] == '*':
+                    i += 1
+            elif c == '?':
+                regex.append('[^/]')
+            elif c == '[':
+                # A ] right after [ or [! is part of the class
+                start = i + 1
+                if pattern[start:start + 1] in ('!', '^'):
+                    start += 1
+                if pattern[start:start + 1] == ']':
+                    start += 1
+                end = pattern.find(']', start)
+                if end == -1:
+                    regex.append(re.escape(c))
+                else:
+                    body = pattern[i + 1:end]
+                    negate_class = body[:1] in ('!', '^')
+                    if negate_class:
+                        body = body[1:]
+                    body = ''.join(ch if ch == '-' else re.escape(ch) for ch in body)
+                    regex.append('[' + ('^' if negate_class else '') + body + ']')
+                    i = end
+            elif c == '\\' and i + 1 < n:
+                i += 1
+                regex.append(re.escape(pattern[i]))
+            else:
+                regex.append(re.escape(c))
+            i += 1
+
+        return ''.join(regex), dir_only, negated, name_only
+
+    @staticmethod
+    def _compile(rules: List[Tuple[int, str, bool, bool]], dirs: bool, name_only: bool):
+        """One alternation, last pattern first, or None if no pattern applies"""
+        alternatives = [f"(?P<p{index}>{regex})"
+                        for index, regex, dir_only, rule_name_only in reversed(rules)
+                        if rule_name_only == name_only and (dirs or not dir_only)]
+        if not alternatives:
+            return None
+        return re.compile('|'.join(alternatives), re.DOTALL)
+
+    def match(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Verdict of the patterns for rel_path itself, ignoring its parent directories
+
+        rel_path is relative to the root, '/'-separated, without leading or
+        trailing slashes. Use is_ignored when parents have not been checked.
+        """
+        best = self._last_match(rel_path, is_dir)
+        return best is not None and not best[1]
+
+    def is_reincluded(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check whether the last pattern matching rel_path itself is a ! pattern"""
+        best = self._last_match(rel_path, is_dir)
+        return best is not None and best[1]
+
+    def _last_match(self, rel_path: str, is_dir: bool) -> Optional[Tuple[int, bool]]:
+        """(pattern index, negated) of the last pattern matching rel_path, or None"""
+        name_regex, path_regex = (self._dir_name, self._dir_path) if is_dir else (self._file_name, self._file_path)
+        best = None
+        if name_regex is not None:
+            m = name_regex.fullmatch(rel_path, rel_path.rfind('/') + 1)
+            if m:
+                best = self._groups[m.lastgroup]
+        if path_regex is not None:
+            m = path_regex.fullmatch(rel_path)
+            if m:
+                candidate = self._groups[m.lastgroup]
+                if best is None or candidate[0] > best[0]:
+                    best = candidate
+        return best
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check rel_path and every parent directory, memoizing directory verdicts"""
+        if is_dir:
+            return self._is_dir_ignored(rel_path)
+        parent = rel_path.rpartition('/')[0]
+        if parent and self._is_dir_ignored(parent):
+            return True
+        return self.match(rel_path)
+
+    def _is_dir_ignored(self, rel_dir: str) -> bool:
+        ignored = self._dir_cache.get(rel_dir)
+        if ignored is None:
+            parent = rel_dir.rpartition('/')[0]
+            ignored = bool(parent) and self._is_dir_ignored(parent) or self.match(rel_dir, True)
+            self._dir_cache[rel_dir] = ignored
+        return ignored
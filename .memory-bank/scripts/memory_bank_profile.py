@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Phase timings and I/O counters for --profile
+Shared by auto-update.py and detect-hierarchy.py
+
+A Profiler records named phases (wall and CPU time, one trace event per
+phase run) and integer counters. Work done many times per run, such as
+reading one file, is accumulated with add() instead, so it shows up in
+the summary without flooding the trace. A disabled Profiler does nothing,
+so instrumented code costs the same as uninstrumented code.
+
+Phases may nest and may run on several threads at once; their wall
+times then add up to more than the total run time.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+
+class Profiler:
+    """Collects phases and counters for one run"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+        # name -> [calls, wall seconds, cpu seconds]
+        self.phases: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        # Chrome trace "complete" events
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        start_cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - start_cpu
+            self.add(name, wall, cpu)
+            with self._lock:
+                self.events.append({
+                    "name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                    "ts": round((start - self.started) * 1e6), "dur": round(wall * 1e6),
+                    "args": {"cpu_ms": round(cpu * 1000, 3)}
+                })
+
+    def phase(self, name: str):
+        """Context manager timing the enclosed block as phase name"""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed(name)
+
+    def add(self, name: str, wall: float, cpu: float, calls: int = 1):
+        """Accumulate time measured elsewhere (e.g. in a worker process) into phase name"""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.phases.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += calls
+            stats[1] += wall
+            stats[2] += cpu
+
+    def count(self, name: str, amount: int = 1):
+        """Add amount to counter name"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self) -> dict:
+        """Totals, phases (slowest first) and counters as a JSON-serializable dict"""
+        phases = sorted(self.phases.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            "wall_s": round(time.perf_counter() - self.started, 6),
+            "cpu_s": round(time.process_time() - self.started_cpu, 6),
+            "phases": {name: {"calls": calls, "wall_s": round(wall, 6), "cpu_s": round(cpu, 6)}
+                       for name, (calls, wall, cpu) in phases},
+            "counters": dict(sorted(self.counters.items()))
+        }
+
+    def format_summary(self) -> str:
+        """Human-readable table of the summary"""
+        summary = self.summary()
+        lines = [f"Profile: {summary['wall_s'] * 1000:.1f} ms wall, {summary['cpu_s'] * 1000:.1f} ms CPU",
+                 f"  {'phase':<32} {'calls':>7} {'wall ms':>10} {'cpu ms':>10}"]
+        for name, stats in summary["phases"].items():
+            lines.append(f"  {name:<32} {stats['calls']:>7} {stats['wall_s'] * 1000:>10.2f} "
+                         f"{stats['cpu_s'] * 1000:>10.2f}")
+        if summary["counters"]:
+            lines.append(f"  {'counter':<32} {'value':>7}")
+            for name, value in summary["counters"].items():
+                lines.append(f"  {name:<32} {value:>7}")
+        return "\n".join(lines)
+
+    def write_summary(self, path: Union[str, Path]):
+        """Write the summary as JSON"""
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def write_trace(self, path: Union[str, Path]):
+        """Write the phases as Chrome trace events (chrome://tracing, Perfetto)"""
+        with self._lock:
+            events = list(self.events)
+        end = round((time.perf_counter() - self.started) * 1e6)
+        events.append({"name": "counters", "ph": "C", "pid": os.getpid(), "tid": 0, "ts": end,
+                       "args": dict(self.counters)})
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def report(self, summary_path: Optional[str] = None, trace_path: Optional[str] = None,
+               stream=None):
+        """Print the table to stream and write the requested files"""
+        if not self.enabled:
+            return
+        print(self.format_summary(), file=stream)
+        if summary_path:
+            self.write_summary(summary_path)
+            print(f"Profile summary written to {summary_path}", file=stream)
+        if trace_path:
+            self.write_trace(trace_path)
+            print(f"Trace written to {trace_path}", file=stream)
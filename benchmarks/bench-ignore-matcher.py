@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for .memory-bank-ignore matching
+
+Compares the compiled gitignore matcher in memory_bank_ignore.py with the
+previous per-pattern loop from detect-hierarchy.py (prefix, fnmatch and
+substring tests for every pattern on every path). The old loop also has
+false positives, such as build/ ignoring buildtools/, so the benchmark
+reports how many verdicts differ.
+
+Usage:
+    python benchmarks/bench-ignore-matcher.py
+    python benchmarks/bench-ignore-matcher.py --checks 2000000 --patterns 100
+"""
+
+import argparse
+import fnmatch
+import random
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / ".memory-bank" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from memory_bank_ignore import IgnoreMatcher  # noqa: E402
+
+BASE_PATTERNS = [
+    ".git/", "node_modules/", "__pycache__/", "build/", "dist/", "coverage/",
+    "*.log", "*.tmp", "*.min.js", "!important.log", "/docs/generated/",
+    "**/fixtures/large/", "vendor/", "target/", ".venv/", "*.pyc",
+]
+DIR_NAMES = ["src", "lib", "app", "tests", "docs", "build", "buildtools", "dist", "vendor",
+             "components", "utils", "fixtures", "large", "generated", "api", "core"]
+FILE_NAMES = ["index.js", "main.py", "app.min.js", "debug.log", "important.log", "README.md",
+              "module.pyc", "styles.css", "data.json", "notes.tmp"]
+
+
+def legacy_is_ignored(patterns, rel_path):
+    """HierarchyDetector._is_ignored before the compiled matcher"""
+    for pattern in patterns:
+        if pattern.endswith('/'):
+            if rel_path.startswith(pattern[:-1]):
+                return True
+        elif '*' in pattern:
+            if fnmatch.fnmatch(rel_path, pattern):
+                return True
+        elif pattern in rel_path:
+            return True
+    return False
+
+
+def generate_paths(count, seed=0):
+    """count relative file paths, 1 to 6 directories deep"""
+    rng = random.Random(seed)
+    return ["/".join(rng.choice(DIR_NAMES) for _ in range(rng.randint(1, 6))) + "/" + rng.choice(FILE_NAMES)
+            for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled vs per-pattern ignore matching")
+    parser.add_argument("--checks", type=int, default=1_000_000, help="Path checks to run (default: 1000000)")
+    parser.add_argument("--unique-paths", type=int, default=50_000,
+                        help="Distinct paths the checks cycle through (default: 50000)")
+    parser.add_argument("--patterns", type=int, default=len(BASE_PATTERNS),
+                        help=f"Number of patterns, padded with synthetic ones (default: {len(BASE_PATTERNS)})")
+    args = parser.parse_args()
+
+    patterns = BASE_PATTERNS + [f"generated_{i}/*.out" for i in range(args.patterns - len(BASE_PATTERNS))]
+    unique = generate_paths(args.unique_paths)
+    paths = [unique[i % len(unique)] for i in range(args.checks)]
+
+    start = time.perf_counter()
+    legacy = [legacy_is_ignored(patterns, path) for path in paths]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = IgnoreMatcher(patterns)
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    compiled = [matcher.is_ignored(path) for path in paths]
+    compiled_time = time.perf_counter() - start
+
+    differing = sum(1 for old, new in zip(legacy, compiled) if old != new)
+    print(f"Input: {len(paths)} checks over {len(unique)} paths, {len(patterns)} patterns")
+    print(f"  per-pattern loop:  {legacy_time * 1000:9.1f} ms")
+    print(f"  compiled matcher:  {compiled_time * 1000:9.1f} ms  "
+          f"({legacy_time / compiled_time:.2f}x, compiled in {compile_time * 1000:.2f} ms)")
+    print(f"  verdicts differing from the per-pattern loop: {differing} "
+          f"({differing / len(paths):.1%}, e.g. build/ no longer ignores buildtools/)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
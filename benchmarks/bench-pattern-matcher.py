@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the pattern scanner's detector matching
+
+Compares the fused single-pass detector regex used by auto-update.py with
+the previous approach of one re.findall pass per detector, optionally with
+extra synthetic keyword detectors to show how each approach scales.
+
+Usage:
+    python benchmarks/bench-pattern-matcher.py
+    python benchmarks/bench-pattern-matcher.py --size-kb 512 --extra-detectors 8
+"""
+
+import argparse
+import importlib.util
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / ".memory-bank" / "scripts"
+
+SAMPLE_LINES = [
+    "    try {",
+    "        const response = await fetch(`${API_BASE}/users`);",
+    "    } catch (err) {",
+    "        throw new Error('request failed');",
+    "    }",
+    "def load_config(path):",
+    "    with open(path) as handle:",
+    "        return json.load(handle)",
+    "except ValueError as Exception:",
+    "const client = axios.create({ baseURL: endpoint });",
+    "// plain comment line without any keywords at all",
+    "for (let i = 0; i < items.length; i++) { total += items[i]; }",
+]
+
+
+def load_script(name):
+    """Load a hyphenated script from .memory-bank/scripts as a module"""
+    module_name = name.replace("-", "_").removesuffix(".py")
+    # Scripts import their shared modules as siblings
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_source(size_kb, seed=0):
+    """Build synthetic source text of roughly size_kb kilobytes"""
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    while size < size_kb * 1024:
+        line = rng.choice(SAMPLE_LINES)
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def legacy_counts(detectors, content):
+    """One re.findall pass per detector"""
+    counts = []
+    for keywords, ignore_case in detectors.values():
+        pattern = "|".join(re.escape(keyword) for keyword in keywords)
+        counts.append(len(re.findall(pattern, content, re.IGNORECASE if ignore_case else 0)))
+    return counts
+
+
+def best_of(repeat, func, *args):
+    """Best wall time in seconds over repeat runs, plus the last result"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fused vs per-detector pattern matching")
+    parser.add_argument("--size-kb", type=int, default=256, help="Synthetic file size in KB (default: 256)")
+    parser.add_argument("--extra-detectors", type=int, default=0,
+                        help="Add N synthetic keyword detectors (default: 0)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (default: 5)")
+    args = parser.parse_args()
+
+    auto_update = load_script("auto-update.py")
+    base = auto_update.MemoryBankAutomation
+
+    detectors = dict(base.PATTERN_DETECTORS)
+    for i in range(args.extra_detectors):
+        detectors[f"extra_{i}"] = ((f"keyword{i}a", f"keyword{i}b", f"Marker{i}"), i % 2 == 1)
+
+    class Automation(base):
+        PATTERN_DETECTORS = detectors
+
+    content = generate_source(args.size_kb)
+
+    legacy_time, legacy = best_of(args.repeat, legacy_counts, detectors, content)
+    fused_time, fused = best_of(args.repeat, Automation._match_counts, content.encode("utf-8"))
+
+    print(f"Input: {len(content) / 1024:.0f} KB, {len(detectors)} detectors, best of {args.repeat}")
+    print(f"  per-detector findall: {legacy_time * 1000:8.2f} ms")
+    print(f"  fused single pass:    {fused_time * 1000:8.2f} ms  ({legacy_time / fused_time:.2f}x)")
+    print(f"  counts match: {'yes' if legacy == fused else f'no ({legacy} vs {fused})'}")
+    return 0 if legacy == fused else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the auto-update and hierarchy entry points
+
+Generates synthetic workloads in a temporary directory and times each
+entry point across a sweep of sizes:
+
+    scan_code_patterns       codebase with N source files (plus ignored build output)
+    extract_pitfalls         progress.md with K issue entries
+    extract_git_decisions    git history with C commits
+    build_hierarchy          workspace with M nested git repos and an ignore file
+    monitor_context_health   multi-project memory bank with P projects
+
+Caches are disabled, so every run measures the full (cold) work. Each
+point is the best of --repeat runs. Results can be written as JSON and
+compared against a stored baseline; --compare exits with status 1 if any
+point is slower than the baseline by more than --threshold.
+
+Usage:
+    python benchmarks/run-benchmarks.py
+    python benchmarks/run-benchmarks.py --quick --only scan_code_patterns
+    python benchmarks/run-benchmarks.py --output baseline.json
+    python benchmarks/run-benchmarks.py --compare baseline.json --threshold 0.25
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / ".memory-bank" / "scripts"
+RESULTS_VERSION = 1
+
+SOURCE_LINES = [
+    "    try {",
+    "        const response = await fetch(`${API_BASE}/users`);",
+    "    } catch (err) {",
+    "        throw new Error('request failed');",
+    "    }",
+    "def load_config(path):",
+    "    with open(path) as handle:",
+    "        return json.load(handle)",
+    "except ValueError as Exception:",
+    "const client = axios.create({ baseURL: endpoint });",
+    "// plain comment line without any keywords at all",
+    "for (let i = 0; i < items.length; i++) { total += items[i]; }",
+]
+SOURCE_EXTENSIONS = [".py", ".js", ".ts", ".tsx"]
+SUBJECTS = [
+    "Refactor {0} loader into smaller functions",
+    "Fix typo in {0} docs",
+    "Add retry logic to the {0} client",
+    "Migrate {0} storage to sqlite",
+    "Optimize {0} query performance",
+    "Update dependencies for {0}",
+    "Introduce plugin architecture for {0}",
+    "Bump version",
+]
+BODIES = [
+    "",
+    "Because the previous approach did not scale past a few thousand entries.",
+    "Reason: keeps the public interface stable while we restructure internals.",
+]
+COMPONENTS = ["auth", "cache", "scheduler", "parser", "exporter", "session", "billing"]
+CONTEXT_FILES = ["projectBrief.md", "productContext.md", "systemPatterns.md", "techContext.md"]
+ACTIVE_FILES = ["activeContext.md", "tasks.md", "progress.md"]
+
+
+def load_script(name):
+    """Load a hyphenated script from .memory-bank/scripts as a module"""
+    module_name = name.replace("-", "_").removesuffix(".py")
+    # Scripts import their shared modules as siblings
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# Workload generators
+
+def make_memory_bank(root, projects=None):
+    """Create a memory bank with every context file, single or multi-project"""
+    bank = root / ".memory-bank"
+    project_dirs = [bank] if projects is None else [bank / name for name in projects]
+    if projects is not None:
+        (bank / "shared").mkdir(parents=True)
+    for project_dir in project_dirs:
+        for dir_name, files in (("context", CONTEXT_FILES), ("active", ACTIVE_FILES)):
+            (project_dir / dir_name).mkdir(parents=True, exist_ok=True)
+            for file_name in files:
+                (project_dir / dir_name / file_name).write_text(f"# {file_name}\n" + "Some context.\n" * 20)
+        for dir_name in ("decisions", "qa", "technical"):
+            (project_dir / dir_name).mkdir(exist_ok=True)
+
+
+def make_codebase(root, files, seed=0):
+    """files source files, 50 per directory, plus node_modules the scanner must skip"""
+    rng = random.Random(seed)
+    make_memory_bank(root)
+    for i in range(files):
+        directory = root / "src" / f"module{i // 50}"
+        directory.mkdir(parents=True, exist_ok=True)
+        lines = [rng.choice(SOURCE_LINES) for _ in range(rng.randint(20, 120))]
+        (directory / f"file{i}{rng.choice(SOURCE_EXTENSIONS)}").write_text("\n".join(lines) + "\n")
+    vendored = root / "node_modules" / "dep"
+    vendored.mkdir(parents=True)
+    for i in range(max(1, files // 10)):
+        (vendored / f"dep{i}.js").write_text("module.exports = function () { throw new Error(); };\n")
+
+
+def make_progress(root, entries, seed=0):
+    """progress.md with entries issue → solution records among ordinary log lines"""
+    rng = random.Random(seed)
+    make_memory_bank(root)
+    parts = ["# Progress\n\n"]
+    for i in range(entries):
+        if i % 5 == 0:
+            parts.append(f"## [2025-{1 + i % 12:02d}-{1 + i % 28:02d} 10:{i % 60:02d}]\n\n")
+        component = rng.choice(COMPONENTS)
+        parts.append(f"- Worked on the {component} module\n")
+        parts.append(f"**Issue**: {component} request {i} timed out under load\n")
+        parts.append(f"  - **Context**: nightly batch against the {component} service\n")
+        parts.append(f"  - **Solution**: batch calls and add a retry with backoff ({i})\n")
+        if i % 3 == 0:
+            parts.append("  - **Pattern**: retry with exponential backoff\n")
+        parts.append("\n")
+    (root / ".memory-bank" / "active" / "progress.md").write_text("".join(parts))
+
+
+def make_git_history(root, commits, seed=0):
+    """A git repository with commits commits, built in one git fast-import run"""
+    rng = random.Random(seed)
+    make_memory_bank(root)
+    (root / ".memory-bank" / "decisions" / "log.md").write_text("# Decision Log\n")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+
+    now = int(time.time())
+    stream = []
+    for i in range(commits):
+        subject = rng.choice(SUBJECTS).format(rng.choice(COMPONENTS))
+        body = rng.choice(BODIES)
+        message = (subject + ("\n\n" + body if body else "") + "\n").encode()
+        content = "\n".join(rng.choice(SOURCE_LINES) for _ in range(rng.randint(1, 30))).encode()
+        stream.append(b"commit refs/heads/main\n")
+        stream.append(f"committer Dev <dev@example.com> {now - (commits - i) * 60} +0000\n".encode())
+        stream.append(b"data %d\n%s\n" % (len(message), message))
+        stream.append(f"M 644 inline src/file{i % 200}.py\n".encode())
+        stream.append(b"data %d\n%s\n" % (len(content), content))
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=root, input=b"".join(stream), check=True)
+    subprocess.run(["git", "symbolic-ref", "HEAD", "refs/heads/main"], cwd=root, check=True)
+    subprocess.run(["git", "reset", "-q", "--hard"], cwd=root, check=True)
+
+
+def make_workspace(root, repos, seed=0):
+    """repos git repositories nested up to three levels, with build output and ignored folders"""
+    rng = random.Random(seed)
+    (root / ".git").mkdir(parents=True)
+    (root / ".memory-bank-ignore").write_text("# scratch work\nscratch/\n*.tmp\narchive/**/old\n")
+    paths = []
+    for i in range(repos - 1):
+        parent = rng.choice([Path(".")] + paths[-20:]) if paths else Path(".")
+        if len(parent.parts) >= 2:
+            parent = Path(parent.parts[0])
+        path = parent / f"repo{i}"
+        paths.append(path)
+        repo = root / path
+        (repo / ".git").mkdir(parents=True)
+        (repo / "src").mkdir()
+        for j in range(20):
+            (repo / "src" / f"file{j}.py").write_text("")
+        (repo / "node_modules" / "dep" / ".git").mkdir(parents=True)
+        if i % 10 == 0:
+            (repo / "scratch" / "experiment" / ".git").mkdir(parents=True)
+
+
+# Benchmarks: (unit, default sizes, quick sizes, setup(root, size) -> run callable)
+
+def setup_scan(modules, root, size):
+    make_codebase(root, size)
+    automation = modules["auto-update.py"].MemoryBankAutomation(root, use_cache=False)
+    return automation._scan_code_patterns
+
+
+def setup_pitfalls(modules, root, size):
+    make_progress(root, size)
+    automation = modules["auto-update.py"].MemoryBankAutomation(root, use_cache=False)
+    return automation.extract_pitfall_solutions
+
+
+def setup_decisions(modules, root, size):
+    make_git_history(root, size)
+    automation = modules["auto-update.py"].MemoryBankAutomation(root, use_cache=False)
+    return lambda: automation.extract_git_decisions(since="50 years ago")
+
+
+def setup_hierarchy(modules, root, size):
+    make_workspace(root, size)
+    detector = modules["detect-hierarchy.py"].HierarchyDetector(root, use_cache=False)
+    return detector.build_hierarchy
+
+
+def setup_health(modules, root, size):
+    projects = [f"project{i}" for i in range(size)]
+    make_memory_bank(root, projects)
+    automation = modules["auto-update.py"].MemoryBankAutomation(root, all_projects=True)
+    views = [automation.for_project(name) for name in projects]
+    return lambda: [view.monitor_context_health() for view in views]
+
+
+BENCHMARKS = {
+    "scan_code_patterns": ("files", [100, 1000, 5000], [50, 200], setup_scan),
+    "extract_pitfalls": ("entries", [100, 1000, 10000], [50, 500], setup_pitfalls),
+    "extract_git_decisions": ("commits", [100, 1000, 5000], [50, 200], setup_decisions),
+    "build_hierarchy": ("repos", [10, 100, 500], [10, 50], setup_hierarchy),
+    "monitor_context_health": ("projects", [1, 10, 50], [1, 5], setup_health),
+}
+
+
+def best_of(repeat, func):
+    """Best wall time in seconds over repeat runs; output from the task is discarded"""
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(names, repeat, quick):
+    """Time every selected benchmark over its size sweep"""
+    modules = {name: load_script(name) for name in ("auto-update.py", "detect-hierarchy.py")}
+    results = {}
+    for name in names:
+        unit, sizes, quick_sizes, setup = BENCHMARKS[name]
+        if name == "extract_git_decisions" and not shutil.which("git"):
+            print(f"{name:<24} skipped: git is not installed")
+            continue
+        runs = []
+        for size in (quick_sizes if quick else sizes):
+            with tempfile.TemporaryDirectory() as tmp:
+                func = setup(modules, Path(tmp), size)
+                seconds = best_of(repeat, func)
+            runs.append({"size": size, "seconds": seconds})
+            print(f"{name:<24} {unit}={size:<7} {seconds * 1000:10.2f} ms")
+        results[name] = {"unit": unit, "runs": runs}
+    return results
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Print current vs baseline for shared points; returns the regressions"""
+    regressions = []
+    print(f"\nCompared with baseline (threshold +{threshold:.0%}, ignoring changes under "
+          f"{min_delta * 1000:.1f} ms)")
+    for name, result in results.items():
+        previous = {run["size"]: run["seconds"] for run in
+                    baseline.get("results", {}).get(name, {}).get("runs", [])}
+        for run in result["runs"]:
+            before = previous.get(run["size"])
+            if before is None:
+                continue
+            after = run["seconds"]
+            change = after / before - 1 if before else 0.0
+            regressed = change > threshold and after - before > min_delta
+            marker = "  REGRESSION" if regressed else ""
+            print(f"  {name:<24} {result['unit']}={run['size']:<7} {before * 1000:10.2f} -> "
+                  f"{after * 1000:10.2f} ms ({change:+.0%}){marker}")
+            if regressed:
+                regressions.append((name, run["size"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time auto-update and hierarchy entry points on synthetic workloads")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), metavar="NAME",
+                        help=f"Run only this benchmark (repeatable): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--quick", action="store_true", help="Use small sizes, e.g. for a smoke test")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per point, best is kept (default: 3)")
+    parser.add_argument("--output", type=Path, metavar="FILE", help="Write results as JSON to FILE")
+    parser.add_argument("--compare", type=Path, metavar="FILE",
+                        help="Compare with a baseline JSON file; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Slowdown ratio counted as a regression (default: 0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="Ignore slowdowns smaller than this many ms (default: 2.0)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("version") != RESULTS_VERSION:
+            print(f"Error: {args.compare} has results version {baseline.get('version')}, "
+                  f"expected {RESULTS_VERSION}")
+            return 2
+
+    results = run_benchmarks(args.only or list(BENCHMARKS), args.repeat, args.quick)
+
+    if args.output:
+        report = {
+            "version": RESULTS_VERSION,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms / 1000)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) found")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
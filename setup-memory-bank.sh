@@ -141,11 +141,15 @@ migrate_old_version() {
                 rm -f .memory-bank/scripts/*
                 # Copy only the required v2.0 scripts
                 cp "$template_dir_copy/.memory-bank/scripts/auto-update.py" .memory-bank/scripts/ 2>/dev/null || true
+                cp "$template_dir_copy/.memory-bank/scripts/memory_bank_ignore.py" .memory-bank/scripts/ 2>/dev/null || true
+                cp "$template_dir_copy/.memory-bank/scripts/memory_bank_profile.py" .memory-bank/scripts/ 2>/dev/null || true
+                cp "$template_dir_copy/.memory-bank/scripts/memory_bank_client.py" .memory-bank/scripts/ 2>/dev/null || true
                 cp "$template_dir_copy/.memory-bank/scripts/detect-hierarchy.py" .memory-bank/scripts/ 2>/dev/null || true
                 cp "$template_dir_copy/.memory-bank/scripts/setup-hierarchy.sh" .memory-bank/scripts/ 2>/dev/null || true
                 cp "$template_dir_copy/.memory-bank/scripts/auto-setup-hierarchy.py" .memory-bank/scripts/ 2>/dev/null || true
                 echo -e "${GREEN}✓ Scripts updated to latest version${NC}"
             fi
+            update_gitignore
             
             # Update mode instructions - replace all with v2.0 versions
             echo -e "${CYAN}Updating mode instructions...${NC}"
@@ -751,6 +755,20 @@ copy_scripts() {
         echo "  ✓ Copied auto-update.py"
     fi
     
+    # Shared modules imported by the Python scripts
+    if [ -f "$TEMPLATE_DIR/.memory-bank/scripts/memory_bank_ignore.py" ]; then
+        cp "$TEMPLATE_DIR/.memory-bank/scripts/memory_bank_ignore.py" .memory-bank/scripts/
+        echo "  ✓ Copied memory_bank_ignore.py"
+    fi
+    if [ -f "$TEMPLATE_DIR/.memory-bank/scripts/memory_bank_profile.py" ]; then
+        cp "$TEMPLATE_DIR/.memory-bank/scripts/memory_bank_profile.py" .memory-bank/scripts/
+        echo "  ✓ Copied memory_bank_profile.py"
+    fi
+    if [ -f "$TEMPLATE_DIR/.memory-bank/scripts/memory_bank_client.py" ]; then
+        cp "$TEMPLATE_DIR/.memory-bank/scripts/memory_bank_client.py" .memory-bank/scripts/
+        echo "  ✓ Copied memory_bank_client.py"
+    fi
+    
     # Copy hierarchy scripts for hierarchical projects
     if [ -f "$TEMPLATE_DIR/.memory-bank/scripts/setup-hierarchy.sh" ]; then
         cp "$TEMPLATE_DIR/.memory-bank/scripts/setup-hierarchy.sh" .memory-bank/scripts/
@@ -781,6 +799,39 @@ copy_scripts() {
     echo -e "${GREEN}✓ Automation scripts installed${NC}"
 }
 
+# Keep machine-local automation state out of version control
+update_gitignore() {
+    local entries=(
+        ".memory-bank/**/scan-cache.json"
+        ".memory-bank/**/pitfall-index.json"
+        ".memory-bank/**/decision-cache.json"
+        ".memory-bank/**/hierarchy-cache.json"
+        ".memory-bank/**/auto-update.sock"
+    )
+    local header="# Memory Bank automation state (machine-local)"
+    local entry
+    local added=0
+    
+    touch .gitignore
+    for entry in "${entries[@]}"; do
+        if ! grep -qxF "$entry" .gitignore; then
+            if [ $added -eq 0 ] && ! grep -qxF "$header" .gitignore; then
+                # Start a new block, after a final newline if the file lacks one
+                if [ -s .gitignore ] && [ -n "$(tail -c 1 .gitignore)" ]; then
+                    echo "" >> .gitignore
+                fi
+                echo "$header" >> .gitignore
+            fi
+            echo "$entry" >> .gitignore
+            added=$((added + 1))
+        fi
+    done
+    
+    if [ $added -gt 0 ]; then
+        echo -e "${GREEN}✓ Added $added Memory Bank entries to .gitignore${NC}"
+    fi
+}
+
 # Create starter prompt
 create_starter_prompt() {
     echo -e "${YELLOW}Creating starter prompt...${NC}"
@@ -999,6 +1050,7 @@ main() {
     
     create_templates
     copy_scripts
+    update_gitignore
     create_starter_prompt
     
     # Only detect project type for single project
@@ -1066,6 +1118,7 @@ case "${1:-}" in
         copy_mode_files
         create_templates
         copy_scripts
+        update_gitignore
         create_starter_prompt
         detect_project_type
         show_next_steps
@@ -1082,6 +1135,7 @@ case "${1:-}" in
         copy_mode_files
         create_templates
         copy_scripts
+        update_gitignore
         create_starter_prompt
         show_next_steps
         ;;
@@ -0,0 +1,54 @@
+"""
+Shared test helpers: loading the scripts and temporary memory banks
+
+The entry-point scripts in .memory-bank/scripts have hyphenated names, so
+they are loaded by path instead of imported.
+"""
+
+import importlib.util
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / ".memory-bank" / "scripts"
+
+# Scripts import their shared modules (memory_bank_ignore, ...) as siblings
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def load_script(file_name):
+    """Load .memory-bank/scripts/<file_name>, e.g. auto-update.py as auto_update
+
+    The module is registered in sys.modules and loaded once per process,
+    so every test module patches the same classes.
+    """
+    name = Path(file_name).stem.replace("-", "_")
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / file_name)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return sys.modules[name]
+
+
+def temp_dir(test):
+    """Create a temporary directory that is removed when test finishes"""
+    path = Path(tempfile.mkdtemp()).resolve()
+    test.addCleanup(shutil.rmtree, path)
+    return path
+
+
+def temp_memory_bank(test, *subdirs):
+    """Create a temporary project root holding .memory-bank and the given subdirectories of it"""
+    root = temp_dir(test)
+    (root / ".memory-bank").mkdir()
+    for subdir in subdirs:
+        (root / ".memory-bank" / subdir).mkdir(parents=True)
+    return root
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for --all-projects in auto-update.py
+
+run_all_projects scans the codebase and mines git once for every project
+of a multi-project memory bank, then updates each project's files.
+
+Run with: python tests/test_all_projects.py  (or python -m pytest tests)
+"""
+
+import contextlib
+import io
+import json
+import shutil
+import subprocess
+import unittest
+from unittest import mock
+
+from helpers import load_script, temp_memory_bank
+
+auto_update = load_script("auto-update.py")
+
+PROJECTS = ["api", "web", "worker"]
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class AllProjectsTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self, "shared", "custom_modes", "scripts")
+        bank = self.root / ".memory-bank"
+        for project in PROJECTS:
+            (bank / project / "context").mkdir(parents=True)
+            (bank / project / "context" / "systemPatterns.md").write_text("# System Patterns\n")
+            (bank / project / "active").mkdir()
+            (bank / project / "active" / "progress.md").write_text(
+                f"## [2025-01-01]\n**Issue**: {project} broke\n  - **Solution**: fixed it\n")
+        (self.root / "src").mkdir()
+        (self.root / "src" / "client.py").write_text("try:\n    fetch()\nexcept Exception:\n    pass\n")
+
+        self.git("init", "-q")
+        self.git("config", "user.email", "dev@example.com")
+        self.git("config", "user.name", "Dev")
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "Introduce retry architecture for the client")
+
+    def git(self, *args):
+        subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+    def run_all(self):
+        automation_class = auto_update.MemoryBankAutomation
+        automation = automation_class(self.root, all_projects=True)
+        # Count the scans and git log runs while still doing them
+        with mock.patch.object(automation_class, "_scan_code_patterns", autospec=True,
+                               side_effect=automation_class._scan_code_patterns) as scan, \
+                mock.patch.object(automation_class, "_iter_git_commits", autospec=True,
+                                  side_effect=automation_class._iter_git_commits) as log, \
+                contextlib.redirect_stdout(io.StringIO()):
+            report = automation.run_all_projects()
+        return report, scan.call_count, log.call_count
+
+    def test_code_and_history_are_read_once_for_all_projects(self):
+        report, scans, git_logs = self.run_all()
+        self.assertEqual(scans, 1)
+        self.assertEqual(git_logs, 1)
+        self.assertEqual([r["project"] for r in report["projects"]], PROJECTS)
+
+        for result in report["projects"]:
+            project_dir = self.root / ".memory-bank" / result["project"]
+            self.assertEqual(len(result["decisions"]), 1)
+            self.assertEqual(result["pitfalls"][0]["issue"], f"{result['project']} broke")
+            patterns = (project_dir / "context" / "systemPatterns.md").read_text()
+            self.assertIn("## Auto-Discovered Patterns", patterns)
+            self.assertIn("## Discovered Anti-patterns", patterns)
+            self.assertIn("Introduce retry architecture", (project_dir / "decisions" / "log.md").read_text())
+            health = json.loads((project_dir / "health-report.json").read_text())
+            self.assertEqual(health["project"], result["project"])
+
+    def test_projects_keep_their_own_watermarks(self):
+        self.run_all()
+        self.git("commit", "-q", "--allow-empty", "-m", "Refactor the worker queue")
+        report, _, git_logs = self.run_all()
+        self.assertEqual(git_logs, 1)
+        for result in report["projects"]:
+            self.assertEqual([d["subject"] for d in result["decisions"]],
+                             ["Refactor the worker queue", "Introduce retry architecture for the client"])
+
+    def test_non_project_directories_are_not_projects(self):
+        automation = auto_update.MemoryBankAutomation(self.root, all_projects=True)
+        self.assertEqual(automation.list_projects(), PROJECTS)
+
+    def test_list_projects_option_matches_list_projects(self):
+        (self.root / ".memory-bank" / ".cache").mkdir()
+        (self.root / ".memory-bank" / "__pycache__").mkdir()
+        parser = auto_update.build_parser()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            auto_update.run_command(parser.parse_args(["--list-projects", "--project-root", str(self.root)]),
+                                    parser)
+        self.assertEqual(output.getvalue().strip(), f"Available projects: {', '.join(PROJECTS)}")
+
+
+class EmptyMultiProjectTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self, "shared")
+
+    def run_command(self, *argv):
+        parser = auto_update.build_parser()
+        args = parser.parse_args([*argv, "--project-root", str(self.root)])
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            auto_update.run_command(args, parser)
+        return output.getvalue()
+
+    def test_validate_structure_without_projects_still_validates(self):
+        output = self.run_command("--validate-structure")
+        self.assertNotIn("Working on all projects", output)
+        self.assertIn("3 error(s), 1 warning(s)", output)
+        self.assertIn("Missing BOOTSTRAP.md", output)
+        self.assertFalse((self.root / ".memory-bank" / "scan-cache.json").exists())
+
+    def test_all_projects_without_projects_reports_none(self):
+        self.assertIn("No projects found", self.run_command("--all-projects", "--no-git-index"))
+
+
+if __name__ == "__main__":
+    unittest.main()
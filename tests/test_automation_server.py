@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for auto-update.py --serve and its thin client (memory_bank_client.py)
+
+Run with: python tests/test_automation_server.py  (or python -m pytest tests)
+"""
+
+import contextlib
+import io
+import socket
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from helpers import load_script, temp_dir, temp_memory_bank
+import memory_bank_client
+
+auto_update = load_script("auto-update.py")
+
+
+class AutomationServerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self, "context")
+        (self.root / "client.py").write_text("try:\n    fetch()\nexcept Exception:\n    pass\n")
+
+        self.server = auto_update.AutomationServer(self.root)
+        self.thread = threading.Thread(target=self.server.serve)
+        self.thread.start()
+        self.addCleanup(self.thread.join, 5)
+        self.addCleanup(self.stop)
+
+    def stop(self):
+        with contextlib.suppress(OSError):
+            memory_bank_client.request(memory_bank_client.socket_path(str(self.root)), {"stop": True})
+
+    def forward(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            status = memory_bank_client.forward(list(argv), cwd=str(self.root))
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_commands_run_on_the_server(self):
+        status, stdout, _ = self.forward("--health-check", "--no-git-index")
+        self.assertEqual(status, 0)
+        self.assertIn("Overall health", stdout)
+        self.assertTrue((self.root / ".memory-bank" / "health-report.json").exists())
+
+        status, _, stderr = self.forward("--no-such-option")
+        self.assertEqual(status, 2)
+        self.assertIn("unrecognized arguments", stderr)
+
+    def test_automation_is_reused_until_its_inputs_change(self):
+        with mock.patch.object(auto_update, "create_automation",
+                               side_effect=auto_update.create_automation) as create:
+            for _ in range(3):
+                self.assertEqual(self.forward("--scan-patterns", "--no-git-index")[0], 0)
+            self.assertEqual(create.call_count, 1)
+
+            (self.root / ".memory-bank-ignore").write_text("client.py\n")
+            status, stdout, _ = self.forward("--scan-patterns", "--no-git-index")
+            self.assertEqual(create.call_count, 2)
+        self.assertIn("Found 0 patterns", stdout)
+
+    def test_other_roots_and_watch_are_left_to_the_client(self):
+        self.assertIsNone(self.forward("--watch")[0])
+        other = temp_dir(self)
+        self.assertIsNone(self.forward("--health-check", "--project-root", str(other))[0])
+
+    def test_client_reports_a_server_that_stops_replying(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        execute = self.server.execute
+
+        def hang(message):
+            if "argv" in message:
+                release.wait(5)
+            return execute(message)
+
+        with mock.patch.object(self.server, "execute", side_effect=hang), \
+                mock.patch.object(memory_bank_client, "REPLY_TIMEOUT", 0.2):
+            status, _, stderr = self.forward("--health-check")
+        self.assertEqual(status, 1)
+        self.assertIn("no reply from the server", stderr)
+
+    def test_client_falls_back_once_the_server_stopped(self):
+        self.stop()
+        self.thread.join(5)
+        self.assertIsNone(self.forward("--health-check")[0])
+        self.assertFalse(Path(memory_bank_client.socket_path(str(self.root))).exists())
+
+
+
+class ClientTimeoutTest(unittest.TestCase):
+    def test_client_falls_back_when_the_server_does_not_accept(self):
+        root = temp_memory_bank(self)
+        path = memory_bank_client.socket_path(str(root))
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(listener.close)
+        listener.bind(path)
+        listener.listen(0)
+        # Fill the backlog of a server that never calls accept()
+        pending = []
+        self.addCleanup(lambda: [sock.close() for sock in pending])
+        with contextlib.suppress(OSError):
+            for _ in range(8):
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                pending.append(sock)
+                sock.setblocking(False)
+                sock.connect(path)
+
+        with mock.patch.object(memory_bank_client, "CONNECT_TIMEOUT", 0.2):
+            self.assertIsNone(memory_bank_client.forward(["--health-check"], cwd=str(root)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental git decision mining in auto-update.py
+
+extract_git_decisions keeps a watermark and the mined decisions of each
+branch in decision-cache.json. These tests check that later runs only
+mine commits after the watermark, that a rewritten branch falls back to a
+full mine and forgets the commits it lost, and that log.md is rendered
+from the current branch's cached decisions.
+
+Run with: python tests/test_decision_cache.py  (or python -m pytest tests)
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import unittest
+
+from helpers import load_script, temp_memory_bank
+
+auto_update = load_script("auto-update.py")
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class DecisionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self, "decisions")
+        (self.root / ".memory-bank" / "decisions" / "log.md").write_text("# Decision Log\n")
+        self.git("init", "-q")
+        self.git("config", "user.email", "dev@example.com")
+        self.git("config", "user.name", "Dev")
+
+    def git(self, *args, env=None):
+        return subprocess.run(["git", *args], cwd=self.root, check=True, env=env,
+                              capture_output=True, text=True).stdout.strip()
+
+    def commit(self, subject, *body, date=None):
+        message = ["-m", subject]
+        for paragraph in body:
+            message += ["-m", paragraph]
+        env = None
+        if date:
+            env = dict(os.environ, GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+        self.git("commit", "-q", "--allow-empty", *message, env=env)
+
+    def mine(self, **kwargs):
+        automation = auto_update.MemoryBankAutomation(self.root)
+        calls = []
+        original = automation._parse_decisions
+
+        def parse(commits):
+            commits = list(commits)
+            calls.append([c["subject"] for c in commits])
+            return original(commits)
+
+        automation._parse_decisions = parse
+        subjects = [d["subject"] for d in automation.extract_git_decisions(**kwargs)]
+        return subjects, calls
+
+    def test_later_runs_mine_only_new_commits(self):
+        self.commit("Refactor config loading")
+        self.commit("Fix typo")
+        subjects, calls = self.mine()
+        self.assertEqual(subjects, ["Refactor config loading"])
+        self.assertEqual(len(calls), 1)
+
+        subjects, calls = self.mine()
+        self.assertEqual(subjects, ["Refactor config loading"])
+        self.assertEqual(calls, [])
+
+        self.commit("Migrate storage to sqlite")
+        subjects, calls = self.mine()
+        self.assertEqual(sorted(subjects), ["Migrate storage to sqlite", "Refactor config loading"])
+        self.assertNotIn("Refactor config loading", calls[0])
+
+        log = (self.root / ".memory-bank" / "decisions" / "log.md").read_text()
+        self.assertEqual(log.count("## Auto-Extracted from Git History"), 1)
+        self.assertIn("**Migrate storage to sqlite**", log)
+        self.assertIn("**Refactor config loading**", log)
+
+    def test_rewritten_branch_is_mined_again(self):
+        self.commit("Refactor config loading")
+        self.commit("Introduce plugin registry")
+        self.mine()
+
+        self.git("reset", "-q", "--hard", "HEAD~1")
+        self.commit("Redesign plugin architecture")
+        subjects, calls = self.mine()
+        self.assertIn("Refactor config loading", calls[0])
+        self.assertIn("Redesign plugin architecture", subjects)
+
+    def test_reset_drops_only_the_commits_no_longer_on_the_branch(self):
+        self.commit("Refactor config loading", date="2020-01-01T12:00:00")
+        self.mine(since="2019-01-01")
+        self.commit("Introduce plugin registry")
+        self.assertEqual(self.mine()[0], ["Introduce plugin registry", "Refactor config loading"])
+
+        # The old commit is outside the default window, so only the cache still has it
+        self.git("reset", "-q", "--hard", "HEAD~1")
+        self.assertEqual(self.mine()[0], ["Refactor config loading"])
+        log = (self.root / ".memory-bank" / "decisions" / "log.md").read_text()
+        self.assertNotIn("Introduce plugin registry", log)
+
+    def test_branches_keep_their_own_decisions(self):
+        self.commit("Refactor config loading")
+        main = self.git("rev-parse", "--abbrev-ref", "HEAD")
+        self.mine()
+        self.git("checkout", "-q", "-b", "feature")
+        self.commit("Introduce plugin registry")
+        self.assertEqual(self.mine()[0], ["Introduce plugin registry", "Refactor config loading"])
+
+        self.git("checkout", "-q", main)
+        subjects, calls = self.mine()
+        self.assertEqual(subjects, ["Refactor config loading"])
+        self.assertEqual(calls, [])
+        log = (self.root / ".memory-bank" / "decisions" / "log.md").read_text()
+        self.assertNotIn("Introduce plugin registry", log)
+
+    def test_keyword_changes_reclassify_cached_commits(self):
+        self.commit("Adopt ADR-7 for storage")
+        self.commit("Refactor parser")
+        self.assertEqual(self.mine()[0], ["Refactor parser"])
+
+        (self.root / ".memory-bank" / "decision-keywords.json").write_text('{"decision": ["adopt"]}')
+        subjects, calls = self.mine()
+        self.assertEqual(sorted(subjects), ["Adopt ADR-7 for storage", "Refactor parser"])
+        self.assertEqual(len(calls), 1)
+
+        self.assertEqual(self.mine()[1], [])
+
+    def test_stream_keeps_multi_line_bodies_and_counts_changes(self):
+        self.commit("Refactor | split the loader", "First line\nBecause: startup was slow\n\n1\t2\tnot-a-stat")
+        (self.root / "big.txt").write_text("x\n" * 300)
+        (self.root / "blob.bin").write_bytes(b"\0\1\2")
+        self.git("add", "big.txt", "blob.bin")
+        self.commit("Add fixtures")
+        self.git("mv", "big.txt", "moved.txt")
+        self.commit("Move fixture")
+
+        automation = auto_update.MemoryBankAutomation(self.root)
+        commits = list(automation._iter_git_commits(["HEAD"]))
+        self.assertEqual([c["subject"] for c in commits],
+                         ["Move fixture", "Add fixtures", "Refactor | split the loader"])
+        moved, added, refactor = commits
+        self.assertEqual((moved["files_changed"], moved["lines_added"]), (1, 0))
+        self.assertEqual((added["files_changed"], added["lines_added"], added["lines_deleted"]), (2, 300, 0))
+        self.assertEqual(refactor["body"], "First line\nBecause: startup was slow\n\n1\t2\tnot-a-stat\n")
+        self.assertEqual(refactor["files_changed"], 0)
+
+        decision = automation._parse_decisions([refactor])[0]
+        self.assertEqual(decision["rationale"], "startup was slow")
+        self.assertEqual(automation._assess_impact("Add fixtures", added), "medium")
+
+    def test_failing_git_log_yields_no_decisions(self):
+        self.commit("Refactor config loading")
+        automation = auto_update.MemoryBankAutomation(self.root)
+        with self.assertRaises(subprocess.CalledProcessError):
+            list(automation._iter_git_commits(["no-such-revision"]))
+
+    def test_sharded_backfill_matches_serial_mining(self):
+        for year in range(2019, 2025):
+            for month in (1, 4, 7, 10):
+                self.commit(f"Refactor module {year}-{month:02d}", date=f"{year}-{month:02d}-15T12:00:00")
+                self.commit(f"Fix typo {year}-{month:02d}", date=f"{year}-{month:02d}-15T12:00:00")
+
+        serial = auto_update.MemoryBankAutomation(self.root, use_cache=False)
+        expected = serial.extract_git_decisions(since="2020-01-01")
+        self.assertEqual(len(expected), 20)
+
+        sharded = auto_update.MemoryBankAutomation(self.root, use_cache=False, jobs=3)
+        self.assertGreater(len(sharded._decision_shards("2020-01-01", "HEAD")), 2)
+        with contextlib.redirect_stdout(io.StringIO()) as progress:
+            self.assertEqual(sharded.extract_git_decisions(since="2020-01-01"), expected)
+        self.assertIn("decisions", progress.getvalue())
+
+    def test_since_is_passed_to_git_as_one_argument(self):
+        self.commit("Refactor config loading")
+        subjects, _ = self.mine(since="1 day ago")
+        self.assertEqual(subjects, ["Refactor config loading"])
+
+        subjects, _ = self.mine(since="2999-01-01")
+        self.assertEqual(subjects, ["Refactor config loading"])
+
+
+if __name__ == "__main__":
+    unittest.main()
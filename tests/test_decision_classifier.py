@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the precompiled decision keyword classifier in auto-update.py
+
+Run with: python tests/test_decision_classifier.py  (or python -m pytest tests)
+"""
+
+import contextlib
+import io
+import json
+import unittest
+
+from helpers import load_script, temp_memory_bank
+
+auto_update = load_script("auto-update.py")
+
+
+class DecisionClassifierTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self)
+
+    def automation(self, config=None):
+        if config is not None:
+            (self.root / ".memory-bank" / "decision-keywords.json").write_text(config)
+        return auto_update.MemoryBankAutomation(self.root)
+
+    def test_keywords_match_whole_words_and_inflections(self):
+        classify = self.automation().decision_classifier().classify
+        self.assertEqual(classify("Address review comments"), (False, "other", None))
+        self.assertEqual(classify("Added retry to the uploader"), (False, "feature", None))
+        self.assertEqual(classify("Migration of sessions to redis"), (True, "migration", None))
+        self.assertEqual(classify("Refactored the architectural layers"), (True, "refactoring", "high"))
+        self.assertEqual(classify("Introduction of a plugin registry"), (True, "feature", None))
+        self.assertEqual(classify("Updating deps"), (False, "migration", "medium"))
+
+    def test_type_priority_follows_declaration_order(self):
+        automation = self.automation()
+        self.assertEqual(automation._classify_decision("remove and refactor"), "refactoring")
+        self.assertEqual(automation._assess_impact("improve caching"), "medium")
+        self.assertEqual(automation._assess_impact("breaking: improve caching"), "high")
+
+    def test_config_extends_keyword_tables(self):
+        automation = self.automation(json.dumps({
+            "decision": ["adr"],
+            "types": {"security": ["vulnerability"], "cleanup": ["prune"]},
+            "impact": {"high": ["rewrite"]}
+        }))
+        classify = automation.decision_classifier().classify
+        self.assertEqual(classify("ADR 12: patch vulnerabilities"), (True, "security", None))
+        self.assertEqual(classify("Prune stale branches"), (False, "cleanup", None))
+        self.assertEqual(classify("Rewrite the parser"), (False, "other", "high"))
+
+    def test_invalid_config_falls_back_to_built_in_keywords(self):
+        for config in ('{"impact": {"critical": ["outage"]}}', '{"decision": "adr"}', "not json"):
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                classify = self.automation(config).decision_classifier().classify
+            self.assertIn("Warning: ignoring decision-keywords.json", output.getvalue())
+            self.assertEqual(classify("Refactor loader"), (True, "refactoring", "medium"))
+
+
+if __name__ == "__main__":
+    unittest.main()
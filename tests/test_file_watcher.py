@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the --watch file watchers in auto-update.py
+
+Run with: python tests/test_file_watcher.py  (or python -m pytest tests)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+from helpers import load_script, temp_dir, temp_memory_bank
+
+auto_update = load_script("auto-update.py")
+
+InotifyWatcher = auto_update.InotifyWatcher
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "inotify is only available on Linux")
+class InotifyWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_dir(self)
+        (self.root / "src").mkdir()
+        (self.root / "node_modules").mkdir()
+
+        self.watcher = InotifyWatcher(self.root, lambda name, rel_path: name == "node_modules")
+        self.addCleanup(self.watcher.close)
+
+    def decode(self, *events):
+        """wait() on (rel_dir, mask, name) events read as one buffer from the inotify descriptor"""
+        wds = {rel_dir: wd for wd, rel_dir in self.watcher.watches.items()}
+        data = b""
+        for rel_dir, mask, name in events:
+            encoded = os.fsencode(name).ljust(16, b"\0") if name else b""
+            data += InotifyWatcher.EVENT_HEADER.pack(wds.get(rel_dir, -1), mask, 0, len(encoded)) + encoded
+        with mock.patch("select.select", return_value=([self.watcher.fd], [], [])), \
+                mock.patch("os.read", return_value=data):
+            return self.watcher.wait(0)
+
+    def test_ignored_directories_are_not_watched(self):
+        self.assertEqual(sorted(self.watcher.watches.values()), ["", "src"])
+
+    def test_events_are_decoded_to_relative_paths(self):
+        changed = self.decode(("src", InotifyWatcher.IN_CLOSE_WRITE, "app.py"),
+                              ("", InotifyWatcher.IN_DELETE, "setup.py"),
+                              ("gone", InotifyWatcher.IN_MODIFY, "stale.py"))
+        self.assertEqual(changed, {"src/app.py", "setup.py"})
+
+    def test_overflow_and_removed_watches(self):
+        src_wd = next(wd for wd, rel_dir in self.watcher.watches.items() if rel_dir == "src")
+        changed = self.decode(("src", InotifyWatcher.IN_IGNORED, ""), ("", InotifyWatcher.IN_Q_OVERFLOW, ""))
+        self.assertEqual(changed, {None})
+        self.assertNotIn(src_wd, self.watcher.watches)
+
+    def test_new_directories_are_watched_and_their_files_reported(self):
+        (self.root / "lib" / "sub").mkdir(parents=True)
+        (self.root / "lib" / "sub" / "util.ts").write_text("")
+        (self.root / "vendor" / "node_modules").mkdir(parents=True)
+        changed = self.decode(("", InotifyWatcher.IN_CREATE | InotifyWatcher.IN_ISDIR, "lib"),
+                              ("", InotifyWatcher.IN_MOVED_TO | InotifyWatcher.IN_ISDIR, "vendor"),
+                              ("", InotifyWatcher.IN_CREATE | InotifyWatcher.IN_ISDIR, "node_modules"))
+        self.assertEqual(changed, {"lib/sub/util.ts"})
+        self.assertEqual(sorted(self.watcher.watches.values()), ["", "lib", "lib/sub", "src", "vendor"])
+
+    def test_real_changes_are_reported(self):
+        (self.root / "src" / "app.py").write_text("x = 1\n")
+        (self.root / "node_modules" / "dep.js").write_text("")
+        self.assertEqual(self.watcher.wait(5), {"src/app.py"})
+        self.assertEqual(self.watcher.wait(0), set())
+
+
+class PollingWatcherTest(unittest.TestCase):
+    def test_changed_added_and_removed_paths_are_reported(self):
+        snapshots = iter([
+            {"a.py": (1, 10), "b.py": (1, 20), "c.py": (1, 30)},
+            {"a.py": (2, 10), "b.py": (1, 20), "d.py": (1, 40)},
+            {"a.py": (2, 10), "b.py": (1, 20), "d.py": (1, 40)},
+        ])
+        watcher = auto_update.PollingWatcher(lambda: next(snapshots), 0)
+        self.assertEqual(watcher.wait(0), {"a.py", "c.py", "d.py"})
+        self.assertEqual(watcher.wait(0), set())
+
+    def test_wait_without_timeout_blocks_until_something_changes(self):
+        snapshots = iter([{"a.py": (1, 10)}] * 3 + [{"a.py": (1, 11)}])
+        watcher = auto_update.PollingWatcher(lambda: next(snapshots), 0)
+        self.assertEqual(watcher.wait(None), {"a.py"})
+
+
+
+class ScriptedWatcher:
+    """Watcher whose wait() returns the given change sets, then stops the watch loop"""
+
+    mode = "scripted"
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+
+    def wait(self, timeout):
+        if timeout is not None:
+            # Debounce: nothing more arrives
+            return set()
+        if not self.steps:
+            raise KeyboardInterrupt
+        step = self.steps.pop(0)
+        return step() if callable(step) else step
+
+    def close(self):
+        pass
+
+
+class WatchTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self, "context", "active")
+        (self.root / "client.py").write_text("try:\n    fetch()\nexcept Exception:\n    pass\n")
+        self.automation = auto_update.MemoryBankAutomation(self.root, use_git_index=False)
+        self.patterns_file = ".memory-bank/context/systemPatterns.md"
+
+    def watch(self, *steps):
+        """Health report runs during a watch fed the given change sets"""
+        watcher = ScriptedWatcher(*steps)
+        with mock.patch.object(auto_update, "InotifyWatcher", return_value=watcher), \
+                mock.patch.object(self.automation, "monitor_context_health",
+                                  wraps=self.automation.monitor_context_health) as health, \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.automation.watch(debounce=0)
+        return health.call_count
+
+    def test_own_writes_do_not_trigger_another_cycle(self):
+        self.assertEqual(self.watch({self.patterns_file, ".memory-bank/health-report.json"}), 1)
+
+    def test_later_edits_to_written_files_are_handled(self):
+        def edit():
+            with open(self.root / self.patterns_file, "a") as f:
+                f.write("\n## Notes\n")
+            return {self.patterns_file}
+
+        self.assertEqual(self.watch(edit), 2)
+
+    def test_watch_cannot_be_combined_with_all_projects(self):
+        parser = auto_update.build_parser()
+        args = parser.parse_args(["--watch", "--all-projects", "--project-root", str(self.root)])
+        with self.assertRaises(SystemExit) as raised, contextlib.redirect_stderr(io.StringIO()) as stderr, \
+                mock.patch.object(auto_update.MemoryBankAutomation, "watch", side_effect=AssertionError):
+            auto_update.run_command(args, parser)
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("--watch cannot be combined with --all-projects", stderr.getvalue())
+
+
+
+if __name__ == "__main__":
+    unittest.main()
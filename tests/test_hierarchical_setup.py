@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for auto-setup-hierarchy.py
+
+Run with: python tests/test_hierarchical_setup.py  (or python -m pytest tests)
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import unittest
+import unittest.mock
+
+from helpers import REPO_ROOT, load_script, temp_dir
+
+auto_setup_hierarchy = load_script("auto-setup-hierarchy.py")
+
+# Stand-in for setup-memory-bank.sh: creates the memory bank in its cwd
+FAKE_SETUP = """#!/bin/sh
+sleep 0.2
+mkdir .memory-bank
+echo "set up $(basename "$PWD")"
+"""
+
+
+@unittest.skipUnless(shutil.which("sh"), "sh is not installed")
+class ConcurrentSetupTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_dir(self)
+        self.repos = ["."] + [f"services/svc{i}" for i in range(6)]
+        for rel_path in self.repos:
+            (self.root / rel_path / ".git").mkdir(parents=True)
+
+        tools = temp_dir(self)
+        self.setup_script = tools / "setup-memory-bank.sh"
+        self.setup_script.write_text(FAKE_SETUP)
+        self.setup_script.chmod(0o755)
+
+    def run_setup(self, jobs):
+        setup = auto_setup_hierarchy.HierarchicalSetup(self.root)
+        setup.setup_script = self.setup_script
+        cwd = os.getcwd()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            setup.run(assume_yes=True, jobs=jobs)
+        self.assertEqual(os.getcwd(), cwd)
+        return output.getvalue()
+
+    def test_repos_are_set_up_concurrently_with_ordered_output(self):
+        output = self.run_setup(jobs=4)
+
+        for rel_path in self.repos:
+            self.assertTrue((self.root / rel_path / ".memory-bank").is_dir(), rel_path)
+        self.assertTrue((self.root / "services/svc3/.memory-bank/hierarchy.json").exists())
+        self.assertIn("✓ Successful: 7 repositories", output)
+
+        # Each repo's captured script output follows its own header, in repo order
+        positions = [output.index(f"Setting up: {self.root / rel_path}\n") for rel_path in self.repos]
+        self.assertEqual(positions, sorted(positions))
+        for i in range(6):
+            self.assertLess(output.index(f"Setting up: {self.root}/services/svc{i}\n"),
+                            output.index(f"set up svc{i}\n"))
+
+    def test_existing_memory_banks_are_skipped(self):
+        (self.root / "services/svc0/.memory-bank").mkdir()
+        output = self.run_setup(jobs=3)
+        self.assertIn("✓ Memory Bank already exists, skipping...", output)
+        self.assertNotIn("set up svc0", output)
+
+
+class TemplateMaterializerTest(unittest.TestCase):
+    def setUp(self):
+        self.repo = temp_dir(self)
+        self.materializer = auto_setup_hierarchy.TemplateMaterializer(REPO_ROOT)
+
+    def test_builds_tree_from_templates(self):
+        counts = self.materializer.materialize(self.repo)
+        bank = self.repo / ".memory-bank"
+
+        for dir_name in auto_setup_hierarchy.MEMORY_BANK_DIRS:
+            self.assertTrue((bank / dir_name).is_dir(), dir_name)
+        self.assertEqual((bank / "context/projectBrief.md").read_bytes(),
+                         (REPO_ROOT / "templates/projectBrief.md").read_bytes())
+        self.assertTrue((bank / "custom_modes/van_instructions.md").exists())
+        self.assertTrue((bank / "scripts/memory_bank_ignore.py").exists())
+        self.assertEqual((bank / "scripts/setup-hierarchy.sh").stat().st_mode & 0o777,
+                         (REPO_ROOT / ".memory-bank/scripts/setup-hierarchy.sh").stat().st_mode & 0o777)
+        self.assertEqual(counts["cloned"] + counts["copied"], len(self.materializer.files))
+
+    def test_identical_files_are_skipped_and_project_files_kept(self):
+        self.materializer.materialize(self.repo)
+        brief = self.repo / ".memory-bank/context/projectBrief.md"
+        brief.write_text("# My project\n")
+        bootstrap = self.repo / ".memory-bank/BOOTSTRAP.md"
+        bootstrap.write_text("stale\n")
+
+        counts = self.materializer.materialize(self.repo)
+        self.assertEqual(counts["kept"], 1)
+        self.assertEqual(counts["cloned"] + counts["copied"], 1)
+        self.assertEqual(counts["unchanged"], len(self.materializer.files) - 2)
+        self.assertEqual(brief.read_text(), "# My project\n")
+        self.assertEqual(bootstrap.read_bytes(), (REPO_ROOT / ".memory-bank/BOOTSTRAP.md").read_bytes())
+
+    def test_machine_local_state_is_gitignored_once(self):
+        (self.repo / ".gitignore").write_text("node_modules/")
+        self.materializer.materialize(self.repo)
+        self.materializer.materialize(self.repo)
+        lines = (self.repo / ".gitignore").read_text().splitlines()
+        self.assertEqual(lines[:2], ["node_modules/", auto_setup_hierarchy.GITIGNORE_HEADER])
+        self.assertEqual(lines[2:], auto_setup_hierarchy.GITIGNORE_ENTRIES)
+
+    def test_manual_setup_spawns_no_processes(self):
+        setup = auto_setup_hierarchy.HierarchicalSetup(self.repo)
+        setup.setup_script = None
+        setup.materializer = self.materializer
+        output = []
+        with unittest.mock.patch.object(auto_setup_hierarchy.subprocess, "run") as run:
+            self.assertTrue(setup.setup_repo(self.repo, output))
+        run.assert_not_called()
+        self.assertTrue((self.repo / ".memory-bank/active/progress.md").exists())
+        self.assertFalse((self.repo / "memory-bank").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
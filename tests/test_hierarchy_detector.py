@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for repository discovery in detect-hierarchy.py
+
+Run with: python tests/test_hierarchy_detector.py  (or python -m pytest tests)
+"""
+
+import shutil
+import unittest
+
+from helpers import load_script, temp_dir, temp_memory_bank
+
+detect_hierarchy = load_script("detect-hierarchy.py")
+
+
+class FindGitReposTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_dir(self)
+
+    def repo(self, rel_path):
+        (self.root / rel_path / ".git").mkdir(parents=True)
+
+    def found(self):
+        detector = detect_hierarchy.HierarchyDetector(self.root)
+        return [str(p.relative_to(self.root)) for p in detector.find_git_repos()]
+
+    def test_max_depth_is_exact(self):
+        self.repo(".")
+        self.repo("a/b/c")
+        self.repo("a/b/c/d")
+        self.repo("x/y/z/w")
+        self.assertEqual(self.found(), [".", "a/b/c"])
+
+    def test_build_folders_are_pruned_inside_repos_only(self):
+        self.repo("app")
+        self.repo("app/vendor/lib")
+        self.repo("app/tools/build-helper")
+        self.repo("vendor/fork")
+        self.assertEqual(self.found(), ["app", "app/tools/build-helper", "vendor/fork"])
+
+    def test_build_folders_that_are_repos_are_kept(self):
+        self.repo("app")
+        self.repo("app/build")
+        self.repo("app/target/generated")
+        self.assertEqual(self.found(), ["app", "app/build"])
+
+    def test_ignore_file_re_includes_build_folders(self):
+        self.repo("app")
+        self.repo("app/vendor/lib")
+        self.repo("app/target/generated")
+        (self.root / ".memory-bank-ignore").write_text("!vendor/\n")
+        self.assertEqual(self.found(), ["app", "app/vendor/lib"])
+
+    def test_ignored_directories_are_not_descended(self):
+        self.repo("keep")
+        self.repo("scratch/tmp-repo")
+        (self.root / ".memory-bank-ignore").write_text("scratch/\n")
+        self.assertEqual(self.found(), ["keep"])
+
+    def test_escaped_trailing_space_in_ignore_file_is_kept(self):
+        self.repo("scratch ")
+        self.repo("scratch")
+        (self.root / ".memory-bank-ignore").write_text("# comment\n\nscratch\\ \n")
+        self.assertEqual(self.found(), ["scratch"])
+
+    def test_git_file_and_git_internals_are_not_repos(self):
+        self.repo("main")
+        (self.root / "main" / ".git" / "modules" / "sub" / ".git").mkdir(parents=True)
+        (self.root / "worktree").mkdir()
+        (self.root / "worktree" / ".git").write_text("gitdir: ../main/.git\n")
+        self.assertEqual(self.found(), ["main"])
+
+
+class BuildHierarchyTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_dir(self)
+        for rel_path in [".", "a", "a/x/b", "a-b", "a-b/c", "a-b/c/d", "z/y", "z/y/w"]:
+            (self.root / rel_path / ".git").mkdir(parents=True)
+        self.hierarchy = detect_hierarchy.HierarchyDetector(self.root).build_hierarchy()
+
+    def test_children_and_parent_skip_non_repo_directories(self):
+        repos = {repo["path"]: repo for repo in self.hierarchy["repos"]}
+        # z/y/w was reported as a child of the root too: only z, not z/y, was checked
+        self.assertEqual(repos["."]["children"], ["a", "a-b", "z/y"])
+        self.assertEqual(repos["z/y"]["children"], ["z/y/w"])
+        self.assertEqual(repos["a"]["children"], ["a/x/b"])
+        self.assertEqual(repos["a/x/b"]["parent"], "a")
+        self.assertEqual(repos["a-b"]["children"], ["a-b/c"])
+        self.assertEqual(repos["a-b/c/d"]["parent"], "a-b/c")
+        self.assertEqual(repos["a-b"]["parent"], ".")
+        self.assertIsNone(repos["."]["parent"])
+
+    def test_tree_nests_repos_under_their_nearest_ancestor(self):
+        def flatten(nodes):
+            return {node["path"]: flatten(node["children"]) for node in nodes}
+
+        self.assertEqual(flatten(self.hierarchy["tree"]), {
+            ".": {"a": {"a/x/b": {}}, "a-b": {"a-b/c": {"a-b/c/d": {}}}, "z/y": {"z/y/w": {}}}
+        })
+
+
+class CachedWalkTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self)
+        for rel_path in [".", "a", "a/x/b", "c"]:
+            (self.root / rel_path / ".git").mkdir(parents=True, exist_ok=True)
+
+    def walk(self, use_cache=True):
+        detector = detect_hierarchy.HierarchyDetector(self.root, use_cache=use_cache)
+        # Trust every mtime, however recent: the test changes the tree within seconds
+        detector.RACY_WINDOW_NS = 0
+        repos = [str(p.relative_to(self.root)) for p in detector.find_git_repos()]
+        return repos, detector.scan_stats
+
+    def test_unchanged_tree_is_not_rescanned(self):
+        first, stats = self.walk()
+        self.assertEqual(stats["cached"], 0)
+        self.assertTrue((self.root / ".memory-bank" / "hierarchy-cache.json").exists())
+
+        second, stats = self.walk()
+        self.assertEqual(second, first)
+        self.assertEqual(stats["scanned"], 0)
+
+    def test_only_changed_directories_are_rescanned(self):
+        self.walk()
+        (self.root / "a" / "new" / ".git").mkdir(parents=True)
+        shutil.rmtree(self.root / "c")
+
+        repos, stats = self.walk()
+        self.assertEqual(repos, [".", "a", "a/new", "a/x/b"])
+        # root (c removed), a (new added) and the new directory itself
+        self.assertEqual(stats["scanned"], 3)
+
+    def test_ignore_file_change_invalidates_cache(self):
+        self.walk()
+        (self.root / ".memory-bank-ignore").write_text("c/\n")
+        repos, stats = self.walk()
+        self.assertEqual(repos, [".", "a", "a/x/b"])
+        self.assertEqual(stats["cached"], 0)
+
+    def test_no_cache_rescans_everything(self):
+        self.walk()
+        _, stats = self.walk(use_cache=False)
+        self.assertEqual(stats["cached"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared .memory-bank-ignore matcher (memory_bank_ignore.py)
+
+The matcher follows .gitignore semantics, so where git is installed its
+verdicts are checked against git check-ignore on the same patterns.
+
+Run with: python tests/test_ignore_matcher.py  (or python -m pytest tests)
+"""
+
+import shutil
+import subprocess
+import unittest
+
+from helpers import temp_dir
+from memory_bank_ignore import IgnoreMatcher
+
+PATTERNS = [
+    "# comment",
+    "",
+    "build/",
+    "*.log",
+    "!keep.log",
+    "/docs/*.md",
+    "a/**/b",
+    "logs/**",
+    "**/tmp",
+    "cache",
+    "!src/cache",
+    "data/*/raw/",
+    "[Tt]humbs.db",
+    "file?.txt",
+    "\\#literal",
+    "vendor/",
+    "!vendor/keep.js",
+]
+
+# (path, is_dir)
+PATHS = [
+    ("build", True), ("buildtools", True), ("src/build", True), ("src/build/x.js", False),
+    ("x.log", False), ("deep/x.log", False), ("keep.log", False), ("deep/keep.log", False),
+    ("docs/a.md", False), ("docs/sub/a.md", False), ("sub/docs/a.md", False),
+    ("a/b", True), ("a/x/y/b", False), ("xa/b", True),
+    ("logs", True), ("logs/z/q", False),
+    ("tmp", True), ("q/r/tmp", False),
+    ("cache", True), ("src/cache", True), ("lib/cache", False),
+    ("data/x/raw", True), ("data/x/raw", False), ("data/x/y/raw", True),
+    ("Thumbs.db", False), ("thumbs.db", False), ("Xhumbs.db", False),
+    ("file1.txt", False), ("file12.txt", False),
+    ("#literal", False),
+    ("vendor/keep.js", False), ("vendor/lib/a.js", False),
+]
+
+
+class IgnoreMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.matcher = IgnoreMatcher(PATTERNS)
+
+    def test_directory_patterns_match_whole_names(self):
+        self.assertTrue(self.matcher.is_ignored("build", is_dir=True))
+        self.assertFalse(self.matcher.is_ignored("buildtools", is_dir=True))
+        self.assertFalse(self.matcher.is_ignored("buildtools/main.py"))
+        self.assertTrue(self.matcher.is_ignored("src/build/main.py"))
+
+    def test_excluded_directory_contents_cannot_be_re_included(self):
+        self.assertTrue(self.matcher.is_ignored("vendor/keep.js"))
+        self.assertFalse(self.matcher.match("vendor/keep.js"))
+
+    def test_last_matching_pattern_wins(self):
+        self.assertFalse(self.matcher.is_ignored("keep.log"))
+        self.assertTrue(IgnoreMatcher(["!keep.log", "*.log"]).is_ignored("keep.log"))
+
+    def test_re_included_paths_are_told_apart_from_unmatched_ones(self):
+        matcher = IgnoreMatcher(["*.log", "!keep.log", "!vendor/"])
+        self.assertTrue(matcher.is_reincluded("keep.log"))
+        self.assertTrue(matcher.is_reincluded("app/vendor", is_dir=True))
+        self.assertFalse(matcher.is_reincluded("vendor"))
+        self.assertFalse(matcher.is_reincluded("debug.log"))
+        self.assertFalse(matcher.is_reincluded("main.py"))
+
+    def test_no_patterns(self):
+        self.assertFalse(IgnoreMatcher([]).is_ignored("anything/at/all.py"))
+
+    @unittest.skipUnless(shutil.which("git"), "git is not installed")
+    def test_matches_git_check_ignore(self):
+        root = temp_dir(self)
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        (root / ".gitignore").write_text("\n".join(PATTERNS) + "\n")
+
+        for path, is_dir in PATHS:
+            # git only knows a path is a directory if it exists as one
+            with self.subTest(path=path, is_dir=is_dir):
+                target = root / path
+                if target.exists():
+                    shutil.rmtree(target) if target.is_dir() else target.unlink()
+                if is_dir:
+                    target.mkdir(parents=True)
+                else:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_text("")
+                result = subprocess.run(["git", "check-ignore", "-q", "--no-index", path], cwd=root)
+                self.assertEqual(IgnoreMatcher(PATTERNS).is_ignored(path, is_dir), result.returncode == 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
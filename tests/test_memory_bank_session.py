@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the run-scoped MemoryBankSession in auto-update.py
+
+Inside MemoryBankAutomation.session() memory bank files are read and
+stat'ed once and every change is written back once, when the block ends.
+
+Run with: python tests/test_memory_bank_session.py  (or python -m pytest tests)
+"""
+
+import contextlib
+import io
+import unittest
+from collections import Counter
+from pathlib import Path
+from unittest import mock
+
+from helpers import load_script, temp_memory_bank
+
+auto_update = load_script("auto-update.py")
+
+PROGRESS = """## [2025-01-01]
+**Issue**: Cache went stale
+  - **Solution**: Invalidate on write
+"""
+
+
+class MemoryBankSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self, "context", "active")
+        bank = self.root / ".memory-bank"
+        self.patterns_file = bank / "context" / "systemPatterns.md"
+        self.patterns_file.write_text("# System Patterns\n")
+        (bank / "active" / "progress.md").write_text(PROGRESS)
+        (self.root / "client.py").write_text("try:\n    fetch()\nexcept Exception:\n    pass\n")
+        self.automation = auto_update.MemoryBankAutomation(self.root, use_git_index=False)
+
+    def test_changes_are_buffered_and_written_once(self):
+        with mock.patch.object(auto_update.MemoryBankFiles, "write_text", autospec=True,
+                               side_effect=auto_update.MemoryBankFiles.write_text) as write:
+            with self.automation.session() as session:
+                self.automation.scan_and_update_patterns()
+                self.automation.extract_pitfall_solutions()
+                self.assertEqual(self.patterns_file.read_text(), "# System Patterns\n")
+                self.assertEqual(session.written, [])
+
+        written = Counter(Path(call.args[1]).name for call in write.call_args_list)
+        self.assertEqual(written["systemPatterns.md"], 1)
+        self.assertEqual(session.written, [self.patterns_file])
+        content = self.patterns_file.read_text()
+        self.assertIn("## Auto-Discovered Patterns", content)
+        self.assertIn("## Discovered Anti-patterns", content)
+
+    def test_each_path_is_stat_ed_once(self):
+        with mock.patch.object(auto_update.os, "stat", wraps=auto_update.os.stat) as stat, \
+                contextlib.redirect_stdout(io.StringIO()):
+            with self.automation.session():
+                self.automation.monitor_context_health()
+                self.automation.validate_structure()
+        counts = Counter(str(call.args[0]) for call in stat.call_args_list)
+        self.assertTrue(counts)
+        self.assertEqual(max(counts.values()), 1, counts.most_common(3))
+
+    def test_buffered_writes_look_fresh_to_later_tasks(self):
+        old = 1_000_000_000
+        auto_update.os.utime(self.patterns_file, (old, old))
+        with self.automation.session():
+            self.automation.scan_and_update_patterns()
+            health = self.automation.monitor_context_health()
+        self.assertLess(health["context_files"]["systemPatterns.md"]["age_days"], 1)
+
+    def test_outside_a_session_writes_are_immediate(self):
+        self.automation.scan_and_update_patterns()
+        self.assertIn("## Auto-Discovered Patterns", self.patterns_file.read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for --jobs N pattern scanning in auto-update.py
+
+Workers import auto-update.py by path, so the parallel scan is run as a
+script, the way users run it.
+
+Run with: python tests/test_parallel_scan.py  (or python -m pytest tests)
+"""
+
+import io
+import json
+import subprocess
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from helpers import SCRIPTS_DIR, load_script, temp_memory_bank
+
+SCRIPT = SCRIPTS_DIR / "auto-update.py"
+
+auto_update = load_script("auto-update.py")
+
+
+class ParallelScanTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self, "context")
+        # Just enough files for the pool to be started
+        self.file_count = auto_update.MemoryBankAutomation.SCAN_PARALLEL_MIN_FILES
+        for i in range(self.file_count):
+            package = self.root / f"pkg{i % 7}"
+            package.mkdir(exist_ok=True)
+            body = "try:\n    fetch(api)\nexcept Error:\n    pass\n" * (i % 5) + f"x = {i}\n"
+            (package / f"module{i}.js").write_text(body)
+        (self.root / "pkg0" / "blob.py").write_bytes(b"\0" * 10)
+
+    def scan(self, jobs):
+        """Per-file [mtime, size, hash, skip reason, *counts] from the scan cache, in walk order"""
+        cache = self.root / ".memory-bank" / "scan-cache.json"
+        cache.unlink(missing_ok=True)
+        result = subprocess.run([sys.executable, str(SCRIPT), "--scan-patterns", "--no-git-index",
+                                 "--jobs", str(jobs), "--project-root", str(self.root)],
+                                check=True, capture_output=True, text=True)
+        self.assertNotIn("scanning serially", result.stdout)
+        return list(json.loads(cache.read_text())["files"].items())
+
+    def test_jobs_give_identical_results(self):
+        entries = self.scan(1)
+        self.assertEqual(len(entries), self.file_count + 1)
+        self.assertIn(("pkg0/blob.py", "binary"), [(path, entry[3]) for path, entry in entries])
+        self.assertEqual(self.scan(4), entries)
+
+    def pool_started(self, file_count, total_size=0):
+        """Whether _scan_files with --jobs 4 tries to start a pool for file_count files"""
+        automation = auto_update.MemoryBankAutomation(self.root, jobs=4)
+        files = sorted(self.root.glob("pkg*/module*.js"))[:file_count]
+        with mock.patch.object(auto_update, "ProcessPoolExecutor", side_effect=OSError("no pool")) as pool, \
+                redirect_stdout(io.StringIO()):
+            results = automation._scan_files([(str(path), None) for path in files], total_size)
+        self.assertEqual(len(results), file_count)
+        return pool.called
+
+    def test_small_rescans_stay_serial(self):
+        self.assertFalse(self.pool_started(100))
+        self.assertTrue(self.pool_started(self.file_count))
+        self.assertTrue(self.pool_started(100, total_size=auto_update.MemoryBankAutomation.SCAN_PARALLEL_MIN_BYTES))
+
+    def test_pool_workers_are_not_forked(self):
+        self.assertNotEqual(auto_update.MemoryBankAutomation._pool_context().get_start_method(), "fork")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests for source file enumeration and per-file scanning in auto-update.py
+
+Run with: python tests/test_pattern_scanner.py  (or python -m pytest tests)
+"""
+
+import re
+import subprocess
+import unittest
+from unittest import mock
+
+from helpers import load_script, temp_memory_bank
+
+auto_update = load_script("auto-update.py")
+
+# Per-detector regexes of the scanner before the detectors were fused
+BASELINE_DETECTORS = {
+    "error_patterns": re.compile(r'(?:try|catch|throw|Error|Exception)'),
+    "api_patterns": re.compile(r'(?:fetch|axios|request|api|endpoint)', re.IGNORECASE),
+}
+CORPUS = {
+    "client.py": (
+        "import requests\n\n"
+        "class ApiError(Exception):\n    pass\n\n"
+        "def fetch_user(endpoint):\n"
+        "    try:\n"
+        "        return requests.get(API_ROOT + endpoint).json()\n"
+        "    except requests.RequestException as e:\n"
+        "        raise ApiError(str(e))  # retry later\n"
+    ),
+    "service.js": (
+        "import axios from 'axios';\n"
+        "export async function load(id) {\n"
+        "  try {\n"
+        "    const res = await fetch(`/api/items/${id}`);\n"
+        "    if (!res.ok) throw new TypeError('bad response');\n"
+        "  } catch (err) {\n"
+        "    console.error(err);  // FETCH failed, Axios fallback\n"
+        "    return axios.request({ url: ENDPOINT });\n"
+        "  }\n"
+        "}\n"
+    ),
+    "types.ts": "export interface Entry { api: string; }\nconst RetryError = Error;\n",
+    "empty.tsx": "",
+}
+
+
+def baseline_counts(content):
+    """Counts of the baseline per-detector regexes, in PATTERN_DETECTORS order"""
+    text = content.decode('utf-8')
+    return [len(BASELINE_DETECTORS[category].findall(text))
+            for category in auto_update.MemoryBankAutomation.PATTERN_DETECTORS]
+
+
+class ScanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self)
+
+    def write(self, rel_path, content=""):
+        path = self.root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content if isinstance(content, bytes) else content.encode('utf-8'))
+        return path
+
+    def automation(self, **options):
+        options.setdefault("use_cache", False)
+        options.setdefault("use_git_index", False)
+        return auto_update.MemoryBankAutomation(self.root, **options)
+
+
+class WalkSourceFilesTest(ScanTestCase):
+    def walked(self):
+        return [rel_path for _, rel_path in self.automation()._walk_source_files()]
+
+    def test_default_ignores_are_pruned_at_any_depth(self):
+        for rel_path in ["app.py", "lib/util.ts", "node_modules/pkg/index.js", "web/node_modules/x.js",
+                         "dist/bundle.js", "build/out.py", ".git/hooks/pre-commit.py", "notes.md"]:
+            self.write(rel_path)
+        self.assertEqual(self.walked(), ["app.py", "lib/util.ts"])
+
+    def test_ignore_file_prunes_directories_and_filters_files(self):
+        for rel_path in ["app.py", "app.test.js", "keep.test.js", "generated/api.py", "src/generated/model.py"]:
+            self.write(rel_path)
+        self.write(".memory-bank-ignore", "# local\n/generated/\n*.test.js\n!keep.test.js\n")
+        self.assertEqual(self.walked(), ["app.py", "keep.test.js", "src/generated/model.py"])
+
+    def test_files_come_before_subdirectories_in_name_order(self):
+        for rel_path in ["b.py", "a/z.py", "a/b/c.py", "a.py", "c/d.py"]:
+            self.write(rel_path)
+        self.assertEqual(self.walked(), ["a.py", "b.py", "a/z.py", "a/b/c.py", "c/d.py"])
+
+
+class GitIndexEnumerationTest(ScanTestCase):
+    def setUp(self):
+        super().setUp()
+        for rel_path in ["app.py", "lib/util.ts", "lib/b/c.jsx", "node_modules/pkg/index.js", "README.md"]:
+            self.write(rel_path)
+
+    def git(self, *args):
+        subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+    def enumerated(self, use_git_index=True):
+        return [rel_path for _, rel_path in self.automation(use_git_index=use_git_index)._iter_source_files()]
+
+    def test_git_index_lists_the_files_the_walker_finds(self):
+        self.git("init", "-q")
+        self.git("add", "app.py")
+        self.assertEqual(sorted(self.enumerated()), sorted(self.enumerated(use_git_index=False)))
+
+        self.write(".gitignore", "lib/b/\n")
+        self.assertEqual(self.enumerated(), ["app.py", "lib/util.ts"])
+
+    def test_falls_back_to_the_walker_outside_a_git_repository(self):
+        with mock.patch.dict("os.environ", {"GIT_CEILING_DIRECTORIES": str(self.root.parent)}):
+            automation = self.automation(use_git_index=True)
+            self.assertIsNone(automation._list_git_files())
+            self.assertEqual([p for _, p in automation._iter_source_files()],
+                             ["app.py", "lib/util.ts", "lib/b/c.jsx"])
+
+
+class FusedDetectorTest(ScanTestCase):
+    def test_counts_match_the_baseline_regexes(self):
+        for name, text in CORPUS.items():
+            content = text.encode('utf-8')
+            with self.subTest(name):
+                self.assertEqual(auto_update.MemoryBankAutomation._match_counts(content),
+                                 baseline_counts(content))
+
+    def test_scan_reports_the_baseline_counts_per_file(self):
+        for name, text in CORPUS.items():
+            self.write(name, text)
+        patterns = self.automation()._scan_code_patterns()
+
+        for index, category in enumerate(auto_update.MemoryBankAutomation.PATTERN_DETECTORS):
+            expected = [{"file": name, "count": baseline_counts(text.encode('utf-8'))[index]}
+                        for name, text in sorted(CORPUS.items())]
+            self.assertEqual(patterns[category], [p for p in expected if p["count"]])
+
+
+class SkipReasonTest(ScanTestCase):
+    def skipped(self, automation):
+        automation._scan_code_patterns()
+        return {s["file"]: s["reason"] for s in automation.scan_skipped}
+
+    def test_binary_and_too_large_files_are_skipped(self):
+        self.write("client.py", "fetch()\n")
+        self.write("blob.js", b"var a;\0\1\2")
+        self.write("huge.ts", "fetch();\n" * 200)
+        options = {"use_cache": True, "max_file_size_mb": 1000 / (1024 * 1024)}
+        self.assertEqual(self.skipped(self.automation(**options)), {"blob.js": "binary", "huge.ts": "too-large"})
+
+        # Skipped files are cached as such and reported again
+        self.assertEqual(self.skipped(self.automation(**options)), {"blob.js": "binary", "huge.ts": "too-large"})
+
+    def test_unreadable_files_are_reported_and_not_cached(self):
+        self.write("client.py", "fetch()\n")
+        self.write("secret.py", "fetch()\n")
+        real_scan_file = auto_update.MemoryBankAutomation._scan_file
+
+        def scan_file(file_path, *args):
+            if file_path.endswith("secret.py"):
+                raise PermissionError(13, "Permission denied")
+            return real_scan_file(file_path, *args)
+
+        automation = self.automation(use_cache=True)
+        with mock.patch.object(auto_update.MemoryBankAutomation, "_scan_file", side_effect=scan_file):
+            self.assertEqual(self.skipped(automation), {"secret.py": "unreadable (Permission denied)"})
+        self.assertNotIn("secret.py", automation._load_scan_cache())
+
+        self.assertEqual(self.skipped(self.automation(use_cache=True)), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
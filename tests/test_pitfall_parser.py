@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass pitfall parser in auto-update.py
+
+The parser replaces a DOTALL regex plus a per-match timestamp lookback.
+These tests check that it produces the same records as that regex on
+progress.md entries in the template format, and that resuming from a
+checkpoint gives the same records as a full parse.
+
+Run with: python tests/test_pitfall_parser.py  (or python -m pytest tests)
+"""
+
+import re
+import unittest
+
+from helpers import REPO_ROOT, load_script, temp_memory_bank
+
+auto_update = load_script("auto-update.py")
+
+# Regex used by extract_pitfall_solutions before the line-oriented parser
+LEGACY_ISSUE_PATTERN = r'\*\*Issue\*\*:\s*(.+?)(?:\n\s*-\s*\*\*Context\*\*:\s*(.+?))?(?:\n\s*-\s*\*\*Solution\*\*:\s*(.+?))?(?:\n\s*-\s*\*\*Pattern\*\*:\s*(.+?))?'
+
+# The same regex with each field anchored to the end of its line. The lazy
+# groups above stop after a single character, so this is the form whose
+# intent the parser implements for multi-character values.
+LINE_ISSUE_PATTERN = r'\*\*Issue\*\*:[ \t]*([^\n]*)(?:\n\s*-\s*\*\*Context\*\*:[ \t]*([^\n]*))?(?:\n\s*-\s*\*\*Solution\*\*:[ \t]*([^\n]*))?(?:\n\s*-\s*\*\*Pattern\*\*:[ \t]*([^\n]*))?'
+
+
+def regex_pitfalls(pattern, content):
+    """Extract pitfalls the way extract_pitfall_solutions used to"""
+    pitfalls = []
+    for match in re.finditer(pattern, content, re.MULTILINE | re.DOTALL):
+        issue, context, solution, field = (g.strip() if g else "" for g in match.groups())
+        if issue and solution:
+            timestamps = list(re.finditer(r'## \[(.+?)\]', content[:match.start()]))
+            pitfalls.append({
+                "issue": issue,
+                "context": context,
+                "solution": solution,
+                "pattern": field,
+                "timestamp": timestamps[-1].group(1) if timestamps else "unknown"
+            })
+    return pitfalls
+
+
+def parser_pitfalls(content):
+    """Extract pitfalls with the single-pass parser"""
+    lines = content.encode("utf-8").splitlines(keepends=True)
+    return list(auto_update.MemoryBankAutomation._parse_pitfalls(lines))
+
+
+def progress_document(entries):
+    """Template progress.md followed by dated issue entries"""
+    template = (REPO_ROOT / "templates" / "progress.md").read_text()
+    return template + "\n## Issue Log\n" + "".join(entries)
+
+
+class PitfallParserTest(unittest.TestCase):
+    def test_matches_legacy_regex_on_single_character_fields(self):
+        # The only inputs the legacy lazy regex captures in full
+        content = progress_document([
+            "\n## [2025-01-01 09:00]\n"
+            "- **Issue**: A\n"
+            "  - **Context**: B\n"
+            "  - **Solution**: C\n"
+            "  - **Pattern**: D\n",
+            "\n## [2025-01-02 10:30]\n"
+            "- **Issue**: E\n"
+            "  - **Solution**: F\n",
+            "- **Issue**: G\n"
+            "  - **Context**: H\n",
+        ])
+
+        expected = regex_pitfalls(LEGACY_ISSUE_PATTERN, content)
+        self.assertEqual(len(expected), 2)
+        self.assertEqual(parser_pitfalls(content), expected)
+
+    def test_matches_line_anchored_regex_on_template_entries(self):
+        content = progress_document([
+            "\n## [2025-02-01 14:00] Build pipeline\n"
+            "- **Issue**: CI fails on fresh checkout\n"
+            "  - **Context**: Only when node_modules is not cached\n"
+            "  - **Solution**: Pin the lockfile and run npm ci\n"
+            "  - **Pattern**: Always commit lockfiles\n",
+            "\n## [2025-02-03 08:15]\n"
+            "- **Issue**: Flaky API test\n"
+            "\n"
+            "  - **Solution**: Mock the clock instead of sleeping\n",
+            "- **Issue**: Memory leak in watcher (unresolved)\n"
+            "  - **Context**: Seen after long sessions\n",
+            "\n### [Sprint 12]\n"
+            "- **Issue**: Slow cold start\n"
+            "  - **Context**: Interpreter startup dominates\n"
+            "  - **Solution**: Keep a warm server process\n",
+        ])
+
+        expected = regex_pitfalls(LINE_ISSUE_PATTERN, content)
+        self.assertEqual(len(expected), 3)
+        self.assertEqual(parser_pitfalls(content), expected)
+
+    def test_fields_out_of_order_end_the_record(self):
+        content = (
+            "## [2025-03-01]\n"
+            "- **Issue**: Stale cache\n"
+            "  - **Solution**: Key entries on mtime\n"
+            "  - **Context**: Ignored, comes after the solution\n"
+        )
+
+        self.assertEqual(parser_pitfalls(content), regex_pitfalls(LINE_ISSUE_PATTERN, content))
+        self.assertEqual(parser_pitfalls(content)[0]["context"], "")
+
+    def test_no_issues(self):
+        content = progress_document([])
+        self.assertEqual(parser_pitfalls(content), [])
+
+
+class PitfallCheckpointTest(unittest.TestCase):
+    CONTENT = (
+        "# Progress\n"
+        "## [2025-04-01]\n"
+        "- **Issue**: Slow hook\n"
+        "  - **Solution**: Cache the scan\n"
+        "\n"
+        "## [2025-04-02]\n"
+        "- **Issue**: Lost events\n"
+        "  - **Context**: Queue overflow\n"
+        "  - **Solution**: Rescan on overflow\n"
+        "  - **Pattern**: Fall back to a full refresh\n"
+        "- **Issue**: Unsolved\n"
+    )
+
+    def test_resuming_from_any_split_matches_full_parse(self):
+        parse = auto_update.MemoryBankAutomation._parse_pitfalls
+        data = self.CONTENT.encode("utf-8")
+        expected = list(parse(data.splitlines(keepends=True)))
+
+        # Every byte position, including mid-line and mid-record splits
+        for split in range(len(data) + 1):
+            state = {"offset": 0}
+            first = list(parse(data[:split].splitlines(keepends=True), "unknown", state))
+            stored = [p for p in first if p is not state["open_record"]]
+
+            resume = {"offset": state["offset"]}
+            rest = data[state["offset"]:].splitlines(keepends=True)
+            self.assertEqual(stored + list(parse(rest, state["timestamp"], resume)), expected,
+                             f"split at byte {split}")
+
+    def test_extract_resumes_after_append_and_reparses_after_rewrite(self):
+        root = temp_memory_bank(self, "active", "context")
+        progress = root / ".memory-bank" / "active" / "progress.md"
+        progress.write_text(self.CONTENT)
+
+        automation = auto_update.MemoryBankAutomation(root)
+        self.assertEqual([p["issue"] for p in automation.extract_pitfall_solutions()],
+                         ["Slow hook", "Lost events"])
+        checkpoint = automation._load_pitfall_index()["offset"]
+        self.assertLess(checkpoint, len(self.CONTENT.encode("utf-8")))
+
+        with open(progress, "a") as f:
+            f.write("  - **Solution**: Write it down\n- **Issue**: Next one\n")
+        self.assertEqual([p["issue"] for p in automation.extract_pitfall_solutions()],
+                         ["Slow hook", "Lost events", "Unsolved"])
+        self.assertGreater(automation._load_pitfall_index()["offset"], checkpoint)
+
+        progress.write_text(self.CONTENT.replace("Slow hook", "Slow hooks"))
+        self.assertEqual([p["issue"] for p in automation.extract_pitfall_solutions()],
+                         ["Slow hooks", "Lost events"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for --profile (memory_bank_profile.py) and its use in auto-update.py
+
+Run with: python tests/test_profiler.py  (or python -m pytest tests)
+"""
+
+import json
+import unittest
+
+from helpers import load_script, temp_dir, temp_memory_bank
+from memory_bank_profile import Profiler
+
+auto_update = load_script("auto-update.py")
+
+
+class ProfilerTest(unittest.TestCase):
+    def test_phases_and_counters_are_summarized(self):
+        profiler = Profiler()
+        for _ in range(2):
+            with profiler.phase("read"):
+                pass
+        profiler.add("match", 0.5, 0.25, calls=3)
+        profiler.count("bytes read", 10)
+        profiler.count("bytes read", 5)
+
+        summary = profiler.summary()
+        self.assertEqual(list(summary["phases"]), ["match", "read"])
+        self.assertEqual(summary["phases"]["read"]["calls"], 2)
+        self.assertEqual(summary["phases"]["match"], {"calls": 3, "wall_s": 0.5, "cpu_s": 0.25})
+        self.assertEqual(summary["counters"], {"bytes read": 15})
+        self.assertIn("bytes read", profiler.format_summary())
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = Profiler(enabled=False)
+        with profiler.phase("read"):
+            pass
+        profiler.add("match", 1.0, 1.0)
+        profiler.count("files visited")
+        self.assertEqual((profiler.phases, profiler.counters, profiler.events), ({}, {}, []))
+
+    def test_trace_holds_one_event_per_phase_run(self):
+        profiler = Profiler()
+        with profiler.phase("outer"):
+            with profiler.phase("inner"):
+                pass
+        profiler.add("match", 1.0, 1.0)
+        profiler.count("subprocesses", 2)
+
+        tmp = temp_dir(self)
+        profiler.write_trace(tmp / "trace.json")
+        events = json.loads((tmp / "trace.json").read_text())["traceEvents"]
+        self.assertEqual([(e["name"], e["ph"]) for e in events],
+                         [("inner", "X"), ("outer", "X"), ("counters", "C")])
+        self.assertEqual(events[-1]["args"], {"subprocesses": 2})
+
+
+class ProfiledScanTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self, "context")
+        (self.root / "client.py").write_text("try:\n    fetch()\nexcept Exception:\n    pass\n")
+        (self.root / "blob.js").write_bytes(b"\0binary")
+
+    def scan(self, profiler=None):
+        automation = auto_update.MemoryBankAutomation(self.root, use_cache=False,
+                                                      use_git_index=False, profiler=profiler)
+        return automation._scan_code_patterns()
+
+    def test_scan_reports_read_match_and_counters_without_changing_results(self):
+        profiler = Profiler()
+        self.assertEqual(self.scan(profiler), self.scan())
+
+        summary = profiler.summary()
+        self.assertEqual(summary["phases"]["read"]["calls"], 2)
+        self.assertIn("match", summary["phases"])
+        self.assertIn("enumerate", summary["phases"])
+        self.assertEqual(summary["counters"]["files visited"], 2)
+        self.assertEqual(summary["counters"]["files skipped: binary"], 1)
+        self.assertEqual(summary["counters"]["bytes read"],
+                         sum((self.root / name).stat().st_size for name in ["client.py", "blob.js"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental pattern scan cache (.memory-bank/scan-cache.json)
+
+Run with: python tests/test_scan_cache.py  (or python -m pytest tests)
+"""
+
+import json
+import os
+import unittest
+from unittest import mock
+
+from helpers import load_script, temp_memory_bank
+
+auto_update = load_script("auto-update.py")
+
+
+class ScanCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.root = temp_memory_bank(self)
+        self.client = self.root / "client.py"
+        self.client.write_text("try:\n    fetch()\nexcept Exception:\n    pass\n")
+
+    def scan(self):
+        automation = auto_update.MemoryBankAutomation(self.root, use_git_index=False)
+        with mock.patch.object(auto_update.MemoryBankAutomation, "_match_counts",
+                               side_effect=auto_update.MemoryBankAutomation._match_counts) as match:
+            patterns = automation._scan_code_patterns()
+        return patterns, match.call_count
+
+    def cached_files(self):
+        return json.loads((self.root / ".memory-bank" / "scan-cache.json").read_text())["files"]
+
+    def test_unchanged_files_are_served_from_the_cache(self):
+        patterns, _ = self.scan()
+        with mock.patch.object(auto_update.MemoryBankAutomation, "_scan_file") as scan_file:
+            cached, matched = self.scan()
+        self.assertEqual((cached, matched, scan_file.call_count), (patterns, 0, 0))
+        self.assertEqual(patterns["error_patterns"], [{"file": "client.py", "count": 2}])
+
+    def test_deleted_files_are_evicted(self):
+        (self.root / "other.js").write_text("fetch(api)\n")
+        self.scan()
+        self.assertEqual(list(self.cached_files()), ["client.py", "other.js"])
+
+        (self.root / "other.js").unlink()
+        patterns, matched = self.scan()
+        self.assertEqual((list(self.cached_files()), matched), (["client.py"], 0))
+        self.assertEqual(patterns["api_patterns"], [{"file": "client.py", "count": 1}])
+
+    def test_detector_change_invalidates_the_cache(self):
+        self.scan()
+        detectors = dict(auto_update.MemoryBankAutomation.PATTERN_DETECTORS, todo_patterns=(("pass",), False))
+        with mock.patch.object(auto_update.MemoryBankAutomation, "PATTERN_DETECTORS", detectors), \
+                mock.patch.object(auto_update.MemoryBankAutomation, "_compiled_detectors", None):
+            patterns, matched = self.scan()
+        self.assertEqual(matched, 1)
+        self.assertEqual(patterns["todo_patterns"], [{"file": "client.py", "count": 1}])
+        self.assertEqual(self.cached_files()["client.py"][4:], [2, 1, 1])
+
+    def test_touched_but_unchanged_files_are_hashed_not_matched(self):
+        patterns, matched = self.scan()
+        self.assertEqual(matched, 1)
+
+        stat = self.client.stat()
+        os.utime(self.client, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        touched, matched = self.scan()
+        self.assertEqual(matched, 0)
+        self.assertEqual(touched, patterns)
+
+        # Same size, different content: matched again
+        self.client.write_text(self.client.read_text().replace("fetch", "fetcH"))
+        _, matched = self.scan()
+        self.assertEqual(matched, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the TaskScheduler that runs the --all tasks of auto-update.py
+
+Run with: python tests/test_task_scheduler.py  (or python -m pytest tests)
+"""
+
+import argparse
+import contextlib
+import io
+import threading
+import unittest
+from unittest import mock
+
+from helpers import load_script
+
+auto_update = load_script("auto-update.py")
+
+
+class TaskSchedulerTest(unittest.TestCase):
+    def test_only_conflicting_tasks_are_ordered(self):
+        scheduler = auto_update.TaskScheduler()
+        scheduler.add("scan", None, reads=["src", "patterns"], writes=["patterns"])
+        scheduler.add("pitfalls", None, reads=["progress", "patterns"], writes=["patterns"])
+        scheduler.add("decisions", None, reads=["git", "log"], writes=["log"])
+        scheduler.add("health", None, reads=["patterns"], writes=["report"])
+        scheduler.add("validate", None, reads=["log", "patterns"])
+        self.assertEqual(scheduler.dependencies(), [set(), {0}, set(), {0, 1}, {0, 1, 2}])
+
+    def test_independent_tasks_overlap_and_results_keep_order(self):
+        started = threading.Event()
+        order = []
+
+        def slow():
+            # Only returns if fast runs while slow is still running
+            self.assertTrue(started.wait(timeout=5))
+            order.append("slow")
+            return 1
+
+        def fast():
+            started.set()
+            order.append("fast")
+            return 2
+
+        scheduler = auto_update.TaskScheduler()
+        scheduler.add("slow", slow, reads=["git"])
+        scheduler.add("fast", fast, reads=["src"])
+        scheduler.add("after", lambda: order.append("after") or 3, reads=["a"], writes=["git"])
+
+        self.assertEqual(list(scheduler.run()), [("slow", 1), ("fast", 2), ("after", 3)])
+        self.assertEqual(order[-1], "after")
+        self.assertEqual(order[:2], ["fast", "slow"])
+
+    def test_failure_is_raised_in_order_and_skips_dependents(self):
+        ran = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        scheduler = auto_update.TaskScheduler()
+        scheduler.add("ok", lambda: ran.append("ok"), writes=["a"])
+        scheduler.add("fail", fail, writes=["b"])
+        scheduler.add("dependent", lambda: ran.append("dependent"), reads=["b"])
+
+        results = scheduler.run()
+        self.assertEqual(next(results)[0], "ok")
+        with self.assertRaisesRegex(RuntimeError, "boom"):
+            next(results)
+        self.assertNotIn("dependent", ran)
+
+
+class RunTasksOutputTest(unittest.TestCase):
+    def test_task_output_is_printed_under_its_own_heading(self):
+        mining = threading.Event()
+
+        def scan_and_update_patterns():
+            # Prints only after the decision task has printed, while running
+            self.assertTrue(mining.wait(timeout=5))
+            print("   scanning")
+            return {}
+
+        def extract_git_decisions(since=None):
+            print("   mining")
+            mining.set()
+            return []
+
+        automation = mock.Mock(scan_skipped=[], profiler=auto_update.Profiler(enabled=False),
+                               scan_and_update_patterns=scan_and_update_patterns,
+                               extract_git_decisions=extract_git_decisions)
+        args = argparse.Namespace(all=False, scan_patterns=True, extract_pitfalls=False,
+                                  extract_decisions=True, health_check=False,
+                                  validate_structure=False, since=None)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            auto_update.run_tasks(automation, args)
+            print("after")
+
+        self.assertEqual(output.getvalue().splitlines(), [
+            "📊 Scanning for code patterns...", "   scanning", "   Found 0 patterns across codebase",
+            "📝 Extracting decisions from git history...", "   mining",
+            "   Found 0 architectural decisions", "after"])
+
+
+if __name__ == "__main__":
+    unittest.main()